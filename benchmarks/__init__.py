@@ -0,0 +1 @@
+"""Benchmarks of the geoterminal readers, operations and writers."""
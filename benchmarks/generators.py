@@ -0,0 +1,162 @@
+"""Deterministic synthetic data for the benchmarks.
+
+Every generator takes a seed, so the same arguments always give the same
+features and benchmark runs on different releases process identical data.
+"""
+
+from pathlib import Path
+from typing import Tuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.orc as orc
+import shapely
+
+# Longitude/latitude extent the features are drawn in (western Europe)
+EXTENT = (-5.0, 40.0, 15.0, 55.0)
+
+# Categories of the 'category' attribute column
+CATEGORIES = ["residential", "commercial", "industrial", "park", "water"]
+
+# File formats written by write_dataset
+FORMATS = ["csv", "orc", "geojson", "shp"]
+
+
+def _attributes(n: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Draw the attribute columns shared by all generators."""
+    return pd.DataFrame(
+        {
+            "id": np.arange(n),
+            "value": rng.normal(100.0, 25.0, n).round(3),
+            "category": np.array(CATEGORIES)[
+                rng.integers(0, len(CATEGORIES), n)
+            ],
+        }
+    )
+
+
+def _centers(
+    n: int, rng: np.random.Generator, extent: Tuple[float, ...]
+) -> np.ndarray:
+    """Draw clustered centres, as real layers are denser around cities."""
+    minx, miny, maxx, maxy = extent
+    clusters = rng.uniform([minx, miny], [maxx, maxy], size=(50, 2))
+    spread = 0.05 * min(maxx - minx, maxy - miny)
+    centers = clusters[rng.integers(0, len(clusters), n)]
+    centers += rng.normal(0, spread, size=(n, 2))
+    return np.clip(centers, [minx, miny], [maxx, maxy])
+
+
+def points(
+    n: int, seed: int = 0, extent: Tuple[float, ...] = EXTENT
+) -> gpd.GeoDataFrame:
+    """Generate clustered points with attributes.
+
+    Args:
+        n: Number of points
+        seed: Seed of the random generator
+        extent: Bounds (minx, miny, maxx, maxy) in longitude/latitude
+
+    Returns:
+        GeoDataFrame of points in EPSG:4326
+    """
+    rng = np.random.default_rng(seed)
+    df = _attributes(n, rng)
+    xy = _centers(n, rng, extent)
+    return gpd.GeoDataFrame(df, geometry=shapely.points(xy), crs="EPSG:4326")
+
+
+def polygons(
+    n: int,
+    vertices: int = 32,
+    holes: int = 0,
+    radius: float = 0.01,
+    seed: int = 0,
+    extent: Tuple[float, ...] = EXTENT,
+) -> gpd.GeoDataFrame:
+    """Generate star-shaped polygons of tunable complexity.
+
+    Polygons are built in one vectorized pass from jittered radii around
+    clustered centres, so they are valid but may overlap each other.
+
+    Args:
+        n: Number of polygons
+        vertices: Number of vertices of every exterior ring
+        holes: Number of holes per polygon, each a scaled inner ring
+        radius: Mean radius in degrees
+        seed: Seed of the random generator
+        extent: Bounds (minx, miny, maxx, maxy) in longitude/latitude
+
+    Returns:
+        GeoDataFrame of polygons in EPSG:4326
+    """
+    rng = np.random.default_rng(seed)
+    df = _attributes(n, rng)
+    centers = _centers(n, rng, extent)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    radii = radius * rng.uniform(0.5, 1.5, (n, 1))
+    radii = radii * rng.uniform(0.8, 1.0, (n, vertices))
+
+    def ring(origin: np.ndarray, scale: np.ndarray) -> np.ndarray:
+        coords = np.stack(
+            [
+                origin[:, :1] + scale * np.cos(angles),
+                origin[:, 1:] + scale * np.sin(angles),
+            ],
+            axis=-1,
+        )
+        # Close the rings
+        return shapely.linearrings(
+            np.concatenate([coords, coords[:, :1]], axis=1)
+        )
+
+    shell = ring(centers, radii)
+    interiors = None
+    if holes:
+        # Holes are small circles spread around the centre, well inside
+        # the shortest radius of the shell
+        inner = radii.min(axis=1, keepdims=True)
+        scale = np.repeat(inner * 0.3 / max(holes, 2), vertices, axis=1)
+        hole_rings = []
+        for h in range(holes):
+            angle = 2 * np.pi * h / holes
+            offset = 0.5 * inner * [np.cos(angle), np.sin(angle)]
+            hole_rings.append(ring(centers + offset, scale))
+        interiors = np.stack(hole_rings, axis=1)
+    geoms = shapely.polygons(shell, holes=interiors)
+    return gpd.GeoDataFrame(df, geometry=geoms, crs="EPSG:4326")
+
+
+def write_dataset(
+    gdf: gpd.GeoDataFrame, directory: Path, name: str, fmt: str
+) -> Path:
+    """Write features to a file read by geoterminal.
+
+    CSV and ORC files hold the geometries as WKT in a 'geometry' column.
+
+    Args:
+        gdf: Features to write
+        directory: Output directory
+        name: File name without extension
+        fmt: File format ('csv', 'orc', 'geojson' or 'shp')
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(directory) / f"{name}.{fmt}"
+    if fmt in ["geojson", "shp"]:
+        driver = "GeoJSON" if fmt == "geojson" else "ESRI Shapefile"
+        gdf.to_file(path, driver=driver)
+        return path
+
+    df = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    df["geometry"] = shapely.to_wkt(np.asarray(gdf.geometry.values))
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "orc":
+        orc.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+    return path
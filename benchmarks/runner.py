@@ -0,0 +1,506 @@
+"""Run the geoterminal benchmarks and compare their results.
+
+Every benchmark is set up and timed separately for each repetition, so
+setup (generating data, building processors) is never timed and
+operations that modify their processor always start from the same
+state. Results are written as JSON, with the versions of geoterminal and
+its geometry stack, so runs on different releases can be compared with
+``python -m benchmarks compare``.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import box
+
+from benchmarks.generators import FORMATS, points, polygons, write_dataset
+from geoterminal._version import __version__
+from geoterminal.io.file import (
+    export_data,
+    iter_geometry_file,
+    read_geometry_file,
+)
+from geoterminal.log import setup_logging
+from geoterminal.operators.data_operations import DataProcessor
+from geoterminal.operators.geometry_operations import GeometryProcessor
+from geoterminal.operators.h3_operations import H3Processor
+
+# Version of the results format, bumped when it changes incompatibly
+RESULTS_VERSION = 1
+
+# Default input sizes, in rows
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Default number of timed repetitions per benchmark and size
+DEFAULT_REPEAT = 3
+
+# Default slowdown ratio above which a comparison reports a regression
+DEFAULT_THRESHOLD = 1.2
+
+# Chunk size of the streaming read benchmarks
+STREAM_CHUNKSIZE = 100_000
+
+# H3 resolutions of the polyfill benchmarks, with the largest size they run
+# at by default as the number of cells grows sevenfold per resolution
+POLYFILL_RESOLUTIONS = {5: None, 7: 100_000, 9: 10_000}
+
+# Query of the attribute filter benchmarks
+ATTRIBUTE_QUERY = "value > 100 and category != 'water'"
+
+# Query of the spatial filter benchmark
+SPATIAL_QUERY = "bbox(0, 45, 10, 50) and area() > 0.0002"
+
+# A benchmark builds, for a dataset cache and an input size, the callable
+# to time
+Setup = Callable[["Datasets", int], Callable[[], Any]]
+
+
+class Datasets:
+    """Generate and cache the inputs of the benchmarks."""
+
+    def __init__(self, directory: Path, seed: int = 0) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory of the generated files
+            seed: Seed of the generators
+        """
+        self.directory = Path(directory)
+        self.seed = seed
+        self._frames: Dict[Tuple[str, int], gpd.GeoDataFrame] = {}
+        self._files: Dict[Tuple[str, int, str], Path] = {}
+
+    def frame(self, kind: str, n: int) -> gpd.GeoDataFrame:
+        """Get a generated layer.
+
+        Args:
+            kind: 'points', 'polygons' (32 vertices), 'complex' (256
+                  vertices and 4 holes) or 'mask' (a grid of boxes
+                  covering part of the extent)
+            n: Number of features
+
+        Returns:
+            Copy of the cached layer
+        """
+        key = (kind, n)
+        if key not in self._frames:
+            if kind == "points":
+                gdf = points(n, seed=self.seed)
+            elif kind == "polygons":
+                gdf = polygons(n, seed=self.seed)
+            elif kind == "complex":
+                gdf = polygons(n, vertices=256, holes=4, seed=self.seed)
+            elif kind == "mask":
+                cells = [
+                    box(x, y, x + 2, y + 2)
+                    for x in range(0, 10, 3)
+                    for y in range(42, 52, 3)
+                ]
+                gdf = gpd.GeoDataFrame(
+                    {"cell": range(len(cells))},
+                    geometry=cells,
+                    crs="EPSG:4326",
+                )
+            else:
+                raise ValueError(f"Unknown dataset: {kind}")
+            self._frames[key] = gdf
+        return self._frames[key].copy()
+
+    def file(self, kind: str, n: int, fmt: str) -> Path:
+        """Get a generated layer written to a file.
+
+        Args:
+            kind: Dataset kind, as for ``frame``
+            n: Number of features
+            fmt: File format, among ``FORMATS``
+
+        Returns:
+            Path of the cached file
+        """
+        key = (kind, n, fmt)
+        if key not in self._files:
+            self._files[key] = write_dataset(
+                self.frame(kind, n), self.directory, f"{kind}_{n}", fmt
+            )
+        return self._files[key]
+
+
+def _read(fmt: str) -> Setup:
+    def setup(data: Datasets, n: int) -> Callable[[], Any]:
+        path = data.file("polygons", n, fmt)
+        return lambda: read_geometry_file(path)
+
+    return setup
+
+
+def _iter(fmt: str) -> Setup:
+    def setup(data: Datasets, n: int) -> Callable[[], Any]:
+        path = data.file("polygons", n, fmt)
+        return lambda: sum(
+            len(chunk)
+            for chunk in iter_geometry_file(path, chunksize=STREAM_CHUNKSIZE)
+        )
+
+    return setup
+
+
+def _read_where(fmt: str) -> Setup:
+    def setup(data: Datasets, n: int) -> Callable[[], Any]:
+        path = data.file("polygons", n, fmt)
+        return lambda: read_geometry_file(path, where=ATTRIBUTE_QUERY)
+
+    return setup
+
+
+def _geometry(
+    method: str, *args: Any, kind: str = "polygons", other: str = ""
+) -> Setup:
+    def setup(data: Datasets, n: int) -> Callable[[], Any]:
+        processor = GeometryProcessor(data.frame(kind, n))
+        call_args = list(args)
+        if other:
+            # The other layer is the mask grid or ten times fewer features
+            size = 1 if other == "mask" else max(1, n // 10)
+            call_args.insert(0, data.frame(other, size))
+        return lambda: getattr(processor, method)(*call_args)
+
+    return setup
+
+
+def _polyfill(resolution: int) -> Setup:
+    def setup(data: Datasets, n: int) -> Callable[[], Any]:
+        processor = H3Processor(data.frame("polygons", n))
+        return lambda: processor.polyfill(resolution)
+
+    return setup
+
+
+def _data(method: str, *args: Any) -> Setup:
+    def setup(data: Datasets, n: int) -> Callable[[], Any]:
+        processor = DataProcessor(data.frame("polygons", n))
+        return lambda: getattr(processor, method)(*args)
+
+    return setup
+
+
+def _export(fmt: str) -> Setup:
+    def setup(data: Datasets, n: int) -> Callable[[], Any]:
+        gdf = data.frame("polygons", n)
+        path = data.directory / f"export_{n}.{fmt}"
+        return lambda: export_data(gdf, path)
+
+    return setup
+
+
+# Benchmarks by name, with the largest size they run at by default (None
+# for no limit) so that slow operations do not dominate large runs
+BENCHMARKS: Dict[str, Tuple[Setup, Optional[int]]] = {
+    **{f"read.{fmt}": (_read(fmt), None) for fmt in FORMATS},
+    **{f"iter.{fmt}": (_iter(fmt), None) for fmt in FORMATS},
+    **{
+        f"read_where.{fmt}": (_read_where(fmt), None) for fmt in ["csv", "orc"]
+    },
+    "geometry.make_valid": (_geometry("make_valid"), None),
+    "geometry.set_precision": (_geometry("set_precision", 1e-5), None),
+    "geometry.buffer": (_geometry("apply_buffer", 0.001), None),
+    "geometry.reproject": (_geometry("reproject", 3857), None),
+    "geometry.clip": (_geometry("clip", other="mask"), None),
+    "geometry.unary_union": (_geometry("unary_union"), 100_000),
+    "geometry.dissolve": (_geometry("dissolve", "category"), 100_000),
+    "geometry.subdivide": (
+        _geometry("subdivide", 64, kind="complex"),
+        10_000,
+    ),
+    "geometry.spatial_sort.hilbert": (
+        _geometry("spatial_sort", "hilbert"),
+        None,
+    ),
+    "geometry.spatial_sort.morton": (
+        _geometry("spatial_sort", "morton"),
+        None,
+    ),
+    "geometry.dedupe": (_geometry("dedupe"), None),
+    "geometry.envelope": (_geometry("envelope"), None),
+    "geometry.convex_hull": (_geometry("convex_hull"), None),
+    "geometry.centroid": (_geometry("centroid"), None),
+    "geometry.intersects": (_geometry("intersects", other="mask"), None),
+    "geometry.within_distance": (
+        _geometry("within_distance", 50_000, other="mask"),
+        None,
+    ),
+    "geometry.sjoin": (
+        _geometry("sjoin", kind="points", other="polygons"),
+        None,
+    ),
+    "geometry.overlay": (_geometry("overlay", other="mask"), None),
+    "geometry.nearest": (
+        _geometry("nearest", kind="points", other="polygons"),
+        None,
+    ),
+    "geometry.simplify": (_geometry("simplify", 0.001, kind="complex"), None),
+    "geometry.simplify_levels": (
+        _geometry("simplify_levels", [0.0005, 0.001, 0.002], kind="complex"),
+        None,
+    ),
+    **{
+        f"h3.polyfill.res{res}": (_polyfill(res), limit)
+        for res, limit in POLYFILL_RESOLUTIONS.items()
+    },
+    "data.query.attribute": (_data("query", ATTRIBUTE_QUERY), None),
+    "data.query.spatial": (_data("query", SPATIAL_QUERY), None),
+    "data.groupby": (
+        _data("groupby", ["category"], [("value", "mean")]),
+        None,
+    ),
+    "data.sample": (_data("sample", 0.1, 0), None),
+    **{f"export.{fmt}": (_export(fmt), None) for fmt in FORMATS},
+}
+
+
+def _git_commit() -> Optional[str]:
+    """Get the commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the software and machine the benchmarks run on."""
+    return {
+        "geoterminal": __version__,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "geopandas": gpd.__version__,
+        "shapely": shapely.__version__,
+        "geos": shapely.geos_version_string,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec="seconds"
+        ),
+    }
+
+
+def run_benchmark(
+    setup: Setup, data: Datasets, n: int, repeat: int
+) -> Dict[str, Any]:
+    """Time a benchmark at one input size.
+
+    Args:
+        setup: Benchmark setup
+        data: Dataset cache
+        n: Input size, in rows
+        repeat: Number of timed repetitions
+
+    Returns:
+        Timing statistics in seconds and the throughput of the fastest
+        repetition
+    """
+    times = []
+    for _ in range(repeat):
+        func = setup(data, n)
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "min_s": round(best, 6),
+        "median_s": round(statistics.median(times), 6),
+        "mean_s": round(statistics.fmean(times), 6),
+        "rows_per_s": round(n / best, 1) if best > 0 else None,
+    }
+
+
+def run(
+    names: List[str],
+    sizes: List[int],
+    repeat: int = DEFAULT_REPEAT,
+    directory: Optional[Path] = None,
+    seed: int = 0,
+    all_sizes: bool = False,
+) -> Dict[str, Any]:
+    """Run benchmarks at several input sizes.
+
+    Args:
+        names: Names of the benchmarks to run
+        sizes: Input sizes, in rows
+        repeat: Number of timed repetitions
+        directory: Directory of the generated files; a temporary directory
+                   by default
+        seed: Seed of the generators
+        all_sizes: Whether to ignore the size limit of slow benchmarks
+
+    Returns:
+        Results, with the environment they were measured in
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Datasets(directory or Path(tmp), seed)
+        for n in sizes:
+            for name in names:
+                setup, limit = BENCHMARKS[name]
+                if limit is not None and n > limit and not all_sizes:
+                    continue
+                stats = run_benchmark(setup, data, n, repeat)
+                results.append({"name": name, "size": n, **stats})
+                print(
+                    f"{name:<34} {n:>10,} {stats['min_s']:>12.4f}s",
+                    file=sys.stderr,
+                )
+    return {
+        "version": RESULTS_VERSION,
+        "environment": environment(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> pd.DataFrame:
+    """Compare the best times of two runs.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the new run
+        threshold: Ratio of the new to the reference time above which a
+                   benchmark is flagged as a regression
+
+    Returns:
+        DataFrame of the benchmarks and sizes present in both runs, with
+        their times, the ratio of the times and whether they regressed
+    """
+    columns = ["name", "size", "min_s"]
+    merged = pd.merge(
+        pd.DataFrame(baseline["results"], columns=columns),
+        pd.DataFrame(current["results"], columns=columns),
+        on=["name", "size"],
+        suffixes=("_baseline", "_current"),
+    )
+    merged["ratio"] = (
+        merged["min_s_current"] / merged["min_s_baseline"]
+    ).round(3)
+    merged["regression"] = merged["ratio"] > threshold
+    return merged
+
+
+def _sizes(value: str) -> List[int]:
+    """Parse comma-separated sizes, accepting forms like 1e6."""
+    return [int(float(size)) for size in value.split(",")]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run or compare the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.split("\n")[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=DEFAULT_SIZES,
+        help="Comma-separated input sizes, e.g. 1e3,1e5,1e7",
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT, help="Repetitions"
+    )
+    run_parser.add_argument(
+        "-k",
+        "--filter",
+        help="Only run the benchmarks whose name contains this substring",
+    )
+    run_parser.add_argument(
+        "--all-sizes",
+        action="store_true",
+        help="Run slow benchmarks at every size",
+    )
+    run_parser.add_argument("--seed", type=int, default=0, help="Data seed")
+    run_parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Directory of the generated files (default: temporary)",
+    )
+    run_parser.add_argument(
+        "-o", "--output", type=Path, help="JSON file of the results"
+    )
+    run_parser.add_argument(
+        "--list", action="store_true", help="List the benchmarks and exit"
+    )
+    run_parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="Log level of the benchmarked code",
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare two result files"
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown ratio reported as a regression",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        table = compare(
+            json.loads(args.baseline.read_text()),
+            json.loads(args.current.read_text()),
+            args.threshold,
+        )
+        print(table.to_string(index=False))
+        # A nonzero exit lets CI jobs fail on regressions
+        return int(table["regression"].any())
+
+    names = [name for name in BENCHMARKS if (args.filter or "") in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    setup_logging(args.log_level)
+    if args.data_dir:
+        args.data_dir.mkdir(parents=True, exist_ok=True)
+    results = run(
+        names,
+        args.sizes,
+        args.repeat,
+        args.data_dir,
+        args.seed,
+        args.all_sizes,
+    )
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+    return 0
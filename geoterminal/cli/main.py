@@ -1,22 +1,37 @@
 """Command-line interface for the geoterminal package."""
 
 import sys
+from pathlib import Path
 
 from loguru import logger
 
 from geoterminal.cli.parser import setup_parser
-from geoterminal.cli.processor import process_geometries
+from geoterminal.cli.planner import plan_operations
+from geoterminal.cli.processor import (
+    parse_operations,
+    process_geometries,
+    process_stream,
+)
 from geoterminal.io.file import (
+    DEFAULT_CHUNKSIZE,
     FileHandlerError,
+    export_chunks,
     export_data,
+    iter_geometry_file,
     read_geometry_file,
 )
 from geoterminal.log import setup_logging
+from geoterminal.operators.data_operations import Sampler
 from geoterminal.operators.geometry_operations import (
     GeometryOperationError,
     GeometryProcessor,
 )
-from geoterminal.operators.inspect_operations import InspectProcessor
+from geoterminal.operators.inspect_operations import (
+    InspectProcessor,
+    describe_chunks,
+    format_description,
+)
+from geoterminal.profiler import Profiler
 
 
 def main() -> None:
@@ -28,12 +43,63 @@ def main() -> None:
 
         # Configure logging
         setup_logging(args.log_level)
+        profiler = Profiler(enabled=args.profile is not None)
 
-        # Read input file
-        gdf = read_geometry_file(
-            args.input, args.input_crs, args.geometry_column
+        # Plan the operations; filters the reader can apply (a leading
+        # attribute query and sample) drop rows before they are parsed
+        operations = parse_operations(args) if args.output else []
+        plan = plan_operations(operations, args)
+        if args.explain:
+            print(plan.explain(args))
+            return
+        operations = plan.operations
+        where = plan.where
+        sampler = None
+        if plan.sample is not None:
+            sampler = Sampler(plan.sample, args.seed, args.sample_grid)
+
+        # Stream the input in chunks straight to the output
+        if args.output and args.chunksize:
+            chunks = iter_geometry_file(
+                args.input,
+                args.input_crs,
+                args.geometry_column,
+                chunksize=args.chunksize,
+                where=where,
+                sampler=sampler,
+            )
+            processed = process_stream(
+                profiler.iterate("read", chunks), args, operations, profiler
+            )
+            with profiler.stage("export"):
+                export_chunks(processed, args.output)
+            logger.info(f"Successfully processed and saved to {args.output}")
+            profiler.report(args.profile)
+            return
+
+        # --describe streams the input, so it is only read whole when an
+        # inspect flag taking precedence over --describe needs it
+        streamed = (
+            not args.output
+            and args.describe
+            and args.head is None
+            and args.tail is None
+            and not (args.crs or args.shape or args.dtypes)
         )
 
+        # Read input file
+        gdf = None
+        if not streamed:
+            with profiler.stage("read") as stage:
+                gdf = read_geometry_file(
+                    args.input,
+                    args.input_crs,
+                    args.geometry_column,
+                    where,
+                    sampler,
+                )
+                stage.output(gdf)
+
         # If only input is provided, enter inspect mode
         if not args.output:
             # Initialize inspect processor
@@ -57,6 +123,21 @@ def main() -> None:
                 print("Column data types:")
                 for col, dtype in dtypes.items():
                     print(f"  {col}: {dtype}")
+            elif args.describe:
+                # Describe the input in a single streaming pass
+                chunks = iter_geometry_file(
+                    args.input,
+                    args.input_crs,
+                    args.geometry_column,
+                    chunksize=args.chunksize or DEFAULT_CHUNKSIZE,
+                )
+                print(format_description(describe_chunks(chunks)))
+            elif args.profile_geometries is not None:
+                print(
+                    inspect_processor.profile_geometries(
+                        args.profile_geometries, args.h3_res, args.profile_by
+                    )
+                )
             else:
                 # Show inspect mode help
                 logger.info("\nInspect Mode Options:")
@@ -67,15 +148,38 @@ def main() -> None:
                 )
                 logger.info("  --shape      Show dimensions (rows × columns)")
                 logger.info("  --dtypes     Show column data types")
+                logger.info("  --describe   Show summary statistics")
+                logger.info(
+                    "  --profile-geometries N  Show the N heaviest features"
+                )
             return
 
         # Default behavior: file conversion with optional operations
-        processor = GeometryProcessor(gdf)
-        process_geometries(processor, args)
+        processor = GeometryProcessor(
+            gdf, workers=args.workers, validate=not args.no_validate
+        )
+        levels = process_geometries(processor, args, operations, profiler)
+
+        # Export every simplification level to its own file
+        if levels:
+            output = Path(args.output)
+            for tolerance, level_gdf in levels.items():
+                level_output = output.with_name(
+                    f"{output.stem}_{tolerance:g}{output.suffix}"
+                )
+                with profiler.stage(f"export_{tolerance:g}", level_gdf):
+                    export_data(level_gdf, level_output)
+                logger.info(
+                    f"Successfully processed and saved to {level_output}"
+                )
+            profiler.report(args.profile)
+            return
 
         # Export results
-        export_data(processor.gdf, args.output)
+        with profiler.stage("export", processor.gdf):
+            export_data(processor.gdf, args.output)
         logger.info(f"Successfully processed and saved to {args.output}")
+        profiler.report(args.profile)
 
     except FileHandlerError as e:
         logger.error(f"File handling error: {str(e)}")
@@ -44,6 +44,55 @@ def setup_parser() -> argparse.ArgumentParser:
         the given WKT or file path",
         metavar="WKT/FILE",
     )
+    parser.add_argument(
+        "--sjoin",
+        help="Join attributes of the features in FILE by a spatial \
+        predicate",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--predicate",
+        choices=["intersects", "within", "contains"],
+        default="intersects",
+        help="Spatial predicate used by --sjoin (default: intersects)",
+    )
+    parser.add_argument(
+        "--overlay",
+        type=str,
+        help="Overlay geometries with the features of FILE, keeping the \
+        attributes of both layers",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--how",
+        choices=[
+            "intersection",
+            "difference",
+            "symmetric_difference",
+            "union",
+        ],
+        default="intersection",
+        help="Overlay operation for --overlay (default: intersection)",
+    )
+    parser.add_argument(
+        "--nearest",
+        help="Join attributes of the nearest feature in FILE and its \
+        distance in meters",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=float,
+        help="Maximum search distance in meters for --nearest",
+        metavar="D",
+    )
+    parser.add_argument(
+        "--within-distance",
+        nargs=2,
+        help="Filter geometries within D meters of the given WKT or file \
+        path",
+        metavar=("WKT/FILE", "D"),
+    )
     parser.add_argument(
         "--mask", help="Mask geometry (file path or WKT string)"
     )
@@ -105,6 +154,30 @@ def setup_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show the data types of all columns in the GeoDataFrame",
     )
+    parser.add_argument(
+        "--profile-geometries",
+        type=int,
+        nargs="?",
+        const=10,
+        default=None,
+        metavar="N",
+        help="Show the N heaviest features by --profile-by, with their \
+        vertex, part and ring counts and, with --h3-res, an estimate of \
+        their number of H3 cells (default: 10)",
+    )
+    parser.add_argument(
+        "--profile-by",
+        choices=["vertices", "parts", "rings", "h3_cells"],
+        default="vertices",
+        help="Measure ranking the features of --profile-geometries; \
+        h3_cells requires --h3-res (default: vertices)",
+    )
+    parser.add_argument(
+        "--describe",
+        action="store_true",
+        help="Show summary statistics of the geometries and columns, \
+        computed in a single streaming pass",
+    )
 
     # Geometric operations
     parser.add_argument(
@@ -112,6 +185,46 @@ def setup_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Compute the unary union of all input geometries",
     )
+    parser.add_argument(
+        "--coverage",
+        action="store_true",
+        default=None,
+        help="Treat input geometries as a non-overlapping coverage \
+        (e.g. H3 cells) in --unary-union, enabling the faster coverage \
+        union",
+    )
+    parser.add_argument(
+        "--coverage-simplify",
+        action="store_true",
+        help="Simplify input geometries as a non-overlapping coverage in \
+        --simplify, preserving the edges shared between neighbours",
+    )
+    parser.add_argument(
+        "--dissolve-by",
+        help="Dissolve geometries into one feature per value of COLUMN",
+        metavar="COLUMN",
+    )
+    parser.add_argument(
+        "--aggfunc",
+        choices=["first", "sum", "count"],
+        default="first",
+        help="Aggregation applied to attributes by --dissolve-by \
+        (default: first)",
+    )
+    parser.add_argument(
+        "--groupby",
+        type=lambda s: [c.strip() for c in s.split(",")],
+        help="Aggregate attributes into one row per group of COLUMNS \
+        (comma separated); the output has no geometries",
+        metavar="COLUMNS",
+    )
+    parser.add_argument(
+        "--agg",
+        help="Aggregations applied by --groupby, as COLUMN:FUNC pairs \
+        separated by commas, with FUNC among count, sum, min, max, mean, \
+        first and last (default: the number of rows per group)",
+        metavar="SPEC",
+    )
     parser.add_argument(
         "--envelope",
         action="store_true",
@@ -130,10 +243,93 @@ def setup_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--simplify",
         type=float,
-        help="Simplify geometries with the given tolerance level",
+        nargs="+",
+        help="Simplify geometries with the given tolerance level. \
+        With several tolerances, every level is written to its own output \
+        file named after the tolerance",
         metavar="TOLERANCE",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for parallel operations such as \
+        buffering, simplification, centroids, reprojection and unions \
+        (default: 1)",
+        metavar="N",
+    )
+
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        help="Stream the input in chunks of N rows instead of loading it \
+        at once. Only row-by-row operations, --dedupe and a final \
+        --spatial-sort or --groupby are supported",
+        metavar="N",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        help="Report the wall time, CPU time, peak memory growth, rows and \
+        vertices of every stage (read, operations, export) as a table, or \
+        as JSON written to FILE",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print the plan of the operations, after reordering and \
+        fusing them, without running it",
+    )
+
+    parser.add_argument(
+        "--precision",
+        type=float,
+        help="Snap coordinates to a grid of the given size \
+        (e.g. 0.000001 for about 10 cm in degrees)",
+        metavar="GRID",
+    )
+    parser.add_argument(
+        "--subdivide",
+        type=int,
+        help="Split geometries into pieces with at most MAX_VERTICES \
+        vertices",
+        metavar="MAX_VERTICES",
+    )
+    parser.add_argument(
+        "--dedupe",
+        nargs="?",
+        const="geometry",
+        choices=["geometry", "geometry+cols"],
+        help="Drop duplicate features, keeping the first occurrence. \
+        Compares normalized geometries, and all attribute columns with \
+        geometry+cols (default: geometry)",
+    )
+    parser.add_argument(
+        "--spatial-sort",
+        choices=["hilbert", "morton"],
+        help="Order features along a space-filling curve so that nearby \
+        features are stored together",
+    )
+    parser.add_argument(
+        "--make-valid",
+        action="store_true",
+        help="Repair invalid geometries",
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not build or use spatial index sidecars (.gtidx) for \
+        the files given to --mask, --intersects, --sjoin and --nearest",
+    )
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Skip the geometry validity check",
+    )
+
     # Data operations
     parser.add_argument(
         "--query",
@@ -141,5 +337,25 @@ def setup_parser() -> argparse.ArgumentParser:
         help="Filter data using a pandas query string \
         (e.g., 'column > value')",
     )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        help="Keep a random sample of N rows, or of a FRACTION of rows \
+        (below 1). As the first operation on a CSV or ORC input, rows are \
+        sampled while reading, before their geometries are parsed",
+        metavar="N|FRACTION",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed of the random generator used by --sample",
+    )
+    parser.add_argument(
+        "--sample-grid",
+        type=float,
+        help="Keep up to N sampled rows per grid cell of SIZE CRS units, \
+        so that sparse regions stay represented",
+        metavar="SIZE",
+    )
 
     return parser
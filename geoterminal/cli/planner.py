@@ -0,0 +1,257 @@
+"""Logical planning of the CLI operations.
+
+Operations are given in command line order, which is often not the
+cheapest one. The planner rewrites them into an equivalent plan:
+
+- attribute-only queries move before element-wise geometry transforms,
+  so fewer geometries are transformed;
+- consecutive attribute-only queries are combined into one;
+- consecutive reprojections are fused into the last one, and
+  reprojections to the current CRS are dropped, as are repeated repairs
+  and deduplications;
+- a leading attribute-only query and a leading sample are pushed into the
+  reader, so rows they drop are never parsed.
+
+Spatial filters (``--intersects``, ``--mask``, spatial query terms) are
+never moved past a geometry transform, as their result depends on the
+transformed geometries.
+"""
+
+import argparse
+from typing import Any, List, Optional
+
+from geoterminal.cli.processor import OP_FLAGS, Operation
+from geoterminal.io.file import supports_pushdown
+from geoterminal.operators.data_operations import (
+    SPATIAL_QUERY_FUNCTIONS,
+    SPATIAL_QUERY_NAMES,
+    query_columns,
+)
+
+# Operations transforming each geometry on its own, keeping rows and
+# attributes, which an attribute-only query can move before
+ELEMENTWISE_OPS = [
+    "buffer",
+    "simplify",
+    "centroid",
+    "reproject",
+    "precision",
+    "make_valid",
+]
+
+# Operations whose repetition right after themselves changes nothing
+IDEMPOTENT_OPS = ["make_valid", "dedupe"]
+
+
+def is_attribute_query(
+    query_string: str, geometry_column: Optional[str] = None
+) -> bool:
+    """Check whether a query only references attribute columns.
+
+    Args:
+        query_string: Query string in pandas query format
+        geometry_column: Optional name of the geometry column
+
+    Returns:
+        True if the query uses no spatial term nor the geometry column
+    """
+    names = query_columns(query_string)
+    if names is None:
+        return False
+    spatial = set(SPATIAL_QUERY_FUNCTIONS + SPATIAL_QUERY_NAMES)
+    spatial.add("geometry")
+    if geometry_column:
+        spatial.add(geometry_column)
+    return not names & spatial
+
+
+def _describe(operation: Operation) -> str:
+    """Format an operation as its command line flag and value."""
+    op_type, value = operation
+    flag = next(f for f, op in OP_FLAGS.items() if op == op_type)
+    if value is True:
+        return flag
+    if isinstance(value, (list, tuple)):
+        value = " ".join(str(v) for v in value)
+    elif op_type == "query":
+        value = f'"{value}"'
+    return f"{flag} {value}"
+
+
+class Plan:
+    """Planned operations, with the filters pushed into the reader."""
+
+    def __init__(
+        self,
+        operations: List[Operation],
+        where: Optional[str] = None,
+        sample: Optional[float] = None,
+        rewrites: Optional[List[str]] = None,
+    ) -> None:
+        """Initialize the plan.
+
+        Args:
+            operations: Operations to apply after reading, in order
+            where: Optional attribute query applied by the reader
+            sample: Optional sample size drawn by the reader
+            rewrites: Descriptions of the rewrites applied
+        """
+        self.operations = operations
+        self.where = where
+        self.sample = sample
+        self.rewrites = rewrites or []
+
+    def explain(self, args: argparse.Namespace) -> str:
+        """Describe the plan step by step.
+
+        Args:
+            args: Parsed command line arguments
+
+        Returns:
+            Numbered steps of the plan followed by the rewrites applied
+        """
+        read = f"read {args.input}"
+        if getattr(args, "chunksize", None):
+            read += f" in chunks of {args.chunksize}"
+        if self.where is not None:
+            read += f' where "{self.where}"'
+        if self.sample is not None:
+            read += f" sampling {self.sample:g}"
+        steps = [read] + [_describe(op) for op in self.operations]
+        if args.output:
+            steps.append(f"write {args.output}")
+        lines = ["Plan:"]
+        lines += [f"  {i}. {step}" for i, step in enumerate(steps, 1)]
+        lines.append("Rewrites:")
+        lines += [f"  - {rewrite}" for rewrite in self.rewrites] or [
+            "  (none)"
+        ]
+        return "\n".join(lines)
+
+
+def plan_operations(
+    operations: List[Operation], args: argparse.Namespace
+) -> Plan:
+    """Build an equivalent, cheaper plan of the operations.
+
+    Args:
+        operations: Operations in command line order
+        args: Parsed command line arguments
+
+    Returns:
+        Plan of the operations
+    """
+    rewrites: List[str] = []
+    ops = _push_queries(list(operations), args, rewrites)
+    ops = _fuse_queries(ops, args, rewrites)
+    ops = _fuse_reprojections(ops, rewrites)
+    ops = _drop_noops(ops, args.input_crs, rewrites)
+
+    where = None
+    if (
+        ops
+        and ops[0][0] == "query"
+        and supports_pushdown(args.input, ops[0][1], args.geometry_column)
+    ):
+        where = ops.pop(0)[1]
+        rewrites.append(f'pushed --query "{where}" into the reader')
+    sample = None
+    if ops and ops[0][0] == "sample":
+        sample = ops.pop(0)[1]
+        rewrites.append(f"pushed --sample {sample:g} into the reader")
+    return Plan(ops, where, sample, rewrites)
+
+
+def _is_elementwise(operation: Operation, args: argparse.Namespace) -> bool:
+    """Check whether an operation transforms each geometry on its own."""
+    op_type, value = operation
+    if op_type == "simplify":
+        # Coverage simplification depends on the neighbours of a geometry
+        return len(value) == 1 and not args.coverage_simplify
+    return op_type in ELEMENTWISE_OPS
+
+
+def _push_queries(
+    ops: List[Operation], args: argparse.Namespace, rewrites: List[str]
+) -> List[Operation]:
+    """Move attribute-only queries before element-wise transforms."""
+    planned: List[Operation] = []
+    for operation in ops:
+        op_type, value = operation
+        position = len(planned)
+        if op_type == "query" and is_attribute_query(
+            value, args.geometry_column
+        ):
+            while position and _is_elementwise(planned[position - 1], args):
+                position -= 1
+        if position < len(planned):
+            rewrites.append(
+                f"moved {_describe(operation)} before "
+                f"{_describe(planned[position])}"
+            )
+        planned.insert(position, operation)
+    return planned
+
+
+def _fuse_queries(
+    ops: List[Operation], args: argparse.Namespace, rewrites: List[str]
+) -> List[Operation]:
+    """Combine consecutive attribute-only queries into one."""
+    planned: List[Operation] = []
+    for op_type, value in ops:
+        if (
+            op_type == "query"
+            and planned
+            and planned[-1][0] == "query"
+            and is_attribute_query(value, args.geometry_column)
+            and is_attribute_query(planned[-1][1], args.geometry_column)
+        ):
+            fused = f"({planned[-1][1]}) and ({value})"
+            rewrites.append(f'combined queries into "{fused}"')
+            planned[-1] = ("query", fused)
+        else:
+            planned.append((op_type, value))
+    return planned
+
+
+def _fuse_reprojections(
+    ops: List[Operation], rewrites: List[str]
+) -> List[Operation]:
+    """Replace consecutive reprojections by the last one."""
+    planned: List[Operation] = []
+    for op_type, value in ops:
+        if op_type == "reproject" and planned and planned[-1][0] == op_type:
+            rewrites.append(
+                f"fused --output-crs {planned[-1][1]} into "
+                f"--output-crs {value}"
+            )
+            planned[-1] = (op_type, value)
+        else:
+            planned.append((op_type, value))
+    return planned
+
+
+def _drop_noops(
+    ops: List[Operation], crs: Any, rewrites: List[str]
+) -> List[Operation]:
+    """Drop reprojections to the current CRS and repeated operations."""
+    planned: List[Operation] = []
+    for operation in ops:
+        op_type, value = operation
+        if op_type == "reproject":
+            if crs is not None and value == crs:
+                rewrites.append(
+                    f"dropped {_describe(operation)}, already the CRS"
+                )
+                continue
+            crs = value
+        elif op_type == "h3":
+            # Hexagons are built in EPSG:4326
+            crs = 4326
+        elif (
+            op_type in IDEMPOTENT_OPS and planned and planned[-1] == operation
+        ):
+            rewrites.append(f"dropped repeated {_describe(operation)}")
+            continue
+        planned.append(operation)
+    return planned
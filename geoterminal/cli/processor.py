@@ -3,17 +3,31 @@
 import argparse
 import os
 import sys
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import geopandas as gpd
 from loguru import logger
 
-from geoterminal.io.file import read_geometry_file
-from geoterminal.operators.data_operations import DataProcessor
+from geoterminal.io.file import FileHandlerError, read_geometry_file
+from geoterminal.io.spatial_index import SpatialIndex
+from geoterminal.operators.data_operations import (
+    DataProcessor,
+    aggregate_chunks,
+    is_row_query,
+    parse_aggregations,
+)
 from geoterminal.operators.geometry_operations import (
     GeometryOperationError,
     GeometryProcessor,
+    dedupe_chunks,
+    spatial_sort_chunks,
+)
+from geoterminal.operators.inspect_operations import (
+    InspectProcessor,
+    format_description,
 )
-from geoterminal.operators.h3_operations import polyfill
-from geoterminal.operators.inspect_operations import InspectProcessor
+from geoterminal.profiler import Profiler
 
 # Map command line flags to operation types
 OP_FLAGS = {
@@ -22,129 +36,493 @@ OP_FLAGS = {
     "--h3-res": "h3",
     "--output-crs": "reproject",
     "--unary-union": "unary_union",
+    "--dissolve-by": "dissolve",
+    "--groupby": "groupby",
     "--envelope": "envelope",
     "--convex-hull": "convex_hull",
     "--centroid": "centroid",
     "--query": "query",
+    "--sample": "sample",
     "--head": "head",
     "--tail": "tail",
     "--crs": "crs",
     "--shape": "shape",
     "--dtypes": "dtypes",
+    "--describe": "describe",
+    "--profile-geometries": "profile_geometries",
     "--intersects": "intersects",
+    "--within-distance": "within_distance",
+    "--sjoin": "sjoin",
+    "--nearest": "nearest",
+    "--overlay": "overlay",
     "--simplify": "simplify",
+    "--make-valid": "make_valid",
+    "--subdivide": "subdivide",
+    "--precision": "precision",
+    "--spatial-sort": "spatial_sort",
+    "--dedupe": "dedupe",
 }
 
+# Operations applied row by row, which can run on each chunk of a stream
+CHUNKABLE_OPS = [
+    "mask",
+    "buffer",
+    "h3",
+    "reproject",
+    "centroid",
+    "make_valid",
+    "subdivide",
+    "precision",
+    "query",
+    "intersects",
+    "within_distance",
+    "sjoin",
+    "nearest",
+    "overlay",
+    "simplify",
+]
+
+Operation = Tuple[str, Any]
 
-def process_geometries(
-    processor: GeometryProcessor, args: argparse.Namespace
-) -> None:
-    """Process geometries based on command line arguments.
+
+def parse_operations(args: argparse.Namespace) -> List[Operation]:
+    """Get operations in the order they appear in the command line.
 
     Args:
-        processor: GeometryProcessor instance
         args: Parsed command line arguments
+
+    Returns:
+        List of (operation type, value) pairs
     """
-    try:
-        # Get operations in order they appear in command line
-        operations = []
-        args_list = sys.argv[1:]
-        i = 0
-        while i < len(args_list):
-            arg = args_list[i]
-            if arg in OP_FLAGS:
-                op_type = OP_FLAGS[arg]
-                value = None
-
-                if op_type == "mask":
-                    value = args.mask
-                elif op_type == "buffer":
-                    value = args.buffer_size
-                elif op_type == "h3":
-                    value = args.h3_res
-                elif op_type == "intersects":
-                    value = args.intersects
-                elif op_type == "reproject":
-                    value = args.output_crs
-                elif op_type == "simplify":
-                    value = args.simplify
-                elif op_type in [
-                    "unary_union",
-                    "envelope",
-                    "convex_hull",
-                    "centroid",
-                    "crs",
-                    "shape",
-                    "dtypes",
-                ]:
-                    value = True
-                elif op_type == "query":
-                    value = args.query
-                elif op_type in ["head", "tail"]:
-                    value = getattr(args, op_type)
-
-                if value is not None:
-                    operations.append((op_type, value))
-            i += 1
+    operations = []
+    args_list = sys.argv[1:]
+    i = 0
+    while i < len(args_list):
+        arg = args_list[i]
+        if arg in OP_FLAGS:
+            op_type = OP_FLAGS[arg]
+            value = None
 
-        # Apply operations in the order they appear in command line
-        for op_type, value in operations:
             if op_type == "mask":
-                mask_gdf = read_geometry_file(value, args.mask_crs)
-                processor.clip(mask_gdf)
+                value = args.mask
             elif op_type == "buffer":
-                processor.apply_buffer(value)
+                value = args.buffer_size
             elif op_type == "h3":
-                processor.gdf = polyfill(
-                    processor.gdf, value, include_geometry=True
-                )
-            elif op_type == "reproject":
-                processor.reproject(value)
-            elif op_type == "unary_union":
-                processor.unary_union()
-            elif op_type == "envelope":
-                processor.envelope()
-            elif op_type == "convex_hull":
-                processor.convex_hull()
-            elif op_type == "centroid":
-                processor.centroid()
+                value = args.h3_res
             elif op_type == "intersects":
-                if os.path.exists(value):
-                    # Read the file
-                    other_gdf = read_geometry_file(value)
-                    if not other_gdf.crs:
-                        raise GeometryOperationError(
-                            f"Input file {value} must have a defined CRS"
-                        )
-                    processor.gdf = processor.intersects(other_gdf)
-                else:
-                    # Treat as WKT
-                    processor.gdf = processor.intersects(value)
+                value = args.intersects
+            elif op_type == "within_distance":
+                value = args.within_distance
+            elif op_type == "sjoin":
+                value = args.sjoin
+            elif op_type == "nearest":
+                value = args.nearest
+            elif op_type == "overlay":
+                value = args.overlay
+            elif op_type == "reproject":
+                value = args.output_crs
             elif op_type == "simplify":
-                processor.simplify(value)
+                value = args.simplify
+            elif op_type == "dissolve":
+                value = args.dissolve_by
+            elif op_type == "groupby":
+                value = args.groupby
+            elif op_type == "subdivide":
+                value = args.subdivide
+            elif op_type == "precision":
+                value = args.precision
+            elif op_type == "spatial_sort":
+                value = args.spatial_sort
+            elif op_type == "dedupe":
+                value = args.dedupe
+            elif op_type in [
+                "unary_union",
+                "envelope",
+                "convex_hull",
+                "centroid",
+                "make_valid",
+                "crs",
+                "shape",
+                "dtypes",
+                "describe",
+            ]:
+                value = True
             elif op_type == "query":
-                data_processor = DataProcessor(processor.gdf)
-                processor.gdf = data_processor.query(value)
-            elif op_type in ["head", "tail", "crs", "shape", "dtypes"]:
-                inspect_processor = InspectProcessor(processor.gdf)
-                if op_type == "head":
-                    result = inspect_processor.head(value if value else 5)
-                    print(result)
-                elif op_type == "tail":
-                    result = inspect_processor.tail(value if value else 5)
-                    print(result)
-                elif op_type == "crs":
-                    crs = inspect_processor.get_crs()
-                    print(f"CRS: {crs}")
-                elif op_type == "shape":
-                    shape = inspect_processor.get_shape()
-                    print(f"Shape: {shape[0]} rows × {shape[1]} columns")
-                elif op_type == "dtypes":
-                    dtypes = inspect_processor.get_dtypes()
-                    print("Column data types:")
-                    for col, dtype in dtypes.items():
-                        print(f"  {col}: {dtype}")
+                value = args.query
+            elif op_type == "sample":
+                value = args.sample
+            elif op_type in ["head", "tail", "profile_geometries"]:
+                value = getattr(args, op_type)
+
+            if value is not None:
+                operations.append((op_type, value))
+        i += 1
+    return operations
+
+
+def read_reference_file(
+    file_path: str,
+    crs: Optional[int] = None,
+    use_index: bool = False,
+    within: Optional[gpd.GeoDataFrame] = None,
+) -> gpd.GeoDataFrame:
+    """Read a reference file (mask, join or filter input) once per run.
+
+    With ``use_index``, the file is read through its persistent spatial
+    index sidecar, which is built on first use; otherwise it is parsed
+    once per run and cached by path and modification time, so processing
+    a stream of chunks does not read it again for every chunk.
+
+    Args:
+        file_path: Path to the reference file or WKT string
+        crs: Optional CRS to use (if not specified in file)
+        use_index: Whether to read the file through its spatial index
+        within: Optional GeoDataFrame; with an index, only the features
+                whose bounding box intersects its total bounds are read
+
+    Returns:
+        GeoDataFrame of the reference file
+    """
+    if not os.path.exists(file_path):
+        # WKT strings are parsed directly
+        return read_geometry_file(file_path, crs)
+
+    mtime_ns = os.stat(file_path).st_mtime_ns
+    if use_index:
+        try:
+            index = _open_index(file_path, mtime_ns)
+        except FileHandlerError as e:
+            logger.warning(f"{str(e)}; reading {file_path} without index")
+        else:
+            if within is None:
+                gdf = index.read()
+            else:
+                gdf = index.read(
+                    tuple(within.total_bounds), within.crs, default_crs=crs
+                )
+            # Set CRS if provided and not already set
+            if crs is not None:
+                if gdf.crs is None:
+                    gdf.set_crs(crs, inplace=True)
+                else:
+                    gdf = gdf.to_crs(crs)
+            return gdf
+
+    # Operations modify the frames they are given, so every caller gets
+    # its own copy of the cached frame
+    return _read_reference_cached(file_path, crs, mtime_ns).copy()
+
+
+@lru_cache(maxsize=8)
+def _open_index(file_path: str, mtime_ns: int) -> SpatialIndex:
+    """Open the spatial index of a file; cached by path and mtime."""
+    return SpatialIndex.open(file_path)
+
+
+@lru_cache(maxsize=8)
+def _read_reference_cached(
+    file_path: str, crs: Optional[int], mtime_ns: int
+) -> gpd.GeoDataFrame:
+    """Read a reference file; cached by path, CRS and modification time."""
+    return read_geometry_file(file_path, crs)
+
+
+def process_geometries(
+    processor: GeometryProcessor,
+    args: argparse.Namespace,
+    operations: Optional[List[Operation]] = None,
+    profiler: Optional[Profiler] = None,
+) -> Dict[float, gpd.GeoDataFrame]:
+    """Process geometries based on command line arguments.
+
+    Args:
+        processor: GeometryProcessor instance
+        args: Parsed command line arguments
+        operations: Operations to apply; defaults to the operations given
+                    on the command line
+        profiler: Optional profiler measuring every operation as a stage
+
+    Returns:
+        Simplification levels keyed by tolerance, when --simplify is given
+        several tolerances; otherwise an empty dict
+    """
+    try:
+        if operations is None:
+            operations = parse_operations(args)
+        if profiler is None:
+            profiler = Profiler(enabled=False)
+
+        # Apply operations in the order they appear in command line
+        levels: Dict[float, gpd.GeoDataFrame] = {}
+        for position, (op_type, value) in enumerate(operations):
+            # Repeated operations are reported as separate stages
+            name = op_type
+            repeats = [op for op, _ in operations[:position]].count(op_type)
+            if repeats:
+                name = f"{op_type}#{repeats + 1}"
+            with profiler.stage(name, processor.gdf) as stage:
+                levels = _apply_operation(
+                    processor, args, op_type, value, position, operations
+                )
+                stage.output(processor.gdf)
+
+        return levels
 
     except Exception as e:
         logger.error(f"Unexpected error during processing: {str(e)}")
         raise
+
+
+def _apply_operation(
+    processor: GeometryProcessor,
+    args: argparse.Namespace,
+    op_type: str,
+    value: Any,
+    position: int,
+    operations: List[Operation],
+) -> Dict[float, gpd.GeoDataFrame]:
+    """Apply one operation to the geometries of a processor.
+
+    Args:
+        processor: GeometryProcessor instance, updated in place
+        args: Parsed command line arguments
+        op_type: Type of the operation
+        value: Value of the operation
+        position: Position of the operation in ``operations``
+        operations: All operations applied, in order
+
+    Returns:
+        Simplification levels keyed by tolerance, when the operation is
+        --simplify with several tolerances; otherwise an empty dict
+    """
+    if op_type == "mask":
+        mask_gdf = read_reference_file(
+            value, args.mask_crs, not args.no_index, processor.gdf
+        )
+        processor.clip(mask_gdf)
+    elif op_type == "buffer":
+        processor.apply_buffer(value)
+    elif op_type == "h3":
+        processor.polyfill(value)
+    elif op_type == "reproject":
+        processor.reproject(value)
+    elif op_type == "unary_union":
+        processor.unary_union(coverage=args.coverage)
+    elif op_type == "dissolve":
+        processor.dissolve(value, args.aggfunc)
+    elif op_type == "groupby":
+        aggs = parse_aggregations(args.agg) if args.agg else None
+        data_processor = DataProcessor(processor.gdf)
+        processor.gdf = data_processor.groupby(value, aggs)
+    elif op_type == "envelope":
+        processor.envelope()
+    elif op_type == "convex_hull":
+        processor.convex_hull()
+    elif op_type == "centroid":
+        processor.centroid()
+    elif op_type == "make_valid":
+        processor.make_valid()
+    elif op_type == "subdivide":
+        processor.subdivide(value)
+    elif op_type == "precision":
+        processor.set_precision(value)
+    elif op_type == "spatial_sort":
+        processor.spatial_sort(value)
+    elif op_type == "dedupe":
+        processor.dedupe(value)
+    elif op_type == "intersects":
+        if os.path.exists(value):
+            # Read the file
+            other_gdf = read_reference_file(
+                value, None, not args.no_index, processor.gdf
+            )
+            if not other_gdf.crs:
+                raise GeometryOperationError(
+                    f"Input file {value} must have a defined CRS"
+                )
+            processor.gdf = processor.intersects(other_gdf)
+        else:
+            # Treat as WKT
+            processor.gdf = processor.intersects(value)
+    elif op_type == "within_distance":
+        other, distance = value
+        if os.path.exists(other):
+            other = read_reference_file(other, None, not args.no_index)
+        processor.gdf = processor.within_distance(other, float(distance))
+    elif op_type == "sjoin":
+        other_gdf = read_reference_file(
+            value, None, not args.no_index, processor.gdf
+        )
+        processor.sjoin(other_gdf, predicate=args.predicate)
+    elif op_type == "overlay":
+        # Features of FILE away from the input only matter to the
+        # pieces of FILE kept by symmetric difference and union
+        local = args.how in ["intersection", "difference"]
+        other_gdf = read_reference_file(
+            value,
+            None,
+            not args.no_index,
+            processor.gdf if local else None,
+        )
+        processor.overlay(other_gdf, how=args.how)
+    elif op_type == "nearest":
+        other_gdf = read_reference_file(value, None, not args.no_index)
+        processor.nearest(other_gdf, max_distance=args.max_distance)
+    elif op_type == "simplify":
+        coverage = args.coverage_simplify
+        if len(value) == 1:
+            processor.simplify(value[0], coverage=coverage)
+        elif position != len(operations) - 1:
+            raise GeometryOperationError(
+                "--simplify with several tolerances must be the "
+                "last operation"
+            )
+        else:
+            return processor.simplify_levels(value, coverage=coverage)
+    elif op_type == "query":
+        data_processor = DataProcessor(processor.gdf)
+        processor.gdf = data_processor.query(value)
+    elif op_type == "sample":
+        data_processor = DataProcessor(processor.gdf)
+        processor.gdf = data_processor.sample(
+            value, args.seed, args.sample_grid
+        )
+    elif op_type in [
+        "head",
+        "tail",
+        "crs",
+        "shape",
+        "dtypes",
+        "describe",
+        "profile_geometries",
+    ]:
+        inspect_processor = InspectProcessor(processor.gdf)
+        if op_type == "head":
+            result = inspect_processor.head(value if value else 5)
+            print(result)
+        elif op_type == "tail":
+            result = inspect_processor.tail(value if value else 5)
+            print(result)
+        elif op_type == "crs":
+            crs = inspect_processor.get_crs()
+            print(f"CRS: {crs}")
+        elif op_type == "shape":
+            shape = inspect_processor.get_shape()
+            print(f"Shape: {shape[0]} rows × {shape[1]} columns")
+        elif op_type == "dtypes":
+            dtypes = inspect_processor.get_dtypes()
+            print("Column data types:")
+            for col, dtype in dtypes.items():
+                print(f"  {col}: {dtype}")
+        elif op_type == "describe":
+            print(format_description(inspect_processor.describe()))
+        elif op_type == "profile_geometries":
+            print(
+                inspect_processor.profile_geometries(
+                    value, args.h3_res, args.profile_by
+                )
+            )
+    return {}
+
+
+def process_stream(
+    chunks: Iterable[gpd.GeoDataFrame],
+    args: argparse.Namespace,
+    operations: Optional[List[Operation]] = None,
+    profiler: Optional[Profiler] = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Process a stream of chunks based on command line arguments.
+
+    Row-by-row operations are applied to each chunk as it is read. A
+    spatial sort, which must be the last operation, is run as an external
+    merge sort over the processed chunks; a final group by aggregates each
+    chunk into partial states merged into a single result. Deduplication
+    drops the features already seen by earlier chunks.
+
+    Args:
+        chunks: GeoDataFrame chunks of the input
+        args: Parsed command line arguments
+        operations: Operations to apply; defaults to the operations given
+                    on the command line
+        profiler: Optional profiler measuring every operation as a stage,
+                  aggregated over the chunks
+
+    Returns:
+        Iterator over the processed GeoDataFrame chunks
+
+    Raises:
+        GeometryOperationError: If an operation cannot run on chunks
+    """
+    if operations is None:
+        operations = parse_operations(args)
+    if profiler is None:
+        profiler = Profiler(enabled=False)
+    operations = list(operations)
+    final = None
+    if operations and operations[-1][0] in ["spatial_sort", "groupby"]:
+        final = operations.pop()
+    aggs = parse_aggregations(args.agg) if args.agg else None
+
+    for op_type, value in operations:
+        if op_type == "dedupe":
+            continue
+        if (
+            op_type not in CHUNKABLE_OPS
+            or (
+                op_type == "simplify"
+                and (len(value) > 1 or args.coverage_simplify)
+            )
+            or (
+                op_type == "overlay"
+                and args.how not in ["intersection", "difference"]
+            )
+            # Queries over whole columns would be evaluated per chunk
+            or (op_type == "query" and not is_row_query(value))
+        ):
+            flag = next(f for f, op in OP_FLAGS.items() if op == op_type)
+            raise GeometryOperationError(
+                f"{flag} cannot be combined with --chunksize"
+            )
+
+    # Deduplication splits the operations into segments applied chunk by
+    # chunk, with the hashes of the features seen so far kept in between
+    processed: Iterable[gpd.GeoDataFrame] = chunks
+    segment: List[Operation] = []
+    for op_type, value in operations:
+        if op_type == "dedupe":
+            if segment:
+                processed = _process_chunks(processed, args, segment, profiler)
+            processed = profiler.iterate(
+                "dedupe", dedupe_chunks(processed, value)
+            )
+            segment = []
+        else:
+            segment.append((op_type, value))
+    processed = _process_chunks(processed, args, segment, profiler)
+    if final is None:
+        return processed
+    op_type, value = final
+    if op_type == "groupby":
+        with profiler.stage("groupby") as stage:
+            result = aggregate_chunks(processed, value, aggs)
+            stage.output(result)
+        return iter([result])
+    return profiler.iterate(
+        "spatial_sort", spatial_sort_chunks(processed, value)
+    )
+
+
+def _process_chunks(
+    chunks: Iterable[gpd.GeoDataFrame],
+    args: argparse.Namespace,
+    operations: List[Operation],
+    profiler: Optional[Profiler] = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Apply operations to every chunk, skipping chunks left empty."""
+    for chunk in chunks:
+        processor = GeometryProcessor(
+            chunk, workers=args.workers, validate=not args.no_validate
+        )
+        process_geometries(processor, args, operations, profiler)
+        if processor.gdf is not None and not processor.gdf.empty:
+            yield processor.gdf
@@ -5,16 +5,26 @@ various formats, including GeoJSON, Shapefile, CSV with WKT,
 and direct WKT strings.
 """
 
+import tempfile
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Iterator, List, Optional, Union
 
 import geopandas as gpd
 import pandas as pd
 import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.orc as orc
+import shapely
 from loguru import logger
+from pyogrio.raw import open_arrow
 from shapely import wkt
 
+from geoterminal.operators.data_operations import (
+    Sampler,
+    query_columns,
+    query_to_arrow_filter,
+)
+
 
 class FileHandlerError(Exception):
     """Custom exception for file handling errors."""
@@ -34,6 +44,44 @@ WKT_TYPES = [
 ]
 GEOMETRY_COLUMNS = ["geometry", "geom", "wkt", "the_geom"]
 
+# Default number of rows per chunk when reading files in chunks
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def _find_geometry_column(
+    columns: Iterable[str], geometry_column: Optional[str], file_format: str
+) -> str:
+    """Find the column holding WKT geometries.
+
+    Args:
+        columns: Column names of the file
+        geometry_column: Optional name of the column to use
+        file_format: Format name used in error messages (e.g. 'CSV')
+
+    Returns:
+        Name of the geometry column
+
+    Raises:
+        FileHandlerError: If the geometry column is not found
+    """
+    columns = list(columns)
+    if geometry_column:
+        if geometry_column not in columns:
+            raise FileHandlerError(
+                f"Specified geometry column '{geometry_column}' "
+                f"not found in {file_format}"
+            )
+        return geometry_column
+
+    try:
+        return next(
+            col
+            for col in columns
+            if any(col.lower() == g for g in GEOMETRY_COLUMNS)
+        )
+    except StopIteration:
+        raise FileHandlerError(f"No geometry column found in {file_format}")
+
 
 def read_wkt(wkt_str: str, crs: int = 4326) -> gpd.GeoDataFrame:
     """Convert WKT string to GeoDataFrame.
@@ -56,10 +104,40 @@ def read_wkt(wkt_str: str, crs: int = 4326) -> gpd.GeoDataFrame:
         raise FileHandlerError(f"Failed to parse WKT: {str(e)}") from e
 
 
+def _orc_scan_filter(
+    dataset: ds.Dataset, where: Optional[str]
+) -> Optional[ds.Expression]:
+    """Translate a query into a filter of an ORC dataset scan.
+
+    The filter is bound to the schema of the file, which fails where Arrow
+    and pandas differ, e.g. when comparing a string column to a number
+    (which pandas evaluates as False); such queries are left to pandas.
+
+    Args:
+        dataset: ORC dataset
+        where: Optional pandas query
+
+    Returns:
+        Filter expression, or None if the query cannot be pushed down
+    """
+    arrow_filter = query_to_arrow_filter(where) if where else None
+    if arrow_filter is None:
+        return None
+    try:
+        dataset.scanner(filter=arrow_filter, columns=[])
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        logger.info("Query does not apply to the ORC schema, using pandas")
+        return None
+    logger.info(f"Pushing query down to ORC scan: {arrow_filter}")
+    return arrow_filter
+
+
 def read_orc_with_geometry(
     file_path: Path,
     crs: Optional[int] = None,
     geometry_column: Optional[str] = None,
+    where: Optional[str] = None,
+    sampler: Optional[Sampler] = None,
 ) -> gpd.GeoDataFrame:
     """Read ORC file containing geometry information.
 
@@ -68,6 +146,11 @@ def read_orc_with_geometry(
         crs: Optional coordinate reference system
         geometry_column: Optional name of column
                         containing WKT geometry strings
+        where: Optional pandas query on attribute columns, applied before
+              parsing geometries. Translatable queries are pushed down to
+              the Arrow dataset scan.
+        sampler: Optional sampler applied after ``where``, before parsing
+                geometries
 
     Returns:
         GeoDataFrame from ORC
@@ -77,29 +160,18 @@ def read_orc_with_geometry(
     """
     try:
         # Read ORC file into pandas DataFrame
-        table = orc.read_table(str(file_path))
-        df = table.to_pandas()
-
-        # Use specified geometry column or try to find one
-        if geometry_column:
-            if geometry_column not in df.columns:
-                raise FileHandlerError(
-                    f"Specified geometry column '{geometry_column}' \
-                    not found in ORC"
-                )
-            geom_col = geometry_column
+        dataset = ds.dataset(str(file_path), format="orc")
+        arrow_filter = _orc_scan_filter(dataset, where)
+        if arrow_filter is not None:
+            df = dataset.to_table(filter=arrow_filter).to_pandas()
         else:
-            # Find geometry column
-            try:
-                geom_col = next(
-                    col
-                    for col in df.columns
-                    if any(col.lower() == g for g in GEOMETRY_COLUMNS)
-                )
-            except StopIteration:
-                geom_col = None
-            if geom_col is None:
-                raise FileHandlerError("No geometry column found in ORC")
+            df = orc.read_table(str(file_path)).to_pandas()
+            if where:
+                df = df.query(where)
+
+        geom_col = _find_geometry_column(df.columns, geometry_column, "ORC")
+        if sampler is not None:
+            df = sampler.sample(df, geom_col)
 
         # Convert WKT strings to geometries
         df["geometry"] = df[geom_col].apply(wkt.loads)
@@ -119,12 +191,20 @@ def read_csv_with_geometry(
     file_path: Path,
     crs: Optional[int] = None,
     geometry_column: Optional[str] = None,
+    where: Optional[str] = None,
+    sampler: Optional[Sampler] = None,
 ) -> gpd.GeoDataFrame:
     """Read CSV file containing geometry information.
 
     Args:
         file_path: Path to CSV file
         crs: Optional coordinate reference system
+        geometry_column: Optional name of column
+                        containing WKT geometry strings
+        where: Optional pandas query on attribute columns, applied before
+              parsing geometries
+        sampler: Optional sampler applied after ``where``, before parsing
+                geometries
 
     Returns:
         GeoDataFrame from CSV
@@ -134,27 +214,12 @@ def read_csv_with_geometry(
     """
     try:
         df = pd.read_csv(file_path)
+        if where:
+            df = df.query(where)
 
-        # Use specified geometry column or try to find one
-        if geometry_column:
-            if geometry_column not in df.columns:
-                raise FileHandlerError(
-                    f"Specified geometry column '{geometry_column}'\
-                    not found in CSV"
-                )
-            geom_col = geometry_column
-        else:
-            # Find geometry column
-            try:
-                geom_col = next(
-                    col
-                    for col in df.columns
-                    if any(col.lower() == g for g in GEOMETRY_COLUMNS)
-                )
-            except StopIteration:
-                geom_col = None
-            if geom_col is None:
-                raise FileHandlerError("No geometry column found in CSV")
+        geom_col = _find_geometry_column(df.columns, geometry_column, "CSV")
+        if sampler is not None:
+            df = sampler.sample(df, geom_col)
 
         # Convert WKT strings to geometries
         df["geometry"] = df[geom_col].apply(wkt.loads)
@@ -172,10 +237,49 @@ def read_csv_with_geometry(
         raise FileHandlerError(f"Failed to read CSV: {str(e)}") from e
 
 
+def supports_pushdown(
+    file_path: Union[str, Path],
+    query_string: str,
+    geometry_column: Optional[str] = None,
+) -> bool:
+    """Check whether a query can filter a file before geometry parsing.
+
+    This holds for CSV and ORC files when the query only references
+    attribute columns of the file and is evaluated row by row, so that
+    filtering each chunk gives the same rows as filtering the whole file.
+
+    Args:
+        file_path: Path to the geometry file
+        query_string: Query string in pandas query format
+        geometry_column: Optional name of column containing WKT geometry
+
+    Returns:
+        True if the query can be passed as ``where`` to the readers
+    """
+    path = Path(str(file_path))
+    suffix = path.suffix.lower()
+    if suffix not in NONGEOSPATIAL_FORMATS or not path.exists():
+        return False
+    names = query_columns(query_string)
+    if names is None:
+        return False
+    try:
+        if suffix == ".csv":
+            columns = list(pd.read_csv(path, nrows=0).columns)
+        else:
+            columns = orc.ORCFile(str(path)).schema.names
+        geom_col = _find_geometry_column(columns, geometry_column, "file")
+    except Exception:
+        return False
+    return names <= set(columns) - {geom_col, "geometry"}
+
+
 def read_geometry_file(
     file_path: Union[str, Path],
     crs: Optional[int] = None,
     geometry_column: Optional[str] = None,
+    where: Optional[str] = None,
+    sampler: Optional[Sampler] = None,
 ) -> gpd.GeoDataFrame:
     """Read geometry from various file formats.
 
@@ -188,6 +292,13 @@ def read_geometry_file(
     Args:
         file_path: Path to the geometry file or WKT string
         crs: Optional CRS to use (if not specified in file)
+        geometry_column: Optional name of column containing WKT geometry
+                         strings (for CSV/ORC files)
+        where: Optional pandas query, filtering CSV and ORC rows before
+              their geometries are parsed (see ``supports_pushdown``) and
+              other formats after reading
+        sampler: Optional sampler applied after ``where``, before CSV and
+                ORC geometries are parsed
 
     Returns:
         GeoDataFrame containing the geometries
@@ -214,12 +325,22 @@ def read_geometry_file(
         elif suffix == ".shp":
             gdf = gpd.read_file(path)
         elif suffix == ".csv":
-            gdf = read_csv_with_geometry(path, crs, geometry_column)
+            gdf = read_csv_with_geometry(
+                path, crs, geometry_column, where, sampler
+            )
         elif suffix == ".orc":
-            gdf = read_orc_with_geometry(path, crs, geometry_column)
+            gdf = read_orc_with_geometry(
+                path, crs, geometry_column, where, sampler
+            )
         else:
             raise FileHandlerError(f"Unsupported file format: {suffix}")
 
+        if suffix not in NONGEOSPATIAL_FORMATS:
+            if where:
+                gdf = gdf.query(where)
+            if sampler is not None:
+                gdf = sampler.sample(gdf)
+
         # Set CRS if provided and not already set
         if crs is not None:
             if gdf.crs is None:
@@ -235,6 +356,202 @@ def read_geometry_file(
         raise FileHandlerError(f"Failed to read geometry: {str(e)}") from e
 
 
+def _parse_wkt_chunk(
+    df: pd.DataFrame, geom_col: str, drop: bool, crs: Optional[int]
+) -> gpd.GeoDataFrame:
+    """Convert a chunk with a WKT column to a GeoDataFrame.
+
+    Args:
+        df: Chunk of a CSV or ORC file
+        geom_col: Name of the WKT column
+        drop: Whether to drop the WKT column when it is not 'geometry'
+        crs: Optional coordinate reference system
+
+    Returns:
+        GeoDataFrame of the chunk
+    """
+    df["geometry"] = df[geom_col].apply(wkt.loads)
+    if drop and geom_col != "geometry":
+        df = df.drop(geom_col, axis=1)
+    gdf = gpd.GeoDataFrame(df, geometry="geometry")
+    if crs is not None:
+        gdf.set_crs(crs, inplace=True)
+    return gdf
+
+
+def iter_geometry_file(
+    file_path: Union[str, Path],
+    crs: Optional[int] = None,
+    geometry_column: Optional[str] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    where: Optional[str] = None,
+    sampler: Optional[Sampler] = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Read geometry from a file in chunks of rows.
+
+    Supports the same inputs as ``read_geometry_file``. CSV files are read
+    in chunks of ``chunksize`` rows, ORC files stripe by stripe (or in
+    batches of a filtered dataset scan) and GeoJSON/Shapefile in batches
+    of a single sequential reader; a WKT string is a single chunk.
+
+    Args:
+        file_path: Path to the geometry file or WKT string
+        crs: Optional CRS to use (if not specified in file)
+        geometry_column: Optional name of column containing WKT geometry
+                         strings (for CSV/ORC files)
+        chunksize: Number of rows per chunk
+        where: Optional pandas query on attribute columns, filtering each
+              chunk before its geometries are parsed (CSV/ORC files) or
+              after reading it (other formats)
+        sampler: Optional sampler applied after ``where``, before CSV and
+                ORC geometries are parsed. A fraction is sampled chunk by
+                chunk; a number of rows is yielded as a last chunk once
+                the whole file is read.
+
+    Yields:
+        GeoDataFrame chunks, in file order
+
+    Raises:
+        FileHandlerError: If file reading fails
+    """
+    try:
+        if any(wkt_type in str(file_path) for wkt_type in WKT_TYPES):
+            yield read_wkt(str(file_path), crs or 4326)
+            return
+
+        path = Path(file_path)
+        if not path.exists():
+            raise FileHandlerError(f"File not found: {file_path}")
+
+        suffix = path.suffix.lower()
+        logger.info(f"Reading file in chunks with format: {suffix}")
+
+        chunks: Iterable[gpd.GeoDataFrame]
+        if suffix in [".geojson", ".json", ".shp"]:
+            chunks = _iter_ogr_chunks(path, chunksize)
+            if where:
+                chunks = (gdf.query(where) for gdf in chunks)
+            if sampler is not None:
+                chunks = _iter_sampled(chunks, sampler)
+        elif suffix == ".csv":
+            chunks = _iter_csv_chunks(
+                path, crs, geometry_column, chunksize, where, sampler
+            )
+        elif suffix == ".orc":
+            chunks = _iter_orc_chunks(
+                path, crs, geometry_column, where, sampler
+            )
+        else:
+            raise FileHandlerError(f"Unsupported file format: {suffix}")
+
+        for gdf in chunks:
+            # Set CRS if provided and not already set
+            if crs is not None:
+                if gdf.crs is None:
+                    gdf.set_crs(crs, inplace=True)
+                else:
+                    gdf = gdf.to_crs(crs)
+            yield gdf
+
+    except Exception as e:
+        if isinstance(e, FileHandlerError):
+            raise
+        raise FileHandlerError(f"Failed to read geometry: {str(e)}") from e
+
+
+def _iter_ogr_chunks(path: Path, chunksize: int) -> Iterator[gpd.GeoDataFrame]:
+    """Read a GeoJSON or Shapefile in batches of rows from a single reader.
+
+    The file is opened once and parsed sequentially, as formats such as
+    GeoJSON have no random access to a range of rows.
+    """
+    with open_arrow(path, batch_size=chunksize, use_pyarrow=True) as (
+        meta,
+        reader,
+    ):
+        geom_col = meta["geometry_name"] or "wkb_geometry"
+        for batch in reader:
+            df = batch.to_pandas()
+            geoms = shapely.from_wkb(df.pop(geom_col).to_numpy())
+            yield gpd.GeoDataFrame(df, geometry=geoms, crs=meta["crs"])
+
+
+def _iter_csv_chunks(
+    path: Path,
+    crs: Optional[int],
+    geometry_column: Optional[str],
+    chunksize: int,
+    where: Optional[str] = None,
+    sampler: Optional[Sampler] = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Read a CSV file with a WKT column in chunks of rows."""
+    frames: Iterable[pd.DataFrame] = pd.read_csv(path, chunksize=chunksize)
+    if where:
+        frames = (df.query(where) for df in frames)
+    if sampler is not None:
+        frames = _iter_sampled(frames, sampler, geometry_column, "CSV")
+    for df in frames:
+        geom_col = _find_geometry_column(df.columns, geometry_column, "CSV")
+        yield _parse_wkt_chunk(df, geom_col, True, crs)
+
+
+def _iter_orc_chunks(
+    path: Path,
+    crs: Optional[int],
+    geometry_column: Optional[str],
+    where: Optional[str] = None,
+    sampler: Optional[Sampler] = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Read an ORC file with a WKT column stripe by stripe."""
+    dataset = ds.dataset(str(path), format="orc")
+    arrow_filter = _orc_scan_filter(dataset, where)
+    batches: Iterable[pd.DataFrame]
+    if arrow_filter is not None:
+        batches = (
+            batch.to_pandas()
+            for batch in dataset.to_batches(filter=arrow_filter)
+        )
+    else:
+        orc_file = orc.ORCFile(str(path))
+        batches = (
+            orc_file.read_stripe(stripe).to_pandas()
+            for stripe in range(orc_file.nstripes)
+        )
+
+    if where and arrow_filter is None:
+        batches = (df.query(where) for df in batches)
+    if sampler is not None:
+        batches = _iter_sampled(batches, sampler, geometry_column, "ORC")
+    for df in batches:
+        geom_col = _find_geometry_column(df.columns, geometry_column, "ORC")
+        yield _parse_wkt_chunk(df, geom_col, False, crs)
+
+
+def _iter_sampled(
+    frames: Iterable[pd.DataFrame],
+    sampler: Sampler,
+    geometry_column: Optional[str] = None,
+    file_format: str = "file",
+) -> Iterator[pd.DataFrame]:
+    """Sample a stream of frames, skipping frames left empty.
+
+    Raw frames are sampled on their WKT column, before it is parsed; a
+    reservoir is yielded as a last frame once the stream is exhausted.
+    """
+    for df in frames:
+        geom_col = None
+        if not isinstance(df, gpd.GeoDataFrame):
+            geom_col = _find_geometry_column(
+                df.columns, geometry_column, file_format
+            )
+        df = sampler.update(df, geom_col)
+        if not df.empty:
+            yield df
+    rest = sampler.finish()
+    if rest is not None and not rest.empty:
+        yield rest
+
+
 def export_data(gdf: gpd.GeoDataFrame, output_file: Union[str, Path]) -> None:
     """Export GeoDataFrame to various formats.
 
@@ -299,6 +616,136 @@ def export_data(gdf: gpd.GeoDataFrame, output_file: Union[str, Path]) -> None:
         raise FileHandlerError(f"Failed to export data: {str(e)}") from e
 
 
+def export_chunks(
+    chunks: Iterable[gpd.GeoDataFrame], output_file: Union[str, Path]
+) -> None:
+    """Export GeoDataFrame chunks to a single file as they are produced.
+
+    CSV, GeoJSON and Shapefile outputs are written incrementally, so the
+    chunks never have to be held in memory together; ORC chunks are
+    spilled to temporary files and written once their schemas are unified.
+    WKT output needs every geometry at once and is exported after
+    collecting the chunks.
+
+    Args:
+        chunks: GeoDataFrame chunks to export, in order
+        output_file: Path to output file
+
+    Raises:
+        FileHandlerError: If export fails or there are no chunks to export
+    """
+    path = Path(output_file)
+    suffix = path.suffix.lower()
+    if suffix not in [".geojson", ".json", ".csv", ".shp", ".zip", ".orc"]:
+        collected = list(chunks)
+        if not collected:
+            raise FileHandlerError("No features left to export")
+        export_data(
+            gpd.GeoDataFrame(
+                pd.concat(collected, ignore_index=True),
+                crs=collected[0].crs,
+            ),
+            path,
+        )
+        return
+
+    # ORC files have a single schema, while the dtypes of chunks may drift,
+    # e.g. an integer column of a CSV chunk read as float in a later chunk
+    # holding missing values. ORC chunks are spilled to disk until every
+    # schema is known, then written with a schema unified across chunks.
+    spill = tempfile.TemporaryDirectory() if suffix == ".orc" else None
+    runs: List[Path] = []
+    written = 0
+    try:
+        logger.debug(f"Exporting chunks to format: {suffix}")
+        for i, gdf in enumerate(chunks):
+            written += 1
+            mode = "w" if i == 0 else "a"
+            if suffix in [".geojson", ".json"]:
+                gdf.to_file(path, driver="GeoJSON", mode=mode)
+            elif suffix in [".shp", ".zip"]:
+                gdf.to_file(path, driver="ESRI Shapefile", mode=mode)
+            else:
+                # Convert geometry to WKT for CSV and ORC export
+                df = pd.DataFrame(gdf)
+                if "geometry" in df.columns:
+                    df["geometry"] = df["geometry"].apply(
+                        lambda x: x.wkt if x else None
+                    )
+                if suffix == ".csv":
+                    df.to_csv(path, index=False, mode=mode, header=i == 0)
+                elif spill is not None:
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    run = Path(spill.name) / f"{i}.arrow"
+                    with pa.ipc.new_file(str(run), table.schema) as writer:
+                        writer.write_table(table)
+                    runs.append(run)
+
+        # Every chunk was filtered out, so no output file was created
+        if not written:
+            raise FileHandlerError("No features left to export")
+        if runs:
+            _write_orc_runs(runs, path)
+        logger.debug(f"Successfully exported to {output_file}")
+
+    except FileHandlerError:
+        raise
+    except Exception as e:
+        raise FileHandlerError(f"Failed to export data: {str(e)}") from e
+    finally:
+        if spill is not None:
+            spill.cleanup()
+
+
+def _write_orc_runs(runs: List[Path], path: Path) -> None:
+    """Write spilled Arrow chunks to one ORC file with a unified schema.
+
+    Args:
+        runs: Arrow IPC files of the chunks, in order
+        path: Path of the ORC file
+    """
+    schemas = []
+    for run in runs:
+        with pa.memory_map(str(run)) as source:
+            schemas.append(pa.ipc.open_file(source).schema)
+    schema = _unify_schemas(schemas)
+
+    writer = orc.ORCWriter(str(path))
+    try:
+        for run in runs:
+            with pa.memory_map(str(run)) as source:
+                table = pa.ipc.open_file(source).read_all()
+                writer.write(table.cast(schema))
+    finally:
+        writer.close()
+
+
+def _unify_schemas(schemas: List[pa.Schema]) -> pa.Schema:
+    """Unify the schemas of chunks with the same columns.
+
+    Columns that are null in some chunks take the type of the others, and
+    columns mixing integer and floating point types become float64.
+
+    Args:
+        schemas: Arrow schemas of the chunks
+
+    Returns:
+        Schema every chunk can be cast to
+    """
+    fields = []
+    for field in schemas[0]:
+        types = {schema.field(field.name).type for schema in schemas}
+        types.discard(pa.null())
+        if len(types) == 1:
+            field = field.with_type(types.pop())
+        elif types and all(
+            pa.types.is_integer(t) or pa.types.is_floating(t) for t in types
+        ):
+            field = field.with_type(pa.float64())
+        fields.append(field)
+    return pa.schema(fields)
+
+
 # For backward compatibility
 def load_data(
     input_file: Union[str, Path], input_crs: int = 4326
@@ -0,0 +1,391 @@
+"""Persistent spatial index for reference files.
+
+Reference layers used by ``--mask``, ``--intersects`` and ``--sjoin`` are
+often static files queried by many runs. The first time such a file is
+used, its features are written in Hilbert order to a sidecar file in the
+user cache directory (``$XDG_CACHE_HOME/geoterminal/index``), together
+with their bounding boxes and the node boxes of a packed R-tree. Later
+runs memory-map the sidecar, query the tree and decode only the features
+that can match, instead of parsing the whole file and building an index
+again.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import shapely
+from loguru import logger
+from pyproj import CRS, Transformer
+
+from geoterminal.io.file import FileHandlerError, read_geometry_file
+from geoterminal.operators.geometry_operations import spatial_sort_keys
+
+# Suffix appended to the reference file name to get its sidecar
+SIDECAR_SUFFIX = ".gtidx"
+
+# Version of the sidecar layout; older sidecars are rebuilt
+SIDECAR_VERSION = "2"
+
+# Files of a Shapefile dataset, whose changes all make a sidecar stale
+SHAPEFILE_PARTS = [".shp", ".shx", ".dbf", ".prj", ".cpg"]
+
+# Number of children per node of the packed R-tree
+NODE_SIZE = 16
+
+# Columns holding the WKB geometry and bounding box of every feature
+_WKB_COLUMN = "__wkb"
+_BOUNDS_COLUMNS = ["__minx", "__miny", "__maxx", "__maxy"]
+
+Bounds = Tuple[float, float, float, float]
+
+
+def index_dir() -> Path:
+    """Get the cache directory of the sidecar indexes."""
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "geoterminal" / "index"
+
+
+def sidecar_path(file_path: Union[str, Path]) -> Path:
+    """Get the path of the sidecar index of a file.
+
+    Sidecars are kept in the cache directory rather than next to the data,
+    which may be read-only or shared; they are named after the file and a
+    hash of its absolute path.
+    """
+    path = Path(file_path).resolve()
+    key = hashlib.blake2b(str(path).encode(), digest_size=8).hexdigest()
+    return index_dir() / f"{path.name}.{key}{SIDECAR_SUFFIX}"
+
+
+def _file_hash(path: Path) -> str:
+    """Hash the content of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_files(path: Path) -> List[Path]:
+    """Get the files making up a dataset, e.g. all parts of a Shapefile."""
+    if path.suffix.lower() != ".shp":
+        return [path]
+    return sorted(
+        part
+        for part in path.parent.glob(f"{path.stem}.*")
+        if part.stem == path.stem and part.suffix.lower() in SHAPEFILE_PARTS
+    )
+
+
+def _stamp(path: Path) -> dict:
+    """Record the size, modification time and hash of a dataset's files."""
+    stamp = {}
+    for part in _source_files(path):
+        stat = part.stat()
+        stamp[part.name] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": _file_hash(part),
+        }
+    return stamp
+
+
+def _check_stamp(path: Path, stamp: dict) -> Optional[bool]:
+    """Check a dataset against the stamp recorded in its sidecar.
+
+    Returns:
+        None if a file changed, True if every file matches but some only
+        by content hash (so the stamp should be refreshed), False if every
+        file matches by size and modification time
+    """
+    parts = _source_files(path)
+    if sorted(part.name for part in parts) != sorted(stamp):
+        return None
+    touched = False
+    for part in parts:
+        recorded = stamp[part.name]
+        stat = part.stat()
+        if stat.st_size != recorded["size"]:
+            return None
+        if stat.st_mtime_ns != recorded["mtime_ns"]:
+            if _file_hash(part) != recorded["hash"]:
+                return None
+            recorded["mtime_ns"] = stat.st_mtime_ns
+            touched = True
+    return touched
+
+
+def _write_sidecar(sidecar: Path, table: pa.Table) -> None:
+    """Write a sidecar atomically, so concurrent runs never see it partial."""
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        with pa.ipc.new_file(str(tmp), table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, sidecar)
+    except OSError as e:
+        tmp.unlink(missing_ok=True)
+        raise FileHandlerError(
+            f"Failed to write spatial index {sidecar}: {str(e)}"
+        ) from e
+
+
+def _pack_tree(boxes: np.ndarray) -> List[np.ndarray]:
+    """Build the levels of a packed R-tree over sorted boxes.
+
+    Args:
+        boxes: Array of shape (n, 4) of feature boxes, in curve order
+
+    Returns:
+        Node boxes of every level above the features, from the leaves'
+        parents up to the single root
+    """
+    levels = []
+    while len(boxes) > 1:
+        starts = np.arange(0, len(boxes), NODE_SIZE)
+        boxes = np.column_stack(
+            [
+                np.minimum.reduceat(boxes[:, 0], starts),
+                np.minimum.reduceat(boxes[:, 1], starts),
+                np.maximum.reduceat(boxes[:, 2], starts),
+                np.maximum.reduceat(boxes[:, 3], starts),
+            ]
+        )
+        levels.append(boxes)
+    return levels
+
+
+def _intersecting(boxes: np.ndarray, bounds: Bounds) -> np.ndarray:
+    """Get a mask of the boxes intersecting the given bounds."""
+    minx, miny, maxx, maxy = bounds
+    return (
+        (boxes[:, 0] <= maxx)
+        & (boxes[:, 2] >= minx)
+        & (boxes[:, 1] <= maxy)
+        & (boxes[:, 3] >= miny)
+    )
+
+
+class SpatialIndex:
+    """Memory-mapped sidecar index of a reference file."""
+
+    def __init__(self, table: pa.Table, metadata: dict) -> None:
+        """Initialize the index from a memory-mapped sidecar table.
+
+        Args:
+            table: Features in curve order, with WKB and bounds columns
+            metadata: Sidecar metadata (source file stamp, CRS, tree)
+        """
+        self.table = table
+        self.crs = metadata["crs"] or None
+        self.geometry_name = metadata["geometry_name"]
+        self.boxes = np.column_stack(
+            [table.column(c).to_numpy() for c in _BOUNDS_COLUMNS]
+        )
+        tree = np.frombuffer(metadata["tree"], dtype=np.float64)
+        nodes = tree.reshape(-1, 4)
+        offsets = metadata["level_offsets"]
+        self.levels = [
+            nodes[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])
+        ]
+
+    @classmethod
+    def open(cls, file_path: Union[str, Path]) -> "SpatialIndex":
+        """Open the sidecar of a file, building it if missing or stale.
+
+        A sidecar is reused when the size and modification time of every
+        file of the dataset (all parts of a Shapefile) match the ones
+        recorded in it, or when the sizes match and the content hashes do;
+        the recorded modification times are then refreshed.
+
+        Args:
+            file_path: Path to the reference file
+
+        Returns:
+            Index of the file
+
+        Raises:
+            FileHandlerError: If the index cannot be read or built
+        """
+        path = Path(file_path)
+        sidecar = sidecar_path(path)
+        try:
+            if sidecar.exists():
+                index = cls._load(path, sidecar)
+                if index is not None:
+                    return index
+                logger.info(f"Spatial index of {path} is stale, rebuilding")
+            return cls.build(path)
+        except Exception as e:
+            if isinstance(e, FileHandlerError):
+                raise
+            raise FileHandlerError(
+                f"Failed to open spatial index: {str(e)}"
+            ) from e
+
+    @classmethod
+    def _load(cls, path: Path, sidecar: Path) -> Optional["SpatialIndex"]:
+        """Memory-map a sidecar, returning None if it does not match."""
+        reader = pa.ipc.open_file(pa.memory_map(str(sidecar)))
+        raw = reader.schema.metadata or {}
+        if raw.get(b"version", b"").decode() != SIDECAR_VERSION:
+            return None
+
+        stamp = json.loads(raw[b"source"])
+        touched = _check_stamp(path, stamp)
+        if touched is None:
+            return None
+
+        table = reader.read_all()
+        if touched:
+            # Record the new modification times, so later runs do not hash
+            # the unchanged files again
+            table = table.replace_schema_metadata(
+                {**raw, b"source": json.dumps(stamp).encode()}
+            )
+            try:
+                _write_sidecar(sidecar, table)
+            except FileHandlerError as e:
+                logger.debug(str(e))
+
+        logger.info(f"Using spatial index {sidecar}")
+        metadata = json.loads(raw[b"index"])
+        metadata["tree"] = raw[b"tree"]
+        return cls(table, metadata)
+
+    @classmethod
+    def build(cls, file_path: Union[str, Path]) -> "SpatialIndex":
+        """Build the sidecar of a file and open it.
+
+        Args:
+            file_path: Path to the reference file
+
+        Returns:
+            Index of the file
+
+        Raises:
+            FileHandlerError: If the file cannot be read or the sidecar
+                              cannot be written
+        """
+        path = Path(file_path)
+        sidecar = sidecar_path(path)
+        stamp = _stamp(path)
+        gdf = read_geometry_file(path)
+        logger.info(f"Building spatial index {sidecar}")
+
+        geoms = np.asarray(gdf.geometry.values)
+        boxes = shapely.bounds(geoms)
+        if len(gdf):
+            extent = tuple(gdf.geometry.total_bounds)
+            order = np.argsort(
+                spatial_sort_keys(geoms, "hilbert", extent), kind="stable"
+            )
+            geoms, boxes = geoms[order], boxes[order]
+            gdf = gdf.iloc[order]
+        # Missing and empty geometries never match a query
+        boxes = np.where(
+            np.isnan(boxes), [np.inf, np.inf, -np.inf, -np.inf], boxes
+        )
+
+        df = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+        df[_WKB_COLUMN] = shapely.to_wkb(geoms)
+        for i, column in enumerate(_BOUNDS_COLUMNS):
+            df[column] = boxes[:, i]
+
+        levels = _pack_tree(boxes)
+        level_sizes = [len(level) for level in levels]
+        metadata = {
+            "crs": gdf.crs.to_wkt() if gdf.crs else "",
+            "geometry_name": gdf.geometry.name,
+            "level_offsets": np.concatenate([[0], np.cumsum(level_sizes)])
+            .astype(int)
+            .tolist(),
+        }
+        tree = (np.concatenate(levels) if levels else np.empty((0, 4))).astype(
+            np.float64
+        )
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata(
+            {
+                "version": SIDECAR_VERSION,
+                "source": json.dumps(stamp),
+                "index": json.dumps(metadata),
+                "tree": tree.tobytes(),
+            }
+        )
+
+        _write_sidecar(sidecar, table)
+
+        loaded = cls._load(path, sidecar)
+        if loaded is None:
+            raise FileHandlerError(f"Spatial index {sidecar} is invalid")
+        return loaded
+
+    def query(self, bounds: Bounds) -> np.ndarray:
+        """Find the features whose bounding box intersects the bounds.
+
+        The packed tree is descended level by level, testing all children
+        of the matching nodes at once.
+
+        Args:
+            bounds: Query bounds (minx, miny, maxx, maxy) in the index CRS
+
+        Returns:
+            Sorted positions of the matching features
+        """
+        levels = [self.boxes, *self.levels]
+        candidates = np.flatnonzero(_intersecting(levels[-1], bounds))
+        offsets = np.arange(NODE_SIZE)
+        for boxes in reversed(levels[:-1]):
+            children = (candidates[:, None] * NODE_SIZE + offsets).ravel()
+            children = children[children < len(boxes)]
+            candidates = children[_intersecting(boxes[children], bounds)]
+        return candidates
+
+    def read(
+        self,
+        bounds: Optional[Bounds] = None,
+        crs: Optional[Any] = None,
+        default_crs: Optional[Any] = None,
+    ) -> gpd.GeoDataFrame:
+        """Read the features of the index, optionally within bounds.
+
+        Args:
+            bounds: Optional query bounds (minx, miny, maxx, maxy)
+            crs: CRS of the bounds; defaults to the index CRS
+            default_crs: CRS of the indexed coordinates when the file has
+                         none. Without any, the bounds are not compared to
+                         coordinates of an unknown CRS and all features
+                         are read.
+
+        Returns:
+            GeoDataFrame of the matching features, in the index CRS
+        """
+        table = self.table
+        index_crs = self.crs if self.crs is not None else default_crs
+        if bounds is not None and index_crs is not None:
+            if crs is not None:
+                target = CRS.from_user_input(index_crs)
+                source = CRS.from_user_input(crs)
+                if source != target:
+                    bounds = _transform_bounds(bounds, source, target)
+            table = table.take(self.query(bounds))
+
+        df = table.drop_columns([_WKB_COLUMN, *_BOUNDS_COLUMNS]).to_pandas()
+        df[self.geometry_name] = shapely.from_wkb(
+            table.column(_WKB_COLUMN).to_numpy(zero_copy_only=False)
+        )
+        return gpd.GeoDataFrame(df, geometry=self.geometry_name, crs=self.crs)
+
+
+def _transform_bounds(bounds: Bounds, source: CRS, target: CRS) -> Bounds:
+    """Transform bounds between CRSs, densifying the edges."""
+    transformer = Transformer.from_crs(source, target, always_xy=True)
+    return transformer.transform_bounds(*bounds, densify_pts=21)
@@ -4,11 +4,92 @@ This module provides classes and functions for performing
 non-geometric operations on GeoDataFrames, such as filtering and querying.
 """
 
-from typing import Optional
+import ast
+import operator
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import shapely
 from loguru import logger
 
+# Comparisons of a query that can be translated into Arrow filters
+ARROW_COMPARISONS: Dict[Type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+# Spatial functions and names available in queries, evaluated on the
+# geometry array (column names take precedence over names)
+SPATIAL_QUERY_FUNCTIONS = ["bbox", "area", "num_points"]
+SPATIAL_QUERY_NAMES = ["geom_type"]
+
+# Geometry type names by shapely type id
+GEOMETRY_TYPE_NAMES = np.array(
+    [
+        "Point",
+        "LineString",
+        "LinearRing",
+        "Polygon",
+        "MultiPoint",
+        "MultiLineString",
+        "MultiPolygon",
+        "GeometryCollection",
+        None,
+    ],
+    dtype=object,
+)
+
+# Aggregation functions supported by groupby, with the partial states they
+# keep per group and how each state merges across chunks
+AGG_STATES = {
+    "count": ["count"],
+    "sum": ["sum"],
+    "min": ["min"],
+    "max": ["max"],
+    "mean": ["sum", "count"],
+    "first": ["first"],
+    "last": ["last"],
+}
+STATE_MERGES = {
+    "count": "sum",
+    "sum": "sum",
+    "min": "min",
+    "max": "max",
+    "first": "first",
+    "last": "last",
+}
+
+Aggregation = Tuple[str, str]
+
+# Helper columns of sample reservoirs: random key, input position and grid
+# cell of every kept row
+_SAMPLE_KEY = "__sample_key"
+_SAMPLE_ROW = "__sample_row"
+_SAMPLE_CELL = ["__sample_cell_x", "__sample_cell_y"]
+
+# First coordinate pair of a WKT string
+_WKT_FIRST_XY = (
+    r"\(\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)\s+([-+]?[\d.]+(?:[eE][-+]?\d+)?)"
+)
+
 
 class DataOperationError(Exception):
     """Custom exception for data operation errors."""
@@ -42,9 +123,16 @@ class DataProcessor:
     def query(self, query_string: str) -> gpd.GeoDataFrame:
         """Filter the GeoDataFrame using a pandas query string.
 
+        Besides columns, the query can use spatial terms evaluated on the
+        geometry array: ``bbox(minx, miny, maxx, maxy)`` (geometries
+        intersecting the box), ``area()``, ``num_points()`` and
+        ``geom_type`` (e.g. ``geom_type == 'Polygon'``). Each term is
+        computed once, vectorized, and the whole expression is evaluated
+        in a single filter pass.
+
         Args:
             query_string: Query string in pandas query format
-            (e.g., "column > value")
+            (e.g., "column > value" or "area() > 10 and value < 5")
 
         Returns:
             Filtered GeoDataFrame
@@ -57,9 +145,635 @@ class DataProcessor:
 
         try:
             logger.info(f"Applying query: {query_string}")
-            self.gdf = self.gdf.query(query_string)
+            query_string, resolvers = _spatial_resolvers(
+                query_string, self.gdf
+            )
+            self.gdf = self.gdf.query(query_string, resolvers=[resolvers])
             return self.gdf
         except Exception as e:
             raise DataOperationError(
                 f"Query operation failed: {str(e)}"
             ) from e
+
+    def groupby(
+        self, by: List[str], aggs: Optional[List[Aggregation]] = None
+    ) -> gpd.GeoDataFrame:
+        """Aggregate attribute columns per group of key columns.
+
+        Groups are hashed (not sorted) and aggregated column by column;
+        the result has no geometries.
+
+        Args:
+            by: Key columns
+            aggs: (column, function) pairs, with functions among 'count',
+                 'sum', 'min', 'max', 'mean', 'first' and 'last'. Defaults
+                 to the number of rows per group, in a 'count' column.
+
+        Returns:
+            GeoDataFrame with one row per group, the key columns and one
+            '<column>_<function>' column per aggregation
+
+        Raises:
+            DataOperationError: If aggregation fails
+        """
+        if self.gdf is None:
+            raise DataOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Grouping by {', '.join(by)}")
+            self.gdf = aggregate_chunks([self.gdf], by, aggs)
+            return self.gdf
+        except Exception as e:
+            raise DataOperationError(
+                f"Group by operation failed: {str(e)}"
+            ) from e
+
+    def sample(
+        self,
+        size: float,
+        seed: Optional[int] = None,
+        grid: Optional[float] = None,
+    ) -> gpd.GeoDataFrame:
+        """Take a random sample of the rows.
+
+        Args:
+            size: Fraction of rows (below 1) or number of rows to keep
+            seed: Optional seed of the random generator
+            grid: Optional cell size; keeps up to ``size`` rows per grid
+                 cell instead of overall
+
+        Returns:
+            GeoDataFrame of the sampled rows, in input order
+
+        Raises:
+            DataOperationError: If the sample size is invalid or sampling
+                                fails
+        """
+        if self.gdf is None:
+            raise DataOperationError("No GeoDataFrame set")
+
+        sampler = Sampler(size, seed, grid)
+        try:
+            unit = "fraction of the rows" if size < 1 else "rows"
+            logger.info(f"Sampling {size:g} {unit}")
+            self.gdf = sampler.sample(self.gdf)
+            return self.gdf
+        except Exception as e:
+            raise DataOperationError(
+                f"Sample operation failed: {str(e)}"
+            ) from e
+
+
+class Sampler:
+    """Random sample of the rows of a stream of DataFrames.
+
+    A fraction of rows is drawn by Bernoulli trials, chunk by chunk. A
+    number of rows is drawn with a reservoir: every row gets a random key
+    and the rows with the smallest keys seen so far are kept, which is a
+    uniform sample whatever the chunking. With a grid, a reservoir is kept
+    per cell of the first vertex of the geometries, so sparse regions keep
+    their rows.
+
+    Rows can be raw frames with a WKT column, sampled before their
+    geometries are parsed, or GeoDataFrames. Keys are drawn in row order,
+    so a seed gives the same sample for any chunking.
+    """
+
+    def __init__(
+        self,
+        size: float,
+        seed: Optional[int] = None,
+        grid: Optional[float] = None,
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            size: Fraction of rows (below 1) or number of rows to keep
+            seed: Optional seed of the random generator
+            grid: Optional cell size, in CRS units, of a stratified sample
+
+        Raises:
+            DataOperationError: If the sample size or grid is invalid
+        """
+        if size <= 0 or (size >= 1 and not float(size).is_integer()):
+            raise DataOperationError(
+                f"Invalid sample size {size:g}: expected a fraction "
+                "between 0 and 1 or a number of rows"
+            )
+        if grid is not None and (grid <= 0 or size < 1):
+            raise DataOperationError(
+                "A stratified sample needs a positive cell size and a "
+                "number of rows per cell"
+            )
+        self.fraction = size if size < 1 else None
+        self.size = int(size)
+        self.grid = grid
+        self.rng = np.random.default_rng(seed)
+        self.seen = 0
+        self.reservoir: Optional[pd.DataFrame] = None
+
+    def update(
+        self, df: pd.DataFrame, geometry_column: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Sample a chunk of rows.
+
+        Args:
+            df: Chunk of rows
+            geometry_column: WKT column of raw frames, used by a grid
+
+        Returns:
+            Rows sampled from the chunk with a fraction; with a number of
+            rows, an empty frame, the sample being returned by ``finish``
+        """
+        keys = self.rng.random(len(df))
+        rows = np.arange(self.seen, self.seen + len(df))
+        self.seen += len(df)
+        if self.fraction is not None:
+            return df[keys < self.fraction]
+
+        if self.grid is None and self.reservoir is not None:
+            # Only rows beating the largest kept key can enter a full
+            # reservoir
+            if len(self.reservoir) == self.size:
+                threshold = self.reservoir[_SAMPLE_KEY].iloc[-1]
+                keep = keys < threshold
+                df, keys, rows = df[keep], keys[keep], rows[keep]
+
+        pool = df.assign(**{_SAMPLE_KEY: keys, _SAMPLE_ROW: rows})
+        if self.grid is not None:
+            cells = np.floor(
+                _first_coordinates(df, geometry_column) / self.grid
+            )
+            pool[_SAMPLE_CELL[0]] = cells[:, 0]
+            pool[_SAMPLE_CELL[1]] = cells[:, 1]
+        if self.reservoir is not None:
+            pool = pd.concat([self.reservoir, pool])
+        pool = pool.sort_values(_SAMPLE_KEY, kind="stable")
+        if self.grid is None:
+            self.reservoir = pool.head(self.size)
+        else:
+            grouped = pool.groupby(_SAMPLE_CELL, sort=False, dropna=False)
+            self.reservoir = grouped.head(self.size)
+        return df.iloc[:0]
+
+    def finish(self) -> Optional[pd.DataFrame]:
+        """Get the rows of the reservoir, in input order.
+
+        Returns:
+            Sampled rows, or None when sampling a fraction or when no rows
+            were seen
+        """
+        if self.reservoir is None:
+            return None
+        helpers = [_SAMPLE_KEY, _SAMPLE_ROW]
+        if self.grid is not None:
+            helpers += _SAMPLE_CELL
+        return self.reservoir.sort_values(_SAMPLE_ROW).drop(columns=helpers)
+
+    def sample(
+        self, df: pd.DataFrame, geometry_column: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Sample all rows at once.
+
+        Args:
+            df: Rows to sample
+            geometry_column: WKT column of raw frames, used by a grid
+
+        Returns:
+            Sampled rows, in input order
+        """
+        sampled = self.update(df, geometry_column)
+        rest = self.finish()
+        return sampled if rest is None else rest
+
+
+def _first_coordinates(
+    df: pd.DataFrame, geometry_column: Optional[str] = None
+) -> np.ndarray:
+    """Get the first vertex of every geometry of a frame.
+
+    Args:
+        df: GeoDataFrame, or raw frame with a WKT column
+        geometry_column: WKT column of a raw frame
+
+    Returns:
+        Array of shape (n, 2), NaN for missing and empty geometries
+    """
+    if isinstance(df, gpd.GeoDataFrame):
+        coords, index = shapely.get_coordinates(
+            np.asarray(df.geometry.values), return_index=True
+        )
+        xy = np.full((len(df), 2), np.nan)
+        rows, first = np.unique(index, return_index=True)
+        xy[rows] = coords[first]
+        return xy
+    if geometry_column is None:
+        raise DataOperationError("No geometry column to stratify on")
+    wkt = df[geometry_column].astype(str)
+    return wkt.str.extract(_WKT_FIRST_XY).astype(float).to_numpy()
+
+
+def parse_aggregations(spec: str) -> List[Aggregation]:
+    """Parse an aggregation specification such as 'pop:sum,id:count'.
+
+    Args:
+        spec: Comma-separated column:function pairs
+
+    Returns:
+        List of (column, function) pairs
+
+    Raises:
+        DataOperationError: If the specification is malformed
+    """
+    aggs = []
+    for item in spec.split(","):
+        column, _, func = item.strip().rpartition(":")
+        if not column or func not in AGG_STATES:
+            raise DataOperationError(
+                f"Invalid aggregation '{item}', expected column:function "
+                f"with function among {', '.join(AGG_STATES)}"
+            )
+        aggs.append((column, func))
+    return aggs
+
+
+def aggregate_chunks(
+    chunks: Iterable[pd.DataFrame],
+    by: List[str],
+    aggs: Optional[List[Aggregation]] = None,
+) -> gpd.GeoDataFrame:
+    """Aggregate chunks per group through partial aggregation.
+
+    Every chunk is reduced to one row of partial states per group, which
+    is merged into the running partial states, so memory grows with the
+    number of groups rather than with the input.
+
+    Args:
+        chunks: DataFrame chunks sharing the same columns
+        by: Key columns
+        aggs: (column, function) pairs; defaults to the row count per
+             group
+
+    Returns:
+        GeoDataFrame with one row per group and no geometries
+
+    Raises:
+        DataOperationError: If a column or function is unknown
+    """
+    aggs = list(aggs) if aggs else []
+    states = sorted(
+        {
+            (column, state)
+            for column, func in aggs
+            for state in AGG_STATES[func]
+        }
+    )
+    crs = None
+    merged: Optional[pd.DataFrame] = None
+    for chunk in chunks:
+        if isinstance(chunk, gpd.GeoDataFrame):
+            crs = chunk.crs
+        missing = [
+            c for c in [*by, *(c for c, _ in states)] if c not in chunk.columns
+        ]
+        if missing:
+            raise DataOperationError(f"Columns not found: {missing}")
+
+        partial = _partial_states(chunk, by, states)
+        if merged is not None:
+            partial = _partial_states(
+                pd.concat([merged, partial]), by, states, merge=True
+            )
+        merged = partial
+
+    if merged is None:
+        raise DataOperationError("No data to aggregate")
+
+    result = merged[by].copy()
+    for column, func in aggs:
+        if func == "mean":
+            values = merged[f"{column}__sum"] / merged[f"{column}__count"]
+        else:
+            values = merged[f"{column}__{AGG_STATES[func][0]}"]
+        result[f"{column}_{func}"] = values
+    if not aggs:
+        result["count"] = merged["__rows"]
+    return gpd.GeoDataFrame(
+        result.reset_index(drop=True),
+        geometry=[None] * len(result),
+        crs=crs,
+    )
+
+
+def _partial_states(
+    df: pd.DataFrame,
+    by: List[str],
+    states: List[Tuple[str, str]],
+    merge: bool = False,
+) -> pd.DataFrame:
+    """Reduce rows to one row of aggregation states per group.
+
+    Args:
+        df: Input rows, or partial states to merge
+        by: Key columns
+        states: (column, state) pairs to compute
+        merge: Whether ``df`` holds partial states to merge
+
+    Returns:
+        DataFrame with the key columns, a '__rows' count and one
+        '<column>__<state>' column per state
+    """
+    grouped = df.groupby(by, sort=False, dropna=False)
+    if merge:
+        names = [f"{column}__{state}" for column, state in states]
+        spec = {
+            name: (name, STATE_MERGES[state])
+            for name, (_, state) in zip(names, states)
+        }
+        spec["__rows"] = ("__rows", "sum")
+    else:
+        spec = {
+            f"{column}__{state}": (column, state) for column, state in states
+        }
+        spec["__rows"] = (by[0], "size")
+    return grouped.agg(**spec).reset_index()
+
+
+def _spatial_resolvers(
+    query_string: str, gdf: gpd.GeoDataFrame
+) -> Tuple[str, Dict[str, pd.Series]]:
+    """Replace the spatial terms of a query by precomputed series.
+
+    Args:
+        query_string: Query string in pandas query format
+        gdf: GeoDataFrame the query applies to
+
+    Returns:
+        Rewritten query and the series of each replaced term, by name
+
+    Raises:
+        DataOperationError: If a spatial function is called incorrectly
+    """
+    try:
+        tree = ast.parse(query_string.strip(), mode="eval")
+    except SyntaxError:
+        # Left to pandas (e.g. backtick quoted names)
+        return query_string, {}
+
+    geoms = np.asarray(gdf.geometry.values)
+    cache: Dict[str, np.ndarray] = {}
+    resolvers: Dict[str, pd.Series] = {}
+    replacements: List[Tuple[ast.expr, str]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            name = node.func.id
+            if name not in SPATIAL_QUERY_FUNCTIONS:
+                continue
+            args = [ast.literal_eval(arg) for arg in node.args]
+            if name == "bbox":
+                if len(args) != 4:
+                    raise DataOperationError(
+                        "bbox() takes minx, miny, maxx and maxy"
+                    )
+                values = _bbox_mask(geoms, args, cache)
+            elif args:
+                raise DataOperationError(f"{name}() takes no arguments")
+            elif name == "area":
+                values = shapely.area(geoms)
+            else:
+                values = shapely.get_num_coordinates(geoms)
+            term = f"__{name}_{len(resolvers)}"
+        elif (
+            isinstance(node, ast.Name)
+            and node.id in SPATIAL_QUERY_NAMES
+            and node.id not in gdf.columns
+        ):
+            values = GEOMETRY_TYPE_NAMES[shapely.get_type_id(geoms)]
+            term = f"__{node.id}_{len(resolvers)}"
+        else:
+            continue
+        resolvers[term] = pd.Series(values, index=gdf.index)
+        replacements.append((node, term))
+
+    return _replace_nodes(query_string.strip(), replacements), resolvers
+
+
+def _bbox_mask(
+    geoms: np.ndarray, box: List[float], cache: Dict[str, np.ndarray]
+) -> np.ndarray:
+    """Find the geometries intersecting a box.
+
+    Geometry bounds are computed once per query and used to skip the
+    exact test for geometries whose bounds do not overlap the box.
+    """
+    if "bounds" not in cache:
+        cache["bounds"] = shapely.bounds(geoms)
+    bounds = cache["bounds"]
+    minx, miny, maxx, maxy = box
+    candidates = np.flatnonzero(
+        (bounds[:, 0] <= maxx)
+        & (bounds[:, 2] >= minx)
+        & (bounds[:, 1] <= maxy)
+        & (bounds[:, 3] >= miny)
+    )
+    mask = np.zeros(len(geoms), dtype=bool)
+    mask[candidates] = shapely.intersects(
+        geoms[candidates], shapely.box(minx, miny, maxx, maxy)
+    )
+    return mask
+
+
+def _replace_nodes(
+    source: str, replacements: List[Tuple[ast.expr, str]]
+) -> str:
+    """Replace the source text of AST nodes, from last to first.
+
+    Args:
+        source: Source the nodes were parsed from
+        replacements: Nodes and their replacement text
+
+    Returns:
+        Rewritten source
+    """
+    # AST offsets count UTF-8 bytes within each line
+    lines = source.encode().split(b"\n")
+    starts = np.cumsum([0] + [len(line) + 1 for line in lines])
+    encoded = source.encode()
+    spans = []
+    for node, text in replacements:
+        start = starts[node.lineno - 1] + node.col_offset
+        end_line = node.end_lineno or node.lineno
+        end = starts[end_line - 1] + (node.end_col_offset or 0)
+        spans.append((start, end, text))
+    for start, end, text in sorted(spans, reverse=True):
+        encoded = encoded[:start] + text.encode() + encoded[end:]
+    return encoded.decode()
+
+
+def query_columns(query_string: str) -> Optional[Set[str]]:
+    """Get the names referenced by a pandas query string.
+
+    Args:
+        query_string: Query string in pandas query format
+
+    Returns:
+        Referenced names, or None if the query is not a plain Python
+        expression (e.g. it uses backticks or '@' variables), or if it
+        calls functions (such as the spatial functions), accesses
+        attributes or subscripts columns. Only the queries for which names
+        are returned are evaluated row by row: ``value > value.mean()``
+        depends on all the rows at once.
+    """
+    try:
+        tree = ast.parse(query_string.strip(), mode="eval")
+    except SyntaxError:
+        return None
+    nodes = list(ast.walk(tree))
+    if any(
+        isinstance(node, (ast.Call, ast.Attribute, ast.Subscript))
+        for node in nodes
+    ):
+        return None
+    return {node.id for node in nodes if isinstance(node, ast.Name)}
+
+
+def is_row_query(query_string: str) -> bool:
+    """Check whether a query keeps or drops every row on its own.
+
+    Such queries, which may use the spatial terms, give the same rows on
+    chunks of a frame as on the whole frame. Queries accessing attributes
+    or subscripting columns (e.g. ``value > value.mean()``) do not.
+
+    Args:
+        query_string: Query string in pandas query format
+
+    Returns:
+        True if the query is evaluated row by row
+    """
+    # Backticked names and '@' variables are plain names for this check
+    expression = re.sub(r"`[^`]*`", "_", query_string).replace("@", "")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        return False
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Attribute, ast.Subscript)):
+            return False
+        if isinstance(node, ast.Call) and not (
+            isinstance(node.func, ast.Name)
+            and node.func.id in SPATIAL_QUERY_FUNCTIONS
+        ):
+            return False
+    return True
+
+
+def query_to_arrow_filter(query_string: str) -> Optional[pc.Expression]:
+    """Translate a pandas query string into an Arrow dataset filter.
+
+    Comparisons between columns and constants, ``in``/``not in`` lists and
+    their boolean combinations are supported. Missing values compare like
+    in pandas: only ``!=`` and ``not in`` keep them.
+
+    Args:
+        query_string: Query string in pandas query format
+
+    Returns:
+        Equivalent filter expression, or None if the query cannot be
+        translated
+    """
+    try:
+        tree = ast.parse(query_string.strip(), mode="eval")
+        return _arrow_expression(tree.body)
+    except (SyntaxError, _UntranslatableQuery):
+        return None
+
+
+class _UntranslatableQuery(Exception):
+    """Raised when part of a query has no Arrow equivalent."""
+
+
+def _arrow_expression(node: ast.AST) -> pc.Expression:
+    """Translate a boolean query node into an Arrow expression."""
+    if isinstance(node, ast.BoolOp):
+        combine = (
+            operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        )
+        result = _arrow_expression(node.values[0])
+        for value in node.values[1:]:
+            result = combine(result, _arrow_expression(value))
+        return result
+    if isinstance(node, ast.BinOp) and isinstance(
+        node.op, (ast.BitAnd, ast.BitOr)
+    ):
+        # pandas gives '&' and '|' a lower precedence than comparisons;
+        # only parenthesized operands parse the same way in Python
+        combine = (
+            operator.and_ if isinstance(node.op, ast.BitAnd) else operator.or_
+        )
+        return combine(
+            _arrow_expression(node.left), _arrow_expression(node.right)
+        )
+    if isinstance(node, ast.UnaryOp) and isinstance(
+        node.op, (ast.Not, ast.Invert)
+    ):
+        return ~_arrow_expression(node.operand)
+    if isinstance(node, ast.Compare):
+        operands = [node.left, *node.comparators]
+        result = None
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            term = _arrow_comparison(op, left, right)
+            result = term if result is None else result & term
+        return result
+    raise _UntranslatableQuery(ast.dump(node))
+
+
+def _arrow_comparison(
+    op: ast.cmpop, left: ast.AST, right: ast.AST
+) -> pc.Expression:
+    """Translate a single comparison, with pandas missing value rules."""
+    if isinstance(op, (ast.In, ast.NotIn)):
+        if not isinstance(left, ast.Name) or not isinstance(
+            right, (ast.List, ast.Tuple, ast.Set)
+        ):
+            raise _UntranslatableQuery(ast.dump(op))
+        values = [_arrow_value(element) for element in right.elts]
+        result = pc.field(left.id).isin(values)
+        return ~result if isinstance(op, ast.NotIn) else result
+
+    if type(op) not in ARROW_COMPARISONS:
+        raise _UntranslatableQuery(ast.dump(op))
+    fields = [n.id for n in (left, right) if isinstance(n, ast.Name)]
+    if not fields:
+        raise _UntranslatableQuery(ast.dump(op))
+    result = ARROW_COMPARISONS[type(op)](
+        _arrow_operand(left), _arrow_operand(right)
+    )
+    valid = pc.field(fields[0]).is_valid()
+    for field in fields[1:]:
+        valid = valid & pc.field(field).is_valid()
+    if isinstance(op, ast.NotEq):
+        return result | ~valid
+    return result & valid
+
+
+def _arrow_operand(node: ast.AST) -> Any:
+    """Translate a column name or constant of a comparison."""
+    if isinstance(node, ast.Name):
+        return pc.field(node.id)
+    return pc.scalar(_arrow_value(node))
+
+
+def _arrow_value(node: ast.AST) -> Any:
+    """Get the value of a constant node, including negative numbers."""
+    if isinstance(node, ast.Constant) and isinstance(
+        node.value, (bool, int, float, str)
+    ):
+        return node.value
+    if (
+        isinstance(node, ast.UnaryOp)
+        and isinstance(node.op, ast.USub)
+        and isinstance(node.operand, ast.Constant)
+        and isinstance(node.operand.value, (int, float))
+    ):
+        return -node.operand.value
+    raise _UntranslatableQuery(ast.dump(node))
@@ -4,13 +4,89 @@ This module provides classes and functions for performing geometric operations
 on geospatial data, such as buffering, reprojection, and clipping.
 """
 
-from typing import Optional, Union
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import shapely
 from loguru import logger
+from pyproj import CRS, Transformer
+
+from geoterminal.operators.h3_operations import H3Processor
+from geoterminal.operators.parallel import (
+    CHUNKS_PER_WORKER,
+    GeometryFunc,
+    map_geometries,
+    run_chunked,
+    split_chunks,
+)
 
 # Configure logging
 
+# Projected CRS used for operations measured in meters
+METRIC_CRS = 3857
+
+# Number of geometries whose coordinates are hulled at once
+HULL_CHUNK_SIZE = 100_000
+
+# Maximum number of geometries unioned by one task in a dissolve
+DISSOLVE_CHUNK_SIZE = 10_000
+
+# Attribute aggregation functions supported by dissolve
+DISSOLVE_AGGFUNCS = ["first", "sum", "count"]
+
+# Smallest vertex budget accepted by subdivide
+MIN_SUBDIVIDE_VERTICES = 5
+
+# Maximum number of times a geometry is halved by subdivide
+MAX_SUBDIVIDE_DEPTH = 50
+
+# Space-filling curves supported by spatial sort
+SPATIAL_SORT_METHODS = ["hilbert", "morton"]
+
+# Bits per axis of the space-filling curve grid (keys fit in 64 bits)
+SFC_BITS = 32
+
+# Rows per record batch in the sorted runs of an external spatial sort
+SORT_RUN_BATCH_SIZE = 65_536
+
+# Column holding the space-filling curve key in sorted runs
+_SORT_KEY = "__sfc_key"
+
+# Spatial predicates supported by sjoin
+SJOIN_PREDICATES = ["intersects", "within", "contains"]
+
+# Overlay operations supported by overlay
+OVERLAY_HOWS = ["intersection", "difference", "symmetric_difference", "union"]
+
+# Keys identifying duplicate features: the geometry alone, or the geometry
+# and all attribute columns
+DEDUPE_KEYS = ["geometry", "geometry+cols"]
+
+# Column receiving the distance to the nearest feature, suffixed with
+# '_right' when the joined layers already have one
+NEAREST_DISTANCE_COLUMN = "nearest_distance"
+
+# State loaded once per pool worker by its initializer, e.g. the spatial
+# index of the right-hand layer of a spatial join. Only the worker
+# processes fill it; the parent process always queries its own index.
+_worker_state: Dict[str, Any] = {}
+
 
 class GeometryOperationError(Exception):
     """Custom exception for geometry operation errors."""
@@ -27,26 +103,181 @@ class GeometryProcessor:
     input validation and proper error handling.
     """
 
-    def __init__(self, input_gdf: Optional[gpd.GeoDataFrame] = None):
-        """Initialize the processor with an optional GeoDataFrame."""
+    def __init__(
+        self,
+        input_gdf: Optional[gpd.GeoDataFrame] = None,
+        workers: int = 1,
+        validate: bool = True,
+    ):
+        """Initialize the processor with an optional GeoDataFrame.
+
+        Args:
+            input_gdf: Optional GeoDataFrame to process
+            workers: Number of worker processes for parallel operations
+            validate: Whether to warn about invalid geometries
+        """
+        self._validity: Optional[bool] = None
+        self._from_polyfill = False
         self.gdf = input_gdf
+        self.workers = workers
+        self.validate = validate
         self._validate_gdf()
 
+    @property
+    def gdf(self) -> Optional[gpd.GeoDataFrame]:
+        """The GeoDataFrame being processed."""
+        return self._gdf
+
+    @gdf.setter
+    def gdf(self, gdf: Optional[gpd.GeoDataFrame]) -> None:
+        self._gdf = gdf
+        self._geometries_changed()
+
+    def _geometries_changed(self) -> None:
+        """Forget what is known about geometries that were replaced.
+
+        Every method changing the geometries calls it, as does assigning
+        ``gdf`` or ``set_data``. Edits made directly to ``gdf`` in place
+        must be followed by ``set_data`` to be taken into account.
+        """
+        self._validity = None
+        self._from_polyfill = False
+
+    def _set_geometries(self, geoms: np.ndarray) -> None:
+        """Replace the geometries of the GeoDataFrame in place."""
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+        self.gdf[self.gdf.geometry.name] = geoms
+        self._geometries_changed()
+
     def _validate_gdf(self) -> None:
         """Validate the GeoDataFrame."""
         if self.gdf is not None:
             if not isinstance(self.gdf, gpd.GeoDataFrame):
                 raise GeometryOperationError("Input must be a GeoDataFrame")
-            if not self.gdf.geometry.is_valid.all():
-                logger.warning(
-                    "Some geometries in the GeoDataFrame are invalid"
-                )
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether all geometries are valid.
+
+        Validity is computed lazily and cached until the geometries of the
+        GeoDataFrame change.
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+        if self._validity is None:
+            self._validity = bool(self.gdf.geometry.is_valid.all())
+        return self._validity
+
+    def _check_validity(self) -> None:
+        """Warn once about invalid geometries, unless validation is off."""
+        if not self.validate or self.gdf is None:
+            return
+        if self._validity is None and not self.is_valid:
+            logger.warning("Some geometries in the GeoDataFrame are invalid")
+
+    def polyfill(self, resolution: int) -> gpd.GeoDataFrame:
+        """Replace the geometries with the H3 cells covering them.
+
+        Until the geometries change again, ``unary_union`` recognizes the
+        cells as a coverage when they are distinct and of one resolution.
+
+        Args:
+            resolution: H3 resolution level (0-15)
+
+        Returns:
+            GeoDataFrame with one row per H3 cell and its hexagon geometry
+
+        Raises:
+            H3OperationError: If polyfill fails
+        """
+        self.gdf = H3Processor(self.gdf).polyfill(
+            resolution, include_geometry=True
+        )
+        self._from_polyfill = True
+        return self.gdf
 
     def set_data(self, gdf: gpd.GeoDataFrame) -> None:
         """Set the GeoDataFrame to process."""
         self.gdf = gdf
         self._validate_gdf()
 
+    def _map_geometries(self, func: GeometryFunc) -> np.ndarray:
+        """Apply an element-wise geometry function over the workers.
+
+        Args:
+            func: Picklable function mapping a geometry array to an array
+                  of the same length
+
+        Returns:
+            Array with the result of ``func`` for every geometry
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+        geoms = np.asarray(self.gdf.geometry.values)
+        return map_geometries(func, geoms, self.workers)
+
+    def make_valid(self) -> gpd.GeoDataFrame:
+        """Repair invalid geometries.
+
+        Geometries are repaired in parallel batches; valid geometries are
+        left unchanged.
+
+        Returns:
+            GeoDataFrame with valid geometries
+
+        Raises:
+            GeometryOperationError: If repair fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info("Repairing invalid geometries")
+            self._set_geometries(self._map_geometries(shapely.make_valid))
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Make valid operation failed: {str(e)}"
+            ) from e
+
+    def set_precision(self, grid_size: float) -> gpd.GeoDataFrame:
+        """Snap coordinates to a grid of the given size.
+
+        Geometries are rebuilt so that they stay valid after snapping;
+        parts that collapse below the grid size are removed.
+
+        Args:
+            grid_size: Grid size in the units of the geometry's coordinates
+
+        Returns:
+            GeoDataFrame with reduced coordinate precision
+
+        Raises:
+            GeometryOperationError: If operation fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Snapping coordinates to a grid of {grid_size}")
+            if grid_size <= 0:
+                raise GeometryOperationError(f"Invalid grid size: {grid_size}")
+            self._set_geometries(
+                self._map_geometries(
+                    partial(
+                        shapely.set_precision,
+                        grid_size=grid_size,
+                        mode="valid_output",
+                    )
+                )
+            )
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Precision operation failed: {str(e)}"
+            ) from e
+
     def apply_buffer(self, buffer_size: float) -> gpd.GeoDataFrame:
         """Apply a buffer operation to the geometry.
 
@@ -64,11 +295,14 @@ class GeometryProcessor:
 
         try:
             logger.info(f"Applying buffer of {buffer_size} meters")
-            og_crs = self.gdf.crs
-            self.gdf.geometry = (
-                self.gdf.geometry.to_crs(epsg=3857)
-                .buffer(buffer_size)
-                .to_crs(og_crs)
+            self._set_geometries(
+                self._map_geometries(
+                    partial(
+                        _buffer_geometries,
+                        distance=buffer_size,
+                        crs=self.gdf.crs,
+                    )
+                )
             )
             return self.gdf
         except Exception as e:
@@ -93,7 +327,14 @@ class GeometryProcessor:
 
         try:
             logger.info(f"Reprojecting to CRS: {output_crs}")
-            self.gdf = self.gdf.to_crs(crs=output_crs)
+            geoms = self._map_geometries(
+                partial(
+                    _reproject_geometries, src=self.gdf.crs, dst=output_crs
+                )
+            )
+            gdf = self.gdf.copy()
+            gdf[gdf.geometry.name] = geoms
+            self.gdf = gdf.set_crs(output_crs, allow_override=True)
             return self.gdf
         except Exception as e:
             raise GeometryOperationError(
@@ -117,6 +358,7 @@ class GeometryProcessor:
 
         try:
             logger.info("Applying clip operation")
+            self._check_validity()
             if self.gdf.crs != mask_gdf.crs:
                 logger.info("Converting mask to match input CRS")
                 mask_gdf = mask_gdf.to_crs(self.gdf.crs)
@@ -128,9 +370,20 @@ class GeometryProcessor:
                 f"Clipping operation failed: {str(e)}"
             ) from e
 
-    def unary_union(self) -> gpd.GeoDataFrame:
+    def unary_union(self, coverage: Optional[bool] = None) -> gpd.GeoDataFrame:
         """Compute the unary union of all geometries in the GeoDataFrame.
 
+        Non-overlapping coverages (such as H3 cells or administrative
+        tilings) are merged with the much faster coverage union. Other
+        inputs are sorted along a Hilbert curve, split into chunks that are
+        unioned in a process pool and then merged pairwise.
+
+        Args:
+            coverage: Whether the input is a non-overlapping coverage.
+                     If None, only the distinct cells of one resolution
+                     produced by ``polyfill`` and left unchanged since are
+                     treated as a coverage.
+
         Returns:
             GeoDataFrame with a single geometry representing the union
 
@@ -141,8 +394,22 @@ class GeometryProcessor:
             raise GeometryOperationError("No GeoDataFrame set")
 
         try:
-            logger.info("Computing unary union")
-            union_geom = self.gdf.geometry.unary_union
+            self._check_validity()
+            if coverage is None:
+                coverage = self._from_polyfill and _is_h3_coverage(self.gdf)
+
+            geoms = np.asarray(self.gdf.geometry.values)
+            if coverage:
+                logger.info("Computing coverage union")
+                union_geom = shapely.coverage_union_all(geoms)
+            else:
+                logger.info("Computing unary union")
+                if self.workers > 1 and len(geoms) > self.workers:
+                    order = np.argsort(
+                        self.gdf.geometry.hilbert_distance().to_numpy()
+                    )
+                    geoms = geoms[order]
+                union_geom = _tree_union(geoms, self.workers)
             self.gdf = gpd.GeoDataFrame(
                 geometry=[union_geom], crs=self.gdf.crs
             )
@@ -152,6 +419,191 @@ class GeometryProcessor:
                 f"Unary union operation failed: {str(e)}"
             ) from e
 
+    def dissolve(self, by: str, aggfunc: str = "first") -> gpd.GeoDataFrame:
+        """Dissolve geometries into one feature per value of a column.
+
+        The geometries of every group are unioned in a process pool. Groups
+        larger than ``DISSOLVE_CHUNK_SIZE`` are split into chunks whose
+        partial unions are merged hierarchically.
+
+        Args:
+            by: Column whose values define the groups
+            aggfunc: Aggregation applied to the other attribute columns
+                    ('first', 'sum' or 'count')
+
+        Returns:
+            GeoDataFrame with one row per group
+
+        Raises:
+            GeometryOperationError: If dissolve operation fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Dissolving geometries by '{by}' ({aggfunc})")
+            if by not in self.gdf.columns:
+                raise GeometryOperationError(f"Column '{by}' not found")
+            if aggfunc not in DISSOLVE_AGGFUNCS:
+                raise GeometryOperationError(
+                    f"Unsupported aggregation function: {aggfunc}"
+                )
+            self._check_validity()
+
+            geom_col = self.gdf.geometry.name
+            grouped = self.gdf.drop(columns=geom_col).groupby(by, sort=True)
+            if aggfunc == "sum":
+                attrs = grouped.sum(numeric_only=True)
+            else:
+                attrs = getattr(grouped, aggfunc)()
+
+            codes, _ = pd.factorize(self.gdf[by], sort=True)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(attrs) + 1))
+            wkb = shapely.to_wkb(np.asarray(self.gdf.geometry.values))
+            groups = np.split(wkb[order], bounds)[1:-1]
+            union_wkb = _dissolve_groups(groups, self.workers)
+
+            self.gdf = gpd.GeoDataFrame(
+                attrs.reset_index(),
+                geometry=shapely.from_wkb(np.array(union_wkb, dtype=object)),
+                crs=self.gdf.crs,
+            )
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Dissolve operation failed: {str(e)}"
+            ) from e
+
+    def subdivide(self, max_vertices: int) -> gpd.GeoDataFrame:
+        """Split geometries into pieces with at most max_vertices vertices.
+
+        Geometries over the budget are recursively cut in two halves of
+        their bounding box, across its longer side. Each piece keeps the
+        attributes of its source feature.
+
+        Args:
+            max_vertices: Maximum number of vertices per piece
+
+        Returns:
+            GeoDataFrame with one row per piece
+
+        Raises:
+            GeometryOperationError: If subdivision fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Subdividing geometries to {max_vertices} vertices")
+            if max_vertices < MIN_SUBDIVIDE_VERTICES:
+                raise GeometryOperationError(
+                    f"Invalid vertex budget: {max_vertices}. "
+                    f"Must be at least {MIN_SUBDIVIDE_VERTICES}"
+                )
+
+            geoms = np.asarray(self.gdf.geometry.values)
+            if self.workers <= 1:
+                pieces, counts = _subdivide_geometries(geoms, max_vertices)
+            else:
+                n_chunks = self.workers * CHUNKS_PER_WORKER
+                parts = run_chunked(
+                    partial(_subdivide_wkb, max_vertices=max_vertices),
+                    split_chunks(shapely.to_wkb(geoms), n_chunks),
+                    self.workers,
+                )
+                pieces = shapely.from_wkb(
+                    np.concatenate([p[0] for p in parts])
+                )
+                counts = np.concatenate([p[1] for p in parts])
+
+            gdf = self.gdf.iloc[np.repeat(np.arange(len(geoms)), counts)]
+            gdf = gdf.reset_index(drop=True)
+            gdf[gdf.geometry.name] = pieces
+            self.gdf = gdf
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Subdivide operation failed: {str(e)}"
+            ) from e
+
+    def spatial_sort(self, method: str = "hilbert") -> gpd.GeoDataFrame:
+        """Order features along a space-filling curve.
+
+        Keys are computed in one vectorized pass from the centres of the
+        geometry bounding boxes, on a grid spanning the area of use of the
+        CRS (or the total bounds of the data without a known area), so the
+        order matches the one of ``spatial_sort_chunks``.
+
+        Args:
+            method: Space-filling curve ('hilbert' or 'morton')
+
+        Returns:
+            GeoDataFrame sorted by curve key
+
+        Raises:
+            GeometryOperationError: If sorting fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Sorting features along a {method} curve")
+            keys = spatial_sort_keys(
+                np.asarray(self.gdf.geometry.values),
+                method,
+                _sort_extent(self.gdf),
+            )
+            self.gdf = self.gdf.iloc[np.argsort(keys, kind="stable")]
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Spatial sort failed: {str(e)}"
+            ) from e
+
+    def dedupe(self, key: str = "geometry") -> gpd.GeoDataFrame:
+        """Drop duplicate features, keeping their first occurrence.
+
+        Geometries are normalized and encoded as WKB in one vectorized
+        pass, then hashed (with the attributes for 'geometry+cols'); rows
+        sharing a hash are compared on their WKB, so hash collisions never
+        drop a feature.
+
+        Args:
+            key: 'geometry' to compare geometries only, 'geometry+cols' to
+                 also compare all attribute columns
+
+        Returns:
+            GeoDataFrame without duplicates, in input order
+
+        Raises:
+            GeometryOperationError: If deduplication fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+        if key not in DEDUPE_KEYS:
+            raise GeometryOperationError(
+                f"Invalid dedupe key '{key}', expected one of {DEDUPE_KEYS}"
+            )
+
+        try:
+            logger.info(f"Dropping duplicate features by {key}")
+            hashes, wkb = feature_hashes(self.gdf, key)
+            _, first, inverse = np.unique(
+                hashes, return_index=True, return_inverse=True
+            )
+            first = first[inverse.ravel()]
+            keep = first == np.arange(len(hashes))
+            # A duplicate whose WKB differs from the first row with its hash
+            # is a collision and is kept
+            keep |= wkb != wkb[first]
+            self.gdf = self.gdf[keep]
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Dedupe operation failed: {str(e)}"
+            ) from e
+
     def envelope(self) -> gpd.GeoDataFrame:
         """Compute the bounding box of all geometries in the GeoDataFrame.
 
@@ -182,9 +634,19 @@ class GeometryProcessor:
                 f"Envelope operation failed: {str(e)}"
             ) from e
 
-    def convex_hull(self) -> gpd.GeoDataFrame:
+    def convex_hull(
+        self, chunk_size: int = HULL_CHUNK_SIZE
+    ) -> gpd.GeoDataFrame:
         """Compute the convex hull of all geometries in the GeoDataFrame.
 
+        The hull is built directly from the coordinates of the geometries
+        instead of from their union. Geometries are processed in chunks of
+        ``chunk_size``; the hull of each chunk is computed and the final
+        hull is the hull of those partial hulls.
+
+        Args:
+            chunk_size: Number of geometries to hull at once
+
         Returns:
             GeoDataFrame with a single geometry representing the convex hull
 
@@ -196,7 +658,17 @@ class GeometryProcessor:
 
         try:
             logger.info("Computing convex hull")
-            hull_geom = self.gdf.geometry.unary_union.convex_hull
+            if chunk_size < 1:
+                raise GeometryOperationError(
+                    f"Invalid chunk size: {chunk_size}"
+                )
+            geoms = np.asarray(self.gdf.geometry.values)
+            n_chunks = max(1, -(-len(geoms) // chunk_size))
+            partial_hulls = [
+                _coordinate_hull(chunk)
+                for chunk in np.array_split(geoms, n_chunks)
+            ]
+            hull_geom = _coordinate_hull(np.array(partial_hulls, dtype=object))
             self.gdf = gpd.GeoDataFrame(geometry=[hull_geom], crs=self.gdf.crs)
             return self.gdf
         except Exception as e:
@@ -222,15 +694,64 @@ class GeometryProcessor:
 
         try:
             logger.info("Computing centroid")
-            self.gdf["geometry"] = self.gdf.geometry.to_crs(
-                3857
-            ).centroid.to_crs(self.gdf.crs)
+            self._set_geometries(
+                self._map_geometries(
+                    partial(_centroid_geometries, crs=self.gdf.crs)
+                )
+            )
             return self.gdf
         except Exception as e:
             raise GeometryOperationError(
                 f"Centroid operation failed: {str(e)}"
             ) from e
 
+    def _as_other_gdf(
+        self, other: Union[str, gpd.GeoDataFrame]
+    ) -> gpd.GeoDataFrame:
+        """Convert a WKT string or GeoDataFrame to a GeoDataFrame in our CRS.
+
+        Args:
+            other: Either a WKT string, assumed to be in the CRS of the
+                  GeoDataFrame, or a GeoDataFrame with a defined CRS
+
+        Returns:
+            GeoDataFrame in the CRS of the processed GeoDataFrame
+
+        Raises:
+            GeometryOperationError: If the input is invalid
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        # Handle WKT input
+        if isinstance(other, str):
+            try:
+                from shapely import wkt
+
+                geom = wkt.loads(other)
+                other_gdf = gpd.GeoDataFrame(geometry=[geom], crs=self.gdf.crs)
+            except Exception as e:
+                raise GeometryOperationError(
+                    f"Invalid WKT geometry: {str(e)}"
+                ) from e
+        else:
+            other_gdf = other
+
+        # Validate other GeoDataFrame
+        if not isinstance(other_gdf, gpd.GeoDataFrame):
+            raise GeometryOperationError(
+                "Input must be a WKT string or GeoDataFrame"
+            )
+        if not other_gdf.crs:
+            raise GeometryOperationError(
+                "Input GeoDataFrame must have a defined CRS"
+            )
+
+        # Reproject if needed
+        if other_gdf.crs != self.gdf.crs:
+            other_gdf = other_gdf.to_crs(self.gdf.crs)
+        return other_gdf
+
     def intersects(
         self, other: Union[str, gpd.GeoDataFrame]
     ) -> gpd.GeoDataFrame:
@@ -252,35 +773,9 @@ class GeometryProcessor:
             raise GeometryOperationError("No GeoDataFrame set")
 
         try:
-            # Handle WKT input
-            if isinstance(other, str):
-                try:
-                    from shapely import wkt
-
-                    geom = wkt.loads(other)
-                    other_gdf = gpd.GeoDataFrame(
-                        geometry=[geom], crs=self.gdf.crs
-                    )
-                except Exception as e:
-                    raise GeometryOperationError(
-                        f"Invalid WKT geometry: {str(e)}"
-                    ) from e
-            else:
-                other_gdf = other
-
-            # Validate other GeoDataFrame
-            if not isinstance(other_gdf, gpd.GeoDataFrame):
-                raise GeometryOperationError(
-                    "Input must be a WKT string or GeoDataFrame"
-                )
-            if not other_gdf.crs:
-                raise GeometryOperationError(
-                    "Input GeoDataFrame must have a defined CRS"
-                )
+            self._check_validity()
 
-            # Reproject if needed
-            if other_gdf.crs != self.gdf.crs:
-                other_gdf = other_gdf.to_crs(self.gdf.crs)
+            other_gdf = self._as_other_gdf(other)
 
             # Get the unary union of the other geometries
             other_geom = other_gdf.geometry.unary_union
@@ -294,32 +789,1197 @@ class GeometryProcessor:
                 f"Failed to compute intersection: {str(e)}"
             ) from e
 
-    def simplify(self, tolerance: float) -> gpd.GeoDataFrame:
-        """Simplify geometries using Douglas-Peucker algorithm.
+    def within_distance(
+        self, other: Union[str, gpd.GeoDataFrame], distance: float
+    ) -> gpd.GeoDataFrame:
+        """Filter geometries within a distance of the given geometry.
+
+        Distances are tested in meters in ``METRIC_CRS`` with an indexed
+        distance query, without building buffer polygons.
 
         Args:
-            tolerance: Maximum allowed deviation from original geometry.
-                      Should be in the same units as\
-                      the geometry's coordinates.
+            other: Either a WKT string or a GeoDataFrame with a defined CRS
+            distance: Maximum distance in meters
 
         Returns:
-            GeoDataFrame with simplified geometries
+            GeoDataFrame containing only the geometries within ``distance``
+            of the input geometry.
 
         Raises:
-            GeometryOperationError: If simplification fails
+            GeometryOperationError: If operation fails
         """
         if self.gdf is None:
             raise GeometryOperationError("No GeoDataFrame set")
 
         try:
-            logger.info(f"Simplifying geometries with tolerance {tolerance}")
-            self.gdf.geometry = self.gdf.geometry.simplify(tolerance)
-            return self.gdf
+            logger.info(f"Filtering geometries within {distance} meters")
+            if distance < 0:
+                raise GeometryOperationError(f"Invalid distance: {distance}")
+            other_gdf = self._as_other_gdf(other)
+
+            geoms = np.asarray(_to_metric(self.gdf.geometry).values)
+            tree = shapely.STRtree(np.asarray(_to_metric(other_gdf.geometry)))
+            pairs = tree.query(geoms, predicate="dwithin", distance=distance)
+
+            mask = np.zeros(len(geoms), dtype=bool)
+            mask[pairs[0]] = True
+            return self.gdf[mask].copy()
+
         except Exception as e:
             raise GeometryOperationError(
-                f"Failed to simplify geometries: {str(e)}"
+                f"Failed to filter by distance: {str(e)}"
             ) from e
 
+    def sjoin(
+        self,
+        other: gpd.GeoDataFrame,
+        predicate: str = "intersects",
+        how: str = "inner",
+    ) -> gpd.GeoDataFrame:
+        """Join attributes of another layer by a spatial predicate.
+
+        Candidate pairs are found with a bulk STRtree query. With several
+        workers the geometries are partitioned into spatially sorted tiles
+        that are queried in parallel against the same index.
+
+        Args:
+            other: GeoDataFrame whose attributes are joined. It must have a
+                  defined CRS.
+            predicate: Spatial predicate ('intersects', 'within' or
+                      'contains'), tested as ``geometry.predicate(other)``
+            how: 'inner' keeps matched geometries only, 'left' keeps all
+
+        Returns:
+            GeoDataFrame with one row per matching pair and the attributes
+            of both layers. Clashing column names of ``other`` are suffixed
+            with '_right'.
+
+        Raises:
+            GeometryOperationError: If spatial join fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Applying spatial join ({predicate})")
+            if predicate not in SJOIN_PREDICATES:
+                raise GeometryOperationError(
+                    f"Unsupported predicate: {predicate}"
+                )
+            if how not in ["inner", "left"]:
+                raise GeometryOperationError(f"Unsupported join type: {how}")
+            if not other.crs:
+                raise GeometryOperationError(
+                    "Input GeoDataFrame must have a defined CRS"
+                )
+            self._check_validity()
+            if other.crs != self.gdf.crs:
+                other = other.to_crs(self.gdf.crs)
+
+            left_idx, right_idx = self._query_pairs(
+                np.asarray(other.geometry.values), predicate
+            )
+            if how == "left":
+                unmatched = np.setdiff1d(np.arange(len(self.gdf)), left_idx)
+                left_idx = np.concatenate([left_idx, unmatched])
+                right_idx = np.concatenate(
+                    [right_idx, np.full(len(unmatched), -1)]
+                )
+                order = np.lexsort((right_idx, left_idx))
+                left_idx, right_idx = left_idx[order], right_idx[order]
+
+            self.gdf = _join_attributes(self.gdf, other, left_idx, right_idx)
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Spatial join failed: {str(e)}"
+            ) from e
+
+    def _query_pairs(
+        self, other_geoms: np.ndarray, predicate: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find pairs of geometries matching a predicate through an STRtree.
+
+        Args:
+            other_geoms: Geometries to build the index on
+            predicate: Spatial predicate tested as
+                      ``geometry.predicate(other)``
+
+        Returns:
+            Sorted positions in the GeoDataFrame and in ``other_geoms`` of
+            each matching pair
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+        geoms = np.asarray(self.gdf.geometry.values)
+        tiles = []
+        if self.workers > 1 and len(geoms) > self.workers:
+            order = np.argsort(self.gdf.geometry.hilbert_distance().to_numpy())
+            n_chunks = self.workers * CHUNKS_PER_WORKER
+            tiles = [
+                (shapely.to_wkb(geoms[positions]), positions, predicate)
+                for positions in split_chunks(order, n_chunks)
+            ]
+        if len(tiles) <= 1:
+            # The pool initializer would otherwise run in this process
+            pairs = [shapely.STRtree(other_geoms).query(geoms, predicate)]
+        else:
+            pairs = run_chunked(
+                _query_tile,
+                tiles,
+                self.workers,
+                initializer=_init_sjoin_tree,
+                initargs=(shapely.to_wkb(other_geoms),),
+            )
+        left_idx = np.concatenate([p[0] for p in pairs])
+        right_idx = np.concatenate([p[1] for p in pairs])
+        order = np.lexsort((right_idx, left_idx))
+        return left_idx[order], right_idx[order]
+
+    def overlay(
+        self, other: gpd.GeoDataFrame, how: str = "intersection"
+    ) -> gpd.GeoDataFrame:
+        """Overlay the geometries with another layer.
+
+        Only pairs of intersecting geometries, found with a bulk STRtree
+        query, are combined. The pairwise intersections and differences
+        are computed in chunks across the workers.
+
+        Args:
+            other: GeoDataFrame to overlay. It must have a defined CRS.
+            how: 'intersection', 'difference', 'symmetric_difference' or
+                'union'
+
+        Returns:
+            GeoDataFrame of the resulting pieces with the attributes of
+            both layers (only the attributes of this layer for
+            'difference'). Clashing column names of ``other`` are suffixed
+            with '_right'.
+
+        Raises:
+            GeometryOperationError: If overlay fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Applying overlay ({how})")
+            if how not in OVERLAY_HOWS:
+                raise GeometryOperationError(
+                    f"Unsupported overlay operation: {how}"
+                )
+            if not other.crs:
+                raise GeometryOperationError(
+                    "Input GeoDataFrame must have a defined CRS"
+                )
+            self._check_validity()
+            if other.crs != self.gdf.crs:
+                other = other.to_crs(self.gdf.crs)
+
+            left = np.asarray(self.gdf.geometry.values)
+            right = np.asarray(other.geometry.values)
+            left_idx, right_idx = self._query_pairs(right, "intersects")
+
+            parts = []
+            if how in ["intersection", "union"]:
+                pieces = self._run_pairwise(
+                    _intersect_pairs,
+                    [left[left_idx], right[right_idx]],
+                    split_chunks(np.arange(len(left_idx)), self._n_chunks),
+                )
+                keep = ~shapely.is_empty(pieces)
+                joined = _join_attributes(
+                    self.gdf, other, left_idx[keep], right_idx[keep]
+                )
+                parts.append(joined.set_geometry(pieces[keep]))
+            if how != "intersection":
+                rest = self._subtract(left, right, left_idx, right_idx)
+                keep = ~shapely.is_empty(rest)
+                parts.append(self.gdf[keep].set_geometry(rest[keep]))
+            if how in ["symmetric_difference", "union"]:
+                order = np.lexsort((left_idx, right_idx))
+                rest = self._subtract(
+                    right, left, right_idx[order], left_idx[order]
+                )
+                keep = ~shapely.is_empty(rest)
+                attrs = _right_attributes(self.gdf, other)[keep]
+                attrs[self.gdf.geometry.name] = rest[keep]
+                parts.append(attrs)
+
+            columns = list(self.gdf.columns)
+            if how != "difference":
+                columns += list(_right_attributes(self.gdf, other).columns)
+            result = pd.concat(parts, ignore_index=True)[columns]
+            self.gdf = gpd.GeoDataFrame(
+                result, geometry=self.gdf.geometry.name, crs=self.gdf.crs
+            )
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(f"Overlay failed: {str(e)}") from e
+
+    @property
+    def _n_chunks(self) -> int:
+        """Number of chunks to split parallel work into."""
+        return max(1, self.workers) * CHUNKS_PER_WORKER
+
+    def _subtract(
+        self,
+        geoms: np.ndarray,
+        others: np.ndarray,
+        geom_idx: np.ndarray,
+        other_idx: np.ndarray,
+    ) -> np.ndarray:
+        """Subtract from every geometry the union of its paired geometries.
+
+        Args:
+            geoms: Geometries to subtract from
+            others: Geometries to subtract
+            geom_idx: Sorted positions in ``geoms`` of each pair
+            other_idx: Positions in ``others`` of each pair
+
+        Returns:
+            Difference of every geometry of ``geoms``
+        """
+        matched, starts = np.unique(geom_idx, return_index=True)
+        groups = split_chunks(np.arange(len(matched)), self._n_chunks)
+        result = geoms.copy()
+        if len(matched):
+            result[matched] = self._run_pairwise(
+                _subtract_groups,
+                [geoms[matched], others[other_idx]],
+                groups,
+                np.append(starts, len(geom_idx)),
+            )
+        return result
+
+    def _run_pairwise(
+        self,
+        func: Callable[..., np.ndarray],
+        arrays: List[np.ndarray],
+        chunks: List[np.ndarray],
+        bounds: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Run a pairwise geometry function in chunks over the workers.
+
+        Args:
+            func: Picklable function taking the geometry arrays (and the
+                  group bounds when given) and returning one geometry per
+                  element of the first array
+            arrays: Geometry arrays; the first one is split in ``chunks``
+            chunks: Positions in the first array of each chunk
+            bounds: Optional start of each group of the second array in
+                    the first array order, plus its end
+
+        Returns:
+            Result of ``func`` for every element of the first array
+        """
+        if bounds is None:
+            bounds = np.arange(len(arrays[0]) + 1)
+        if self.workers <= 1 or len(chunks) <= 1:
+            return func(arrays[0], arrays[1], bounds)
+
+        tasks = []
+        for positions in chunks:
+            first, last = positions[0], positions[-1] + 1
+            start, end = bounds[first], bounds[last]
+            tasks.append(
+                (
+                    func,
+                    shapely.to_wkb(arrays[0][first:last]),
+                    shapely.to_wkb(arrays[1][start:end]),
+                    np.append(bounds[first:last], end) - start,
+                )
+            )
+        parts = run_chunked(_apply_pairwise, tasks, self.workers)
+        return shapely.from_wkb(np.concatenate(parts))
+
+    def nearest(
+        self, other: gpd.GeoDataFrame, max_distance: Optional[float] = None
+    ) -> gpd.GeoDataFrame:
+        """Join the attributes of the nearest feature of another layer.
+
+        Distances are measured in meters in ``METRIC_CRS`` using an indexed
+        nearest-neighbour query.
+
+        Args:
+            other: GeoDataFrame to search. It must have a defined CRS.
+            max_distance: Optional maximum search distance in meters.
+                         Features with no neighbour within this distance
+                         are kept with empty attributes.
+
+        Returns:
+            GeoDataFrame with the attributes of the nearest feature and its
+            distance in a 'nearest_distance' column
+
+        Raises:
+            GeometryOperationError: If nearest join fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info("Joining nearest features")
+            if not other.crs or not self.gdf.crs:
+                raise GeometryOperationError(
+                    "Both GeoDataFrames must have a defined CRS"
+                )
+            if max_distance is not None and max_distance <= 0:
+                raise GeometryOperationError(
+                    f"Invalid maximum distance: {max_distance}"
+                )
+
+            geoms = np.asarray(_to_metric(self.gdf.geometry).values)
+            tree = shapely.STRtree(np.asarray(_to_metric(other.geometry)))
+            pairs, distances = tree.query_nearest(
+                geoms, max_distance=max_distance, return_distance=True
+            )
+
+            # Keep one neighbour per feature, and features without any
+            left_idx, first = np.unique(pairs[0], return_index=True)
+            right_idx = np.full(len(geoms), -1)
+            right_idx[left_idx] = pairs[1][first]
+            distance = np.full(len(geoms), np.nan)
+            distance[left_idx] = distances[first]
+
+            self.gdf = _join_attributes(
+                self.gdf, other, np.arange(len(geoms)), right_idx
+            )
+            column = NEAREST_DISTANCE_COLUMN
+            while column in self.gdf.columns:
+                column = f"{column}_right"
+            self.gdf[column] = distance
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Nearest join failed: {str(e)}"
+            ) from e
+
+    def simplify(
+        self, tolerance: float, coverage: bool = False
+    ) -> gpd.GeoDataFrame:
+        """Simplify geometries using Douglas-Peucker algorithm.
+
+        Args:
+            tolerance: Maximum allowed deviation from original geometry.
+                      Should be in the same units as\
+                      the geometry's coordinates.
+            coverage: Whether the geometries form a non-overlapping
+                     coverage whose shared edges must be preserved. Coverages
+                     are simplified with the Visvalingam-Whyatt algorithm.
+
+        Returns:
+            GeoDataFrame with simplified geometries
+
+        Raises:
+            GeometryOperationError: If simplification fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info(f"Simplifying geometries with tolerance {tolerance}")
+            geoms = np.asarray(self.gdf.geometry.values)
+            self._set_geometries(
+                self._simplify_geometries(geoms, tolerance, coverage)
+            )
+            return self.gdf
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Failed to simplify geometries: {str(e)}"
+            ) from e
+
+    def simplify_levels(
+        self, tolerances: List[float], coverage: bool = False
+    ) -> Dict[float, gpd.GeoDataFrame]:
+        """Simplify geometries at several tolerances in one cascaded pass.
+
+        Levels are produced from the finest to the coarsest, each one
+        simplified from the previous level with the difference between
+        their tolerances, so every step works on the fewer vertices already
+        kept. Deviations add up along the cascade: the deviation of a level
+        from the original geometries is bounded by the sum of the steps,
+        which is its own tolerance. A level may keep more vertices than a
+        single ``simplify`` with its tolerance, and never more than the
+        finer levels. Coverages are cascaded the same way, keeping shared
+        edges at every step.
+
+        Args:
+            tolerances: Tolerances of the levels to produce
+            coverage: Whether the geometries form a non-overlapping
+                     coverage whose shared edges must be preserved
+
+        Returns:
+            GeoDataFrame of every level, keyed by tolerance. The processed
+            GeoDataFrame is set to the level with the smallest tolerance.
+
+        Raises:
+            GeometryOperationError: If simplification fails
+        """
+        if self.gdf is None:
+            raise GeometryOperationError("No GeoDataFrame set")
+
+        try:
+            levels: Dict[float, gpd.GeoDataFrame] = {}
+            geoms = np.asarray(self.gdf.geometry.values)
+            previous = 0.0
+            for tolerance in sorted(set(tolerances)):
+                logger.info(
+                    f"Simplifying geometries with tolerance {tolerance}"
+                )
+                geoms = self._simplify_geometries(
+                    geoms, tolerance - previous, coverage
+                )
+                previous = tolerance
+                level = self.gdf.copy()
+                level[level.geometry.name] = geoms
+                levels[tolerance] = level
+
+            self.gdf = levels[min(levels)]
+            return levels
+        except Exception as e:
+            raise GeometryOperationError(
+                f"Failed to simplify geometries: {str(e)}"
+            ) from e
+
+    def _simplify_geometries(
+        self, geoms: np.ndarray, tolerance: float, coverage: bool
+    ) -> np.ndarray:
+        """Simplify an array of geometries with one tolerance.
+
+        Args:
+            geoms: Array of shapely geometries
+            tolerance: Maximum allowed deviation from original geometry
+            coverage: Whether to preserve the edges shared across a coverage
+
+        Returns:
+            Array of simplified geometries
+        """
+        if tolerance < 0:
+            raise GeometryOperationError(f"Invalid tolerance: {tolerance}")
+        if not coverage:
+            return map_geometries(
+                partial(shapely.simplify, tolerance=tolerance),
+                geoms,
+                self.workers,
+            )
+        if not hasattr(shapely, "coverage_simplify"):
+            raise GeometryOperationError(
+                "Coverage simplification requires shapely>=2.1"
+            )
+        # The whole coverage is needed to keep shared edges consistent
+        return shapely.coverage_simplify(geoms, tolerance)
+
+
+def spatial_sort_keys(
+    geoms: np.ndarray,
+    method: str,
+    extent: Tuple[float, float, float, float],
+) -> np.ndarray:
+    """Compute space-filling curve keys of geometries.
+
+    Args:
+        geoms: Array of shapely geometries
+        method: Space-filling curve ('hilbert' or 'morton')
+        extent: Bounds (minx, miny, maxx, maxy) mapped onto the curve grid;
+               centres outside it are clamped to its edges
+
+    Returns:
+        Unsigned 64-bit key of every geometry. Missing and empty
+        geometries get the largest key.
+
+    Raises:
+        GeometryOperationError: If the method is not supported
+    """
+    if method not in SPATIAL_SORT_METHODS:
+        raise GeometryOperationError(f"Unsupported spatial sort: {method}")
+
+    bounds = shapely.bounds(geoms)
+    centres = [
+        (bounds[:, 0] + bounds[:, 2]) / 2,
+        (bounds[:, 1] + bounds[:, 3]) / 2,
+    ]
+    minx, miny, maxx, maxy = extent
+    grid = []
+    for centre, low, high in zip(centres, (minx, miny), (maxx, maxy)):
+        span = high - low if high > low else 1.0
+        scaled = np.clip((centre - low) / span, 0, 1) * ((1 << SFC_BITS) - 1)
+        grid.append(np.nan_to_num(scaled, nan=0).astype(np.uint64))
+
+    if method == "hilbert":
+        keys = _hilbert_keys(grid[0], grid[1])
+    else:
+        keys = _spread_bits(grid[0]) | (_spread_bits(grid[1]) << 1)
+    keys[np.isnan(centres[0])] = np.iinfo(np.uint64).max
+    return keys
+
+
+def _hilbert_keys(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Compute Hilbert curve distances of grid cells.
+
+    Args:
+        x: Column of every cell on a grid of ``2 ** SFC_BITS`` cells
+        y: Row of every cell
+
+    Returns:
+        Distance of every cell along the Hilbert curve
+    """
+    last = np.uint64((1 << SFC_BITS) - 1)
+    keys = np.zeros(len(x), dtype=np.uint64)
+    s = np.uint64(1 << (SFC_BITS - 1))
+    while s > 0:
+        rx = ((x & s) > 0).astype(np.uint64)
+        ry = ((y & s) > 0).astype(np.uint64)
+        keys += s * s * ((np.uint64(3) * rx) ^ ry)
+
+        # Rotate the quadrant so the curve stays continuous
+        flip = (ry == 0) & (rx == 1)
+        x = np.where(flip, last - x, x)
+        y = np.where(flip, last - y, y)
+        swap = ry == 0
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= np.uint64(1)
+    return keys
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """Interleave zeros between the lower 32 bits of each value."""
+    v = v & np.uint64(0x00000000FFFFFFFF)
+    for shift, mask in [
+        (16, 0x0000FFFF0000FFFF),
+        (8, 0x00FF00FF00FF00FF),
+        (4, 0x0F0F0F0F0F0F0F0F),
+        (2, 0x3333333333333333),
+        (1, 0x5555555555555555),
+    ]:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def crs_extent(crs: Any) -> Tuple[float, float, float, float]:
+    """Get the bounds of the area of use of a CRS, in its own units.
+
+    Args:
+        crs: Coordinate reference system
+
+    Returns:
+        Bounds (minx, miny, maxx, maxy)
+
+    Raises:
+        GeometryOperationError: If the CRS has no known area of use
+    """
+    if crs is None:
+        raise GeometryOperationError("A CRS is required to sort in chunks")
+    crs = CRS.from_user_input(crs)
+    if crs.is_geographic:
+        return (-180.0, -90.0, 180.0, 90.0)
+    if crs.area_of_use is None:
+        raise GeometryOperationError(f"Unknown area of use for CRS {crs}")
+    transformer = Transformer.from_crs(4326, crs, always_xy=True)
+    return transformer.transform_bounds(*crs.area_of_use.bounds)
+
+
+def _sort_extent(gdf: gpd.GeoDataFrame) -> Tuple[float, float, float, float]:
+    """Get the curve grid extent of a GeoDataFrame."""
+    try:
+        return crs_extent(gdf.crs)
+    except GeometryOperationError:
+        minx, miny, maxx, maxy = gdf.geometry.total_bounds
+        return (minx, miny, maxx, maxy)
+
+
+def spatial_sort_chunks(
+    chunks: Iterable[gpd.GeoDataFrame],
+    method: str = "hilbert",
+    extent: Optional[Tuple[float, float, float, float]] = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Sort chunked input along a space-filling curve (external sort).
+
+    Every chunk is sorted in memory and spilled as a sorted run to a
+    temporary Arrow file. The runs are then memory-mapped and merged batch
+    by batch, so the whole input never has to be held in memory.
+
+    Args:
+        chunks: GeoDataFrame chunks sharing the same columns and CRS
+        method: Space-filling curve ('hilbert' or 'morton')
+        extent: Bounds mapped onto the curve grid. Defaults to the area of
+               use of the CRS of the first chunk.
+
+    Yields:
+        Sorted GeoDataFrame chunks
+
+    Raises:
+        GeometryOperationError: If sorting fails
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        runs: List[Path] = []
+        crs = None
+        geom_col = "geometry"
+        for chunk in chunks:
+            crs, geom_col = chunk.crs, chunk.geometry.name
+            if extent is None:
+                extent = crs_extent(crs)
+            geoms = np.asarray(chunk.geometry.values)
+            keys = spatial_sort_keys(geoms, method, extent)
+            order = np.argsort(keys, kind="stable")
+
+            df = pd.DataFrame(chunk.iloc[order])
+            df[geom_col] = shapely.to_wkb(geoms[order])
+            df[_SORT_KEY] = keys[order]
+            run = Path(tmp_dir) / f"run_{len(runs)}.arrow"
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.ipc.new_file(str(run), table.schema) as writer:
+                writer.write_table(table, max_chunksize=SORT_RUN_BATCH_SIZE)
+            runs.append(run)
+
+        logger.info(f"Merging {len(runs)} sorted runs")
+        for df in _merge_sorted_runs(runs):
+            df[geom_col] = shapely.from_wkb(df[geom_col].to_numpy())
+            yield gpd.GeoDataFrame(
+                df.drop(columns=_SORT_KEY), geometry=geom_col, crs=crs
+            )
+
+
+def feature_hashes(
+    gdf: gpd.GeoDataFrame, key: str = "geometry"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Hash the normalized geometries (and attributes) of features.
+
+    Normalizing orders the rings, parts and vertices of geometries, so
+    equal geometries written differently get the same hash.
+
+    Args:
+        gdf: Input features
+        key: 'geometry' or 'geometry+cols'
+
+    Returns:
+        Tuple of the 64-bit hash and the normalized WKB of every feature
+    """
+    wkb = shapely.to_wkb(shapely.normalize(np.asarray(gdf.geometry.values)))
+    if key == "geometry":
+        frame = pd.DataFrame({"wkb": wkb})
+    else:
+        frame = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+        frame["__wkb"] = wkb
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return hashes, wkb
+
+
+class _HashSet:
+    """Compact set of 64-bit hashes.
+
+    Hashes are stored in sorted arrays, merged as in a binary counter so
+    that every hash is copied a logarithmic number of times; membership is
+    a binary search per array.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty set."""
+        self.levels: List[np.ndarray] = []
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """Add hashes to the set.
+
+        Args:
+            hashes: Hashes in input order
+
+        Returns:
+            Mask of the hashes not seen before, first occurrences only
+        """
+        unique, first = np.unique(hashes, return_index=True)
+        new = np.ones(len(unique), dtype=bool)
+        for level in self.levels:
+            positions = np.searchsorted(level, unique)
+            found = positions < len(level)
+            found[found] = level[positions[found]] == unique[found]
+            new &= ~found
+
+        keep = np.zeros(len(hashes), dtype=bool)
+        keep[first[new]] = True
+        level = unique[new]
+        while self.levels and len(self.levels[-1]) <= 2 * len(level):
+            level = np.union1d(self.levels.pop(), level)
+        self.levels.append(level)
+        return keep
+
+
+def dedupe_chunks(
+    chunks: Iterable[gpd.GeoDataFrame], key: str = "geometry"
+) -> Iterator[gpd.GeoDataFrame]:
+    """Drop duplicate features from a stream of chunks.
+
+    Only the 64-bit hash of every distinct feature is kept across chunks
+    (8 bytes per feature), so the input is never held in memory; unlike
+    ``GeometryProcessor.dedupe``, a hash collision between two different
+    features drops the later one.
+
+    Args:
+        chunks: GeoDataFrame chunks sharing the same columns
+        key: 'geometry' or 'geometry+cols'
+
+    Yields:
+        Chunks without the features seen before, skipping chunks left
+        empty
+
+    Raises:
+        GeometryOperationError: If the key is invalid
+    """
+    if key not in DEDUPE_KEYS:
+        raise GeometryOperationError(
+            f"Invalid dedupe key '{key}', expected one of {DEDUPE_KEYS}"
+        )
+    seen = _HashSet()
+    for chunk in chunks:
+        hashes, _ = feature_hashes(chunk, key)
+        chunk = chunk[seen.add(hashes)]
+        if not chunk.empty:
+            yield chunk
+
+
+def _merge_sorted_runs(runs: List[Path]) -> Iterator[pd.DataFrame]:
+    """Merge sorted Arrow runs by their key column, batch by batch.
+
+    At each step, every loaded row whose key is at most the smallest last
+    key of the runs with unread batches is emitted: no unread row can sort
+    before it.
+
+    Args:
+        runs: Paths of the sorted runs
+
+    Yields:
+        Sorted DataFrame chunks
+    """
+    readers = [pa.ipc.open_file(pa.memory_map(str(run))) for run in runs]
+    next_batch = [0] * len(readers)
+    buffers: List[Optional[pd.DataFrame]] = [None] * len(readers)
+
+    while True:
+        # Load the next batch of every run whose buffer is exhausted
+        for i, reader in enumerate(readers):
+            buffer = buffers[i]
+            if (buffer is None or buffer.empty) and (
+                next_batch[i] < reader.num_record_batches
+            ):
+                batch = reader.get_batch(next_batch[i])
+                buffers[i] = batch.to_pandas()
+                next_batch[i] += 1
+
+        loaded = [b for b in buffers if b is not None and not b.empty]
+        if not loaded:
+            return
+
+        bound = min(
+            (
+                b[_SORT_KEY].iloc[-1]
+                for i, b in enumerate(buffers)
+                if b is not None
+                and not b.empty
+                and next_batch[i] < readers[i].num_record_batches
+            ),
+            default=None,
+        )
+        parts = []
+        for i, buffer in enumerate(buffers):
+            if buffer is None or buffer.empty:
+                continue
+            if bound is None:
+                cut = len(buffer)
+            else:
+                cut = int(
+                    np.searchsorted(
+                        buffer[_SORT_KEY].to_numpy(), bound, side="right"
+                    )
+                )
+            parts.append(buffer.iloc[:cut])
+            buffers[i] = buffer.iloc[cut:]
+
+        merged = pd.concat(parts, ignore_index=True)
+        yield merged.sort_values(_SORT_KEY, kind="stable", ignore_index=True)
+
+
+def _to_metric(series: gpd.GeoSeries) -> gpd.GeoSeries:
+    """Reproject a GeoSeries to the metric CRS unless it is already in it.
+
+    Args:
+        series: GeoSeries with a defined CRS
+
+    Returns:
+        GeoSeries in ``METRIC_CRS``
+    """
+    if series.crs is not None and series.crs.equals(METRIC_CRS):
+        return series
+    return series.to_crs(epsg=METRIC_CRS)
+
+
+def _buffer_geometries(
+    geoms: np.ndarray, distance: float, crs: Any
+) -> np.ndarray:
+    """Buffer geometries by a distance in meters (Web Mercator).
+
+    Args:
+        geoms: Array of shapely geometries in ``crs``
+        distance: Buffer distance in meters
+        crs: CRS of the geometries
+
+    Returns:
+        Array of buffered geometries in ``crs``
+    """
+    series = _to_metric(gpd.GeoSeries(geoms, crs=crs))
+    return series.buffer(distance).to_crs(crs).values
+
+
+def _centroid_geometries(geoms: np.ndarray, crs: Any) -> np.ndarray:
+    """Compute the centroid of geometries in Web Mercator.
+
+    Args:
+        geoms: Array of shapely geometries in ``crs``
+        crs: CRS of the geometries
+
+    Returns:
+        Array of centroid points in ``crs``
+    """
+    series = _to_metric(gpd.GeoSeries(geoms, crs=crs))
+    return series.centroid.to_crs(crs).values
+
+
+def _reproject_geometries(geoms: np.ndarray, src: Any, dst: Any) -> np.ndarray:
+    """Reproject geometries between two coordinate reference systems.
+
+    Args:
+        geoms: Array of shapely geometries in ``src``
+        src: Source CRS
+        dst: Target CRS
+
+    Returns:
+        Array of geometries in ``dst``
+    """
+    return gpd.GeoSeries(geoms, crs=src).to_crs(dst).values
+
+
+def _init_sjoin_tree(wkb: np.ndarray) -> None:
+    """Build the STRtree of the right-hand layer in a sjoin pool worker."""
+    _worker_state["sjoin_tree"] = shapely.STRtree(shapely.from_wkb(wkb))
+
+
+def _query_tile(tile: Tuple[np.ndarray, np.ndarray, str]) -> np.ndarray:
+    """Query one tile of geometries against the spatial join index.
+
+    Args:
+        tile: WKB geometries, their positions and the predicate
+
+    Returns:
+        Positions of the matching geometries and of the index geometries
+    """
+    wkb, positions, predicate = tile
+    tree = _worker_state.get("sjoin_tree")
+    if tree is None:
+        raise GeometryOperationError("Spatial join index not initialized")
+    pairs = tree.query(shapely.from_wkb(wkb), predicate=predicate)
+    return np.vstack([positions[pairs[0]], pairs[1]])
+
+
+def _apply_pairwise(
+    task: Tuple[Callable[..., np.ndarray], np.ndarray, np.ndarray, np.ndarray]
+) -> np.ndarray:
+    """Apply a pairwise geometry function to one chunk of WKB geometries.
+
+    Args:
+        task: Function, WKB of both geometry arrays and group bounds
+
+    Returns:
+        WKB of the function result
+    """
+    func, first, second, bounds = task
+    return shapely.to_wkb(
+        func(shapely.from_wkb(first), shapely.from_wkb(second), bounds)
+    )
+
+
+def _intersect_pairs(
+    left: np.ndarray, right: np.ndarray, bounds: np.ndarray
+) -> np.ndarray:
+    """Intersect pairs of geometries, keeping the dimension of the left one.
+
+    Lower-dimensional pieces, such as the shared edge of two touching
+    polygons, are dropped.
+
+    Args:
+        left: Left geometry of each pair
+        right: Right geometry of each pair
+        bounds: Unused; pairs are aligned one to one
+
+    Returns:
+        Intersection of every pair (empty when nothing of the left
+        dimension remains)
+    """
+    pieces = shapely.intersection(left, right)
+    dims = shapely.get_dimensions(left)
+
+    # Keep the parts of mixed results that have the left dimension
+    mixed = np.flatnonzero(
+        shapely.get_type_id(pieces) == shapely.GeometryType.GEOMETRYCOLLECTION
+    )
+    if len(mixed):
+        parts, index = shapely.get_parts(pieces[mixed], return_index=True)
+        parts, nested = shapely.get_parts(parts, return_index=True)
+        index = index[nested]
+        part_dims = shapely.get_dimensions(parts)
+        pieces[mixed] = shapely.Polygon()
+        for dim, collect in enumerate(
+            [
+                shapely.multipoints,
+                shapely.multilinestrings,
+                shapely.multipolygons,
+            ]
+        ):
+            selected = (part_dims == dim) & (part_dims == dims[mixed][index])
+            if selected.any():
+                rows = np.unique(index[selected])
+                collected = collect(parts[selected], indices=index[selected])
+                pieces[mixed[rows]] = collected[rows]
+
+    pieces[shapely.get_dimensions(pieces) != dims] = shapely.Polygon()
+    return pieces
+
+
+def _subtract_groups(
+    geoms: np.ndarray, others: np.ndarray, bounds: np.ndarray
+) -> np.ndarray:
+    """Subtract from every geometry the union of its group of geometries.
+
+    Args:
+        geoms: Geometries to subtract from
+        others: Geometries to subtract, grouped by geometry
+        bounds: Start of the group of every geometry in ``others``, plus
+               the end of the last group
+
+    Returns:
+        Difference of every geometry
+    """
+    unions = [
+        shapely.union_all(group)
+        for group in np.split(others, bounds[1:-1] - bounds[0])
+    ]
+    return shapely.difference(geoms, np.array(unions, dtype=object))
+
+
+def _right_attributes(
+    left: gpd.GeoDataFrame, right: gpd.GeoDataFrame
+) -> pd.DataFrame:
+    """Get the attributes of a joined layer, renaming clashing columns.
+
+    Args:
+        left: GeoDataFrame whose columns are kept as is
+        right: GeoDataFrame whose attributes are joined
+
+    Returns:
+        Attributes of ``right``, clashing names suffixed with '_right'
+    """
+    attrs = right.drop(columns=right.geometry.name)
+    return attrs.rename(
+        columns={c: f"{c}_right" for c in attrs.columns if c in left.columns}
+    )
+
+
+def _join_attributes(
+    left: gpd.GeoDataFrame,
+    right: gpd.GeoDataFrame,
+    left_idx: np.ndarray,
+    right_idx: np.ndarray,
+) -> gpd.GeoDataFrame:
+    """Combine rows of two layers given the positions of matching pairs.
+
+    Args:
+        left: GeoDataFrame whose geometries are kept
+        right: GeoDataFrame whose attributes are joined
+        left_idx: Positions in ``left`` of each pair
+        right_idx: Positions in ``right`` of each pair (-1 for no match)
+
+    Returns:
+        GeoDataFrame with the attributes of both layers
+    """
+    attrs = _right_attributes(left, right)
+    matched = right_idx >= 0
+    joined = pd.DataFrame(index=np.arange(len(right_idx)))
+    for column in attrs.columns:
+        values = attrs[column].to_numpy()[right_idx[matched]]
+        joined[column] = pd.Series(values, index=np.flatnonzero(matched))
+
+    result = left.iloc[left_idx].reset_index(drop=True)
+    return gpd.GeoDataFrame(
+        pd.concat([result, joined], axis=1),
+        geometry=left.geometry.name,
+        crs=left.crs,
+    )
+
+
+def _is_h3_coverage(gdf: gpd.GeoDataFrame) -> bool:
+    """Check whether a GeoDataFrame holds distinct H3 cells of one resolution.
+
+    Args:
+        gdf: GeoDataFrame to check
+
+    Returns:
+        True if the geometries form an H3 coverage
+    """
+    if "hex" not in gdf.columns or gdf.empty or not gdf["hex"].is_unique:
+        return False
+    # The resolution is the third hexadecimal digit of the 64-bit cell
+    # index, whose leading zero digit is dropped from the string
+    return bool(gdf["hex"].astype(str).str[-14].nunique() == 1)
+
+
+def _union_wkb(wkb: np.ndarray) -> bytes:
+    """Union an array of WKB geometries into a single WKB geometry."""
+    return shapely.to_wkb(shapely.union_all(shapely.from_wkb(wkb)))
+
+
+def _tree_union(geoms: np.ndarray, workers: int) -> shapely.Geometry:
+    """Union geometries by a parallel tree reduction.
+
+    Args:
+        geoms: Array of shapely geometries, ideally spatially sorted
+        workers: Number of worker processes
+
+    Returns:
+        Union of all geometries
+    """
+    if workers <= 1 or len(geoms) <= workers:
+        return shapely.union_all(geoms)
+
+    parts = run_chunked(
+        _union_wkb, split_chunks(shapely.to_wkb(geoms), workers), workers
+    )
+    while len(parts) > 1:
+        pairs = split_chunks(
+            np.array(parts, dtype=object), (len(parts) + 1) // 2
+        )
+        parts = run_chunked(_union_wkb, pairs, workers)
+    return shapely.from_wkb(parts[0])
+
+
+def _dissolve_groups(groups: List[np.ndarray], workers: int) -> List[bytes]:
+    """Union each group of WKB geometries into a single WKB geometry.
+
+    Every round splits the pending groups into chunks of at most
+    ``DISSOLVE_CHUNK_SIZE`` geometries and unions all chunks in parallel,
+    until each group has been reduced to a single geometry.
+
+    Args:
+        groups: WKB geometries of each group
+        workers: Number of worker processes
+
+    Returns:
+        Unioned WKB geometry of each group, in order
+    """
+    pending: Dict[int, np.ndarray] = dict(enumerate(groups))
+    result: Dict[int, bytes] = {}
+    while pending:
+        keys: List[int] = []
+        chunks: List[np.ndarray] = []
+        for key, wkb in pending.items():
+            n_chunks = -(-len(wkb) // DISSOLVE_CHUNK_SIZE)
+            for chunk in split_chunks(wkb, n_chunks):
+                keys.append(key)
+                chunks.append(chunk)
+
+        chunksize = max(1, len(chunks) // (workers * 4))
+        parts = run_chunked(_union_wkb, chunks, workers, chunksize)
+
+        partials: Dict[int, List[bytes]] = {}
+        for key, part in zip(keys, parts):
+            partials.setdefault(key, []).append(part)
+        pending = {}
+        for key, items in partials.items():
+            if len(items) == 1:
+                result[key] = items[0]
+            else:
+                pending[key] = np.array(items, dtype=object)
+
+    return [result[key] for key in range(len(groups))]
+
+
+def _subdivide(
+    geom: shapely.Geometry, max_vertices: int, depth: int = 0
+) -> List[shapely.Geometry]:
+    """Recursively split a geometry into pieces under a vertex budget.
+
+    Args:
+        geom: Geometry to split
+        max_vertices: Maximum number of vertices per piece
+        depth: Current recursion depth
+
+    Returns:
+        Pieces of the geometry
+    """
+    if (
+        geom is None
+        or shapely.get_num_coordinates(geom) <= max_vertices
+        or depth >= MAX_SUBDIVIDE_DEPTH
+    ):
+        return [geom]
+
+    minx, miny, maxx, maxy = shapely.bounds(geom)
+    if maxx - minx >= maxy - miny:
+        first = shapely.box(minx, miny, (minx + maxx) / 2, maxy)
+    else:
+        first = shapely.box(minx, miny, maxx, (miny + maxy) / 2)
+
+    # The second half is the rest of the geometry, so parts lying on the
+    # cut are kept once
+    pieces = []
+    for source in shapely.get_parts(geom):
+        # The cut leaves slivers of a lower dimension than the part it
+        # splits; lower-dimension parts of a collection are kept
+        dimension = shapely.get_dimensions(source)
+        for half in [
+            shapely.intersection(source, first),
+            shapely.difference(source, first),
+        ]:
+            parts = shapely.get_parts(half)
+            for part in parts[shapely.get_dimensions(parts) == dimension]:
+                pieces.extend(_subdivide(part, max_vertices, depth + 1))
+    return pieces
+
+
+def _subdivide_geometries(
+    geoms: np.ndarray, max_vertices: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Subdivide an array of geometries.
+
+    Args:
+        geoms: Array of shapely geometries
+        max_vertices: Maximum number of vertices per piece
+
+    Returns:
+        Array of all pieces and the number of pieces of each geometry
+    """
+    pieces = [_subdivide(geom, max_vertices) for geom in geoms]
+    counts = np.array([len(p) for p in pieces], dtype=int)
+    flat = np.empty(counts.sum(), dtype=object)
+    flat[:] = [piece for parts in pieces for piece in parts]
+    return flat, counts
+
+
+def _subdivide_wkb(
+    wkb: np.ndarray, max_vertices: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Subdivide an array of WKB geometries, returning WKB pieces."""
+    pieces, counts = _subdivide_geometries(shapely.from_wkb(wkb), max_vertices)
+    return shapely.to_wkb(pieces), counts
+
+
+def _coordinate_hull(geoms: np.ndarray) -> shapely.Geometry:
+    """Compute the convex hull of the coordinates of an array of geometries.
+
+    Args:
+        geoms: Array of shapely geometries
+
+    Returns:
+        Convex hull of all vertices in ``geoms``
+    """
+    coords = shapely.get_coordinates(geoms)
+    return shapely.convex_hull(shapely.multipoints(coords))
+
 
 # For backward compatibility
 def apply_buffer(
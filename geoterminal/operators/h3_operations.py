@@ -37,10 +37,6 @@ class H3Processor:
         if self.gdf is not None:
             if not isinstance(self.gdf, gpd.GeoDataFrame):
                 raise H3OperationError("Input must be a GeoDataFrame")
-            if not self.gdf.geometry.is_valid.all():
-                logger.warning(
-                    "Some geometries in the GeoDataFrame are invalid"
-                )
 
     def set_data(self, gdf: gpd.GeoDataFrame) -> None:
         """Set the GeoDataFrame to process.
@@ -110,8 +106,11 @@ class H3Processor:
             # Create a list to store hex IDs and their corresponding row data
             hex_data = []
 
-            for idx, row in exploded_gdf.iterrows():
-                if row.geometry.is_valid:
+            # Check validity once for all parts instead of per row
+            is_valid = exploded_gdf.geometry.is_valid.to_numpy()
+
+            for (idx, row), valid in zip(exploded_gdf.iterrows(), is_valid):
+                if valid:
                     hex_set: Set[str] = h3.geo_to_cells(
                         row.geometry, res=resolution
                     )
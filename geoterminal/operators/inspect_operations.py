@@ -4,15 +4,48 @@ This module provides classes and functions for inspecting GeoDataFrames,
 including viewing data samples, structure information, and metadata.
 """
 
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import geopandas as gpd
+import h3
+import numpy as np
 import pandas as pd
+import shapely
 from loguru import logger
 from shapely import wkt
 
 pd.set_option("display.max_columns", 100)
 
+# Number of index bits of the HyperLogLog sketches (2^12 registers, about
+# 1.6% standard error)
+HLL_PRECISION = 12
+
+# Vertex counts are histogrammed exactly below this count and in buckets
+# of 1/16 of a power of two above it
+VERTEX_EXACT_LIMIT = 64
+VERTEX_SUB_BUCKETS = 16
+
+# Percentiles of the vertex counts reported by describe
+VERTEX_PERCENTILES = [50, 90, 99]
+
+# Equal-area CRS used to estimate H3 cell counts from polygon areas
+EQUAL_AREA_CRS = 6933
+
+# Measures by which geometries can be ranked by profile_geometries
+PROFILE_MEASURES = ["vertices", "parts", "rings", "h3_cells"]
+
+# Names of the shapely geometry type ids
+GEOMETRY_TYPES = [
+    "Point",
+    "LineString",
+    "LinearRing",
+    "Polygon",
+    "MultiPoint",
+    "MultiLineString",
+    "MultiPolygon",
+    "GeometryCollection",
+]
+
 
 def simplify_geom_repr(geom_wkt: str) -> str:
     """Convert WKT geometry to a simplified string representation.
@@ -28,6 +61,388 @@ def simplify_geom_repr(geom_wkt: str) -> str:
     return f"{wkt.loads(geom_wkt).geom_type.upper()}(...)"
 
 
+def summarize_geometries(geoms: np.ndarray) -> List[str]:
+    """Summarize geometries by type and size without serializing them.
+
+    Types, part, ring and vertex counts are read from the geometry array
+    at once, e.g. 'MULTIPOLYGON(3 parts, 12k pts)', 'POLYGON(2 rings,
+    40 pts)' or 'POINT(1 2)'.
+
+    Args:
+        geoms: Array of shapely geometries
+
+    Returns:
+        Summary of every geometry ('None' for missing geometries)
+    """
+    type_ids = shapely.get_type_id(geoms)
+    vertices = shapely.get_num_coordinates(geoms)
+    parts = shapely.get_num_geometries(geoms)
+    rings = _ring_counts(geoms)
+    empty = shapely.is_empty(geoms)
+    points = np.flatnonzero((type_ids == 0) & ~empty)
+    xy = dict(zip(points, shapely.get_coordinates(geoms[points])))
+
+    summaries = []
+    for i, type_id in enumerate(type_ids):
+        if type_id < 0:
+            summaries.append("None")
+            continue
+        name = GEOMETRY_TYPES[type_id].upper()
+        if empty[i]:
+            summaries.append(f"{name} EMPTY")
+        elif i in xy:
+            x, y = xy[i]
+            summaries.append(f"{name}({x:.6g} {y:.6g})")
+        else:
+            details = [f"{_compact_count(vertices[i])} pts"]
+            if type_id >= 4:
+                details.insert(0, f"{parts[i]} parts")
+            elif rings[i] > 1:
+                details.insert(0, f"{rings[i]} rings")
+            summaries.append(f"{name}({', '.join(details)})")
+    return summaries
+
+
+def _compact_count(n: int) -> str:
+    """Format a count with a k, M or G suffix (e.g. '12.3k')."""
+    if n < 1000:
+        return str(n)
+    value = float(n)
+    for suffix in ["k", "M", "G"]:
+        value /= 1000
+        # Counts rounding up to 1000 move to the next unit ('1M', not
+        # '1e+03k')
+        text = f"{value:.3g}"
+        if float(text) < 1000:
+            return f"{text}{suffix}"
+    return f"{value:.0f}G"
+
+
+class HyperLogLog:
+    """Approximate distinct counter with constant memory.
+
+    Values are hashed to 64 bits; the first bits select a register, which
+    keeps the longest run of leading zeros seen in the remaining bits.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+        """Initialize an empty sketch.
+
+        Args:
+            precision: Number of index bits (2^precision registers)
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series) -> None:
+        """Add values to the sketch, ignoring missing values.
+
+        Args:
+            values: Values to count
+        """
+        values = values.dropna()
+        if values.empty:
+            return
+        if pd.api.types.is_numeric_dtype(values) and not (
+            pd.api.types.is_bool_dtype(values)
+        ):
+            # Chunks of a column may be read as integers or floats
+            values = values.astype(np.float64)
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        ranks = np.minimum(_leading_zeros(rest), 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, ranks.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch of the same precision into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(float))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    """Count the leading zero bits of unsigned 64-bit integers."""
+    values = values.copy()
+    counts = np.zeros(len(values), dtype=np.int64)
+    for shift in [32, 16, 8, 4, 2, 1]:
+        empty = (values >> np.uint64(64 - shift)) == 0
+        counts += empty * shift
+        values[empty] <<= np.uint64(shift)
+    return counts + (values == 0)
+
+
+def _summarize_frame(gdf: gpd.GeoDataFrame) -> pd.DataFrame:
+    """Replace the geometry columns of a frame with their summaries."""
+    result = pd.DataFrame(gdf)
+    for column in result.columns:
+        if isinstance(result[column].dtype, gpd.array.GeometryDtype):
+            result[column] = summarize_geometries(
+                np.asarray(result[column].values)
+            )
+    return result
+
+
+def _ring_counts(geoms: np.ndarray) -> np.ndarray:
+    """Count the rings of the polygons of every geometry."""
+    parts, index = shapely.get_parts(geoms, return_index=True)
+    polygons = (shapely.get_type_id(parts) == 3) & ~shapely.is_empty(parts)
+    rings = np.where(polygons, shapely.get_num_interior_rings(parts) + 1, 0)
+    return np.bincount(index, weights=rings, minlength=len(geoms)).astype(
+        np.int64
+    )
+
+
+def _h3_cell_estimates(geometry: gpd.GeoSeries, resolution: int) -> np.ndarray:
+    """Estimate the number of H3 cells a polyfill gives every geometry.
+
+    Args:
+        geometry: Geometries, in longitude/latitude without a CRS
+        resolution: H3 resolution
+
+    Returns:
+        Polygon area divided by the average cell area, 0 for geometries
+        without area
+    """
+    if not 0 <= resolution <= 15:
+        raise InspectOperationError(
+            f"Invalid H3 resolution: {resolution}. Must be between 0 and 15"
+        )
+    if geometry.crs is None:
+        geometry = geometry.set_crs(4326)
+    areas = geometry.to_crs(EQUAL_AREA_CRS).area.to_numpy()
+    cell_area = h3.average_hexagon_area(resolution, unit="m^2")
+    return np.round(np.nan_to_num(areas) / cell_area).astype(np.int64)
+
+
+def _vertex_buckets(counts: np.ndarray) -> np.ndarray:
+    """Map vertex counts to histogram buckets."""
+    buckets = counts.astype(np.int64)
+    large = counts >= VERTEX_EXACT_LIMIT
+    log = np.log2(counts[large] / VERTEX_EXACT_LIMIT)
+    buckets[large] = VERTEX_EXACT_LIMIT + (log * VERTEX_SUB_BUCKETS).astype(
+        np.int64
+    )
+    return buckets
+
+
+def _bucket_value(bucket: int) -> int:
+    """Get the smallest vertex count of a histogram bucket."""
+    if bucket < VERTEX_EXACT_LIMIT:
+        return bucket
+    exponent = (bucket - VERTEX_EXACT_LIMIT) / VERTEX_SUB_BUCKETS
+    return int(np.ceil(VERTEX_EXACT_LIMIT * 2**exponent))
+
+
+class GeometryStats:
+    """Summary statistics of features accumulated chunk by chunk.
+
+    Statistics are kept in constant memory: counters, bounds, a vertex
+    count histogram with logarithmic buckets, running min/max/sum of the
+    numeric columns and a HyperLogLog sketch per column.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.rows = 0
+        self.bounds = np.array([np.inf, np.inf, -np.inf, -np.inf])
+        self.types = np.zeros(len(GEOMETRY_TYPES), dtype=np.int64)
+        self.nulls = 0
+        self.empty = 0
+        self.invalid = 0
+        self.vertices = np.zeros(0, dtype=np.int64)
+        self.vertex_min: Optional[int] = None
+        self.vertex_max = 0
+        self.vertex_sum = 0
+        self.dtypes: Dict[str, str] = {}
+        self.numeric: Dict[str, List[float]] = {}
+        self.sketches: Dict[str, HyperLogLog] = {}
+
+    def update(self, gdf: gpd.GeoDataFrame) -> None:
+        """Add a chunk of features to the statistics.
+
+        Args:
+            gdf: Chunk of features
+        """
+        geoms = np.asarray(gdf.geometry.values)
+        self.rows += len(geoms)
+
+        present = ~shapely.is_missing(geoms)
+        empty = np.zeros(len(geoms), dtype=bool)
+        empty[present] = shapely.is_empty(geoms[present])
+        self.nulls += int(np.count_nonzero(~present))
+        self.empty += int(np.count_nonzero(empty))
+        solid = geoms[present & ~empty]
+        self.invalid += int(np.count_nonzero(~shapely.is_valid(solid)))
+
+        if len(solid):
+            bounds = shapely.bounds(solid)
+            self.bounds[:2] = np.minimum(
+                self.bounds[:2], np.nanmin(bounds[:, :2], axis=0)
+            )
+            self.bounds[2:] = np.maximum(
+                self.bounds[2:], np.nanmax(bounds[:, 2:], axis=0)
+            )
+
+        type_ids = shapely.get_type_id(geoms[present])
+        self.types += np.bincount(type_ids, minlength=len(GEOMETRY_TYPES))
+
+        counts = shapely.get_num_coordinates(geoms[present])
+        if len(counts):
+            histogram = np.bincount(_vertex_buckets(counts))
+            if len(histogram) > len(self.vertices):
+                histogram[: len(self.vertices)] += self.vertices
+                self.vertices = histogram
+            else:
+                self.vertices[: len(histogram)] += histogram
+            low = int(counts.min())
+            if self.vertex_min is None or low < self.vertex_min:
+                self.vertex_min = low
+            self.vertex_max = max(self.vertex_max, int(counts.max()))
+            self.vertex_sum += int(counts.sum())
+
+        for column in gdf.columns:
+            if column == gdf.geometry.name:
+                continue
+            values = gdf[column]
+            self.dtypes.setdefault(column, str(values.dtype))
+            self.sketches.setdefault(column, HyperLogLog()).update(values)
+            if not pd.api.types.is_numeric_dtype(
+                values
+            ) or pd.api.types.is_bool_dtype(values):
+                continue
+            valid = values.dropna()
+            if valid.empty:
+                continue
+            stats = self.numeric.setdefault(column, [np.inf, -np.inf, 0, 0])
+            stats[0] = min(stats[0], float(valid.min()))
+            stats[1] = max(stats[1], float(valid.max()))
+            stats[2] += float(valid.sum())
+            stats[3] += len(valid)
+
+    def percentile(self, q: float) -> Optional[int]:
+        """Estimate a percentile of the vertex counts.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Smallest vertex count of the bucket holding the percentile
+            (exact below VERTEX_EXACT_LIMIT), or None without geometries
+        """
+        total = int(self.vertices.sum())
+        if not total:
+            return None
+        cumulative = np.cumsum(self.vertices)
+        bucket = int(np.searchsorted(cumulative, q / 100 * total))
+        return _bucket_value(bucket)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the statistics as a dictionary.
+
+        Returns:
+            Row count, total bounds, geometry type histogram, null, empty
+            and invalid geometry counts, vertex count statistics and
+            per-column statistics
+        """
+        solid = self.rows - self.nulls - self.empty
+        vertices: Dict[str, Any] = {}
+        if self.vertex_min is not None:
+            vertices["min"] = self.vertex_min
+            for q in VERTEX_PERCENTILES:
+                vertices[f"p{q}"] = self.percentile(q)
+            vertices["max"] = self.vertex_max
+            vertices["mean"] = self.vertex_sum / (self.rows - self.nulls)
+
+        columns: Dict[str, Dict[str, Any]] = {}
+        for column, dtype in self.dtypes.items():
+            stats: Dict[str, Any] = {"dtype": dtype}
+            if column in self.numeric:
+                low, high, total, count = self.numeric[column]
+                stats.update(min=low, max=high, mean=total / count)
+            stats["distinct"] = self.sketches[column].count()
+            columns[column] = stats
+
+        return {
+            "rows": self.rows,
+            "bounds": self.bounds.tolist() if solid > 0 else None,
+            "geometry_types": {
+                name: int(count)
+                for name, count in zip(GEOMETRY_TYPES, self.types)
+                if count
+            },
+            "null": self.nulls,
+            "empty": self.empty,
+            "invalid": self.invalid,
+            "vertices": vertices,
+            "columns": columns,
+        }
+
+
+def describe_chunks(chunks: Iterable[gpd.GeoDataFrame]) -> Dict[str, Any]:
+    """Describe a stream of chunks in a single pass.
+
+    Args:
+        chunks: GeoDataFrame chunks
+
+    Returns:
+        Statistics as returned by ``GeometryStats.summary``
+    """
+    stats = GeometryStats()
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats.summary()
+
+
+def format_description(description: Dict[str, Any]) -> str:
+    """Format the statistics of ``describe_chunks`` for display.
+
+    Args:
+        description: Statistics to format
+
+    Returns:
+        Multi-line text
+    """
+    lines = [f"Rows: {description['rows']}"]
+    bounds = description["bounds"]
+    if bounds is not None:
+        lines.append("Bounds: " + ", ".join(f"{b:.6g}" for b in bounds))
+    types = description["geometry_types"]
+    lines.append(
+        "Geometry types: "
+        + (", ".join(f"{k}: {v}" for k, v in types.items()) or "none")
+    )
+    lines.append(
+        f"Null geometries: {description['null']}, "
+        f"empty: {description['empty']}, "
+        f"invalid: {description['invalid']}"
+    )
+    vertices = description["vertices"]
+    if vertices:
+        lines.append(
+            "Vertices per geometry: "
+            + ", ".join(f"{k} {v:.6g}" for k, v in vertices.items())
+        )
+    if description["columns"]:
+        lines.append("Columns:")
+    for column, stats in description["columns"].items():
+        details = [
+            f"{k} {stats[k]:.6g}" for k in ["min", "max", "mean"] if k in stats
+        ]
+        details.append(f"~{stats['distinct']} distinct")
+        lines.append(f"  {column} ({stats['dtype']}): " + ", ".join(details))
+    return "\n".join(lines)
+
+
 class InspectOperationError(Exception):
     """Custom exception for inspection operation errors."""
 
@@ -75,9 +490,7 @@ class InspectProcessor:
 
         try:
             logger.info(f"Getting first {n} rows")
-            result = self.gdf.head(n).to_wkt()
-            result["geometry"] = result["geometry"].apply(simplify_geom_repr)
-            return result
+            return _summarize_frame(self.gdf.head(n))
         except Exception as e:
             raise InspectOperationError(
                 f"Head operation failed: {str(e)}"
@@ -100,9 +513,7 @@ class InspectProcessor:
 
         try:
             logger.info(f"Getting last {n} rows")
-            result = self.gdf.tail(n).to_wkt()
-            result["geometry"] = result["geometry"].apply(simplify_geom_repr)
-            return result
+            return _summarize_frame(self.gdf.tail(n))
         except Exception as e:
             raise InspectOperationError(
                 f"Tail operation failed: {str(e)}"
@@ -148,6 +559,87 @@ class InspectProcessor:
                 f"Shape operation failed: {str(e)}"
             ) from e
 
+    def describe(self) -> Dict[str, Any]:
+        """Compute summary statistics of the features.
+
+        Returns:
+            Statistics as returned by ``describe_chunks``
+
+        Raises:
+            InspectOperationError: If operation fails
+        """
+        if self.gdf is None:
+            raise InspectOperationError("No GeoDataFrame set")
+
+        try:
+            logger.info("Computing summary statistics")
+            return describe_chunks([self.gdf])
+        except Exception as e:
+            raise InspectOperationError(
+                f"Describe operation failed: {str(e)}"
+            ) from e
+
+    def profile_geometries(
+        self,
+        n: int = 10,
+        h3_res: Optional[int] = None,
+        by: str = "vertices",
+    ) -> pd.DataFrame:
+        """Rank features by geometric complexity.
+
+        Vertex, part and ring counts are computed over the whole geometry
+        array at once; the number of H3 cells a polyfill would produce is
+        estimated from the area of polygons in an equal-area CRS.
+
+        Args:
+            n: Number of features to report
+            h3_res: Optional H3 resolution of the cell count estimate
+            by: Measure to rank by ('vertices', 'parts', 'rings' or
+                'h3_cells')
+
+        Returns:
+            DataFrame of the n heaviest features, indexed by their row
+            label, with their geometry type, measures and share of all
+            vertices
+
+        Raises:
+            InspectOperationError: If operation fails
+        """
+        if self.gdf is None:
+            raise InspectOperationError("No GeoDataFrame set")
+        if by not in PROFILE_MEASURES or (by == "h3_cells" and h3_res is None):
+            raise InspectOperationError(
+                f"Invalid profile measure '{by}'; expected one of "
+                f"{PROFILE_MEASURES}, h3_cells requiring a resolution"
+            )
+
+        try:
+            logger.info(f"Profiling the {n} heaviest geometries by {by}")
+            geoms = np.asarray(self.gdf.geometry.values)
+            type_ids = shapely.get_type_id(geoms)
+            vertices = shapely.get_num_coordinates(geoms)
+            profile = pd.DataFrame(
+                {
+                    "type": np.array(GEOMETRY_TYPES + [None], dtype=object)[
+                        type_ids
+                    ],
+                    "vertices": vertices,
+                    "parts": shapely.get_num_geometries(geoms),
+                    "rings": _ring_counts(geoms),
+                    "vertex_share": vertices / max(vertices.sum(), 1),
+                },
+                index=self.gdf.index,
+            )
+            if h3_res is not None:
+                profile["h3_cells"] = _h3_cell_estimates(
+                    self.gdf.geometry, h3_res
+                )
+            return profile.nlargest(n, by)
+        except Exception as e:
+            raise InspectOperationError(
+                f"Profile operation failed: {str(e)}"
+            ) from e
+
     def get_dtypes(self) -> Dict[str, Any]:
         """Get the data types of all columns in the GeoDataFrame.
 
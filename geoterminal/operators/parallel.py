@@ -0,0 +1,164 @@
+"""Parallel execution module.
+
+This module provides helpers for splitting geometry arrays into chunks and
+running work on those chunks in a process pool. Element-wise geometry
+functions are mapped over chunks whose WKB encoding is shared with the
+workers through a shared memory block.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+import shapely
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Number of chunks created per worker, to balance uneven chunks
+CHUNKS_PER_WORKER = 4
+
+GeometryFunc = Callable[[np.ndarray], np.ndarray]
+
+
+def split_chunks(values: np.ndarray, n_chunks: int) -> List[np.ndarray]:
+    """Split an array into at most n_chunks contiguous chunks.
+
+    Args:
+        values: Array to split
+        n_chunks: Desired number of chunks
+
+    Returns:
+        List of non-empty chunks, in order
+    """
+    n_chunks = max(1, min(n_chunks, len(values)))
+    return np.array_split(values, n_chunks)
+
+
+def run_chunked(
+    func: Callable[[T], R],
+    chunks: Sequence[T],
+    workers: int = 1,
+    chunksize: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+) -> List[R]:
+    """Apply a function to every chunk, preserving chunk order.
+
+    Chunks are processed in a process pool when more than one worker is
+    requested, so ``func`` must be a picklable module-level function.
+
+    Args:
+        func: Function to apply to each chunk
+        chunks: Chunks to process
+        workers: Number of worker processes (1 runs in-process)
+        chunksize: Number of chunks sent to a worker per task
+        initializer: Optional function run once per worker (or once
+                     in-process) before any chunk, e.g. to load shared state
+        initargs: Arguments passed to ``initializer``
+
+    Returns:
+        Results of ``func`` for each chunk, in the same order
+    """
+    if workers <= 1 or len(chunks) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [func(chunk) for chunk in chunks]
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        initializer=initializer,
+        initargs=initargs,
+    ) as executor:
+        return list(executor.map(func, chunks, chunksize=chunksize))
+
+
+def map_geometries(
+    func: GeometryFunc, geoms: np.ndarray, workers: int = 1
+) -> np.ndarray:
+    """Apply an element-wise geometry function in parallel chunks.
+
+    The geometries are encoded once as WKB into a shared memory block.
+    Each worker decodes its own slice of the block, applies ``func`` and
+    returns the WKB of the result; the chunks are reassembled in order.
+
+    Args:
+        func: Picklable function mapping a geometry array to an array of
+              the same length
+        geoms: Array of shapely geometries
+        workers: Number of worker processes (1 runs in-process)
+
+    Returns:
+        Array with the result of ``func`` for every geometry
+    """
+    if workers <= 1 or len(geoms) <= 1:
+        return np.asarray(func(geoms))
+
+    wkb = shapely.to_wkb(geoms)
+    lengths = np.array([len(w) if w is not None else 0 for w in wkb])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, offsets[-1]))
+    try:
+        buffer = np.ndarray((offsets[-1],), dtype=np.uint8, buffer=shm.buf)
+        buffer[:] = np.frombuffer(
+            b"".join(w for w in wkb if w is not None), dtype=np.uint8
+        )
+        del buffer
+
+        n_chunks = workers * CHUNKS_PER_WORKER
+        tasks = [
+            (func, shm.name, chunk_offsets)
+            for chunk_offsets in _chunk_offsets(offsets, n_chunks)
+        ]
+        parts = run_chunked(_apply_shared, tasks, workers)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return shapely.from_wkb(np.concatenate(parts))
+
+
+def _chunk_offsets(offsets: np.ndarray, n_chunks: int) -> List[np.ndarray]:
+    """Split WKB offsets into per-chunk offsets sharing their boundaries.
+
+    Args:
+        offsets: Start offset of every geometry plus the end offset
+        n_chunks: Desired number of chunks
+
+    Returns:
+        Offsets of each chunk, including the chunk end offset
+    """
+    chunks = []
+    for idx in split_chunks(np.arange(len(offsets) - 1), n_chunks):
+        first, last = idx[0], idx[-1] + 2
+        chunks.append(offsets[first:last])
+    return chunks
+
+
+def _apply_shared(task: Tuple[GeometryFunc, str, np.ndarray]) -> np.ndarray:
+    """Apply a geometry function to one chunk of a shared WKB block.
+
+    Args:
+        task: Function, shared memory block name and chunk offsets
+
+    Returns:
+        WKB of the function result for each geometry of the chunk
+    """
+    func, name, offsets = task
+    start, end = offsets[0], offsets[-1]
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray((end,), dtype=np.uint8, buffer=shm.buf)
+        data = block[start:end].tobytes()
+        del block
+    finally:
+        shm.close()
+
+    relative = offsets - start
+    wkb = np.array(
+        [data[a:b] or None for a, b in zip(relative[:-1], relative[1:])],
+        dtype=object,
+    )
+    return shapely.to_wkb(func(shapely.from_wkb(wkb)))
@@ -0,0 +1,226 @@
+"""Per-stage profiling of geoterminal runs.
+
+Every stage of a run (reading, each operation and exporting) records its
+wall time, CPU time (including worker processes), growth of the peak
+resident set size, and the rows and geometry vertices going in and out.
+Stages nest: the time and memory growth of a stage exclude the ones of
+the stages run inside it, so pulling chunks from a stream does not count
+the upstream stages twice. A stage run once per chunk is aggregated over
+all chunks.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import shapely
+
+if sys.platform != "win32":
+    import resource
+
+# Columns of the profiling report, in display order
+REPORT_COLUMNS = [
+    "stage",
+    "calls",
+    "wall_s",
+    "cpu_s",
+    "peak_rss_delta_mb",
+    "rows_in",
+    "rows_out",
+    "vertices_in",
+    "vertices_out",
+]
+
+
+def _cpu_time() -> float:
+    """Get the CPU time of the process and its reaped children."""
+    times = os.times()
+    return (
+        times.user + times.system + times.children_user + times.children_system
+    )
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Get the peak resident set size of the process in megabytes."""
+    if sys.platform == "win32":
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def _size(data: Any) -> Dict[str, Optional[int]]:
+    """Count the rows and geometry vertices of a frame."""
+    if data is None:
+        return {"rows": None, "vertices": None}
+    vertices = None
+    geometry = getattr(data, "geometry", None)
+    if geometry is not None:
+        vertices = int(
+            shapely.get_num_coordinates(np.asarray(geometry.values)).sum()
+        )
+    return {"rows": len(data), "vertices": vertices}
+
+
+def _add(total: Optional[int], value: Optional[int]) -> Optional[int]:
+    """Add counts, treating None as unknown."""
+    if value is None:
+        return total
+    return value if total is None else total + value
+
+
+def _new_record(name: str) -> Dict[str, Any]:
+    """Create the empty record of a stage."""
+    record: Dict[str, Any] = dict.fromkeys(REPORT_COLUMNS)
+    record.update(stage=name, calls=0, wall_s=0.0, cpu_s=0.0)
+    return record
+
+
+class Stage:
+    """Measurements of a running stage."""
+
+    def __init__(
+        self, name: str, data: Any = None, enabled: bool = True
+    ) -> None:
+        """Start measuring a stage.
+
+        Args:
+            name: Stage name
+            data: Optional input frame of the stage
+            enabled: Whether to measure the stage
+        """
+        self.name = name
+        self.enabled = enabled
+        self.inputs = _size(data if enabled else None)
+        self.outputs = _size(None)
+        self.nested_wall = 0.0
+        self.nested_cpu = 0.0
+        self.nested_rss = 0.0
+        self.peak_rss = _peak_rss_mb() if enabled else None
+        self.wall = time.perf_counter()
+        self.cpu = _cpu_time()
+
+    def output(self, data: Any) -> None:
+        """Record the output frame of the stage."""
+        if self.enabled:
+            self.outputs = _size(data)
+
+
+class Profiler:
+    """Collect the measurements of the stages of a run."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        """Initialize the profiler.
+
+        Args:
+            enabled: Whether to measure stages; a disabled profiler only
+                     runs them
+        """
+        self.enabled = enabled
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._stack: List[Stage] = []
+
+    @contextmanager
+    def stage(self, name: str, data: Any = None) -> Iterator[Stage]:
+        """Measure the code run in a ``with`` block as a stage.
+
+        Args:
+            name: Stage name; stages of the same name are aggregated
+            data: Optional input frame of the stage
+
+        Yields:
+            Stage on which to record the output frame with ``output``
+        """
+        if not self.enabled:
+            yield Stage(name, enabled=False)
+            return
+
+        stage = Stage(name, data)
+        self._stack.append(stage)
+        try:
+            yield stage
+        finally:
+            self._stack.pop()
+            self._record(stage)
+
+    def iterate(self, name: str, chunks: Iterable[Any]) -> Iterator[Any]:
+        """Measure the production of every chunk of a stream as a stage.
+
+        Args:
+            name: Stage name
+            chunks: Stream of frames
+
+        Yields:
+            Chunks of the stream
+        """
+        iterator = iter(chunks)
+        while True:
+            with self.stage(name) as stage:
+                chunk = next(iterator, None)
+                if chunk is not None:
+                    stage.output(chunk)
+            if chunk is None:
+                return
+            yield chunk
+
+    def _record(self, stage: Stage) -> None:
+        """Add the measurements of a finished stage to its record."""
+        wall = time.perf_counter() - stage.wall
+        cpu = _cpu_time() - stage.cpu
+        peak = _peak_rss_mb()
+        rss = 0.0
+        if peak is not None and stage.peak_rss is not None:
+            rss = peak - stage.peak_rss
+        if self._stack:
+            self._stack[-1].nested_wall += wall
+            self._stack[-1].nested_cpu += cpu
+            self._stack[-1].nested_rss += rss
+
+        # Records are kept in the order stages first finish, which is the
+        # order of the pipeline for streams too
+        record = self.records.setdefault(stage.name, _new_record(stage.name))
+        record["calls"] += 1
+        record["wall_s"] += wall - stage.nested_wall
+        record["cpu_s"] += cpu - stage.nested_cpu
+        if peak is not None:
+            delta = rss - stage.nested_rss
+            record["peak_rss_delta_mb"] = (
+                record["peak_rss_delta_mb"] or 0.0
+            ) + delta
+        for key, size in [("in", stage.inputs), ("out", stage.outputs)]:
+            record[f"rows_{key}"] = _add(record[f"rows_{key}"], size["rows"])
+            record[f"vertices_{key}"] = _add(
+                record[f"vertices_{key}"], size["vertices"]
+            )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the stage records as a DataFrame, in pipeline order."""
+        frame = pd.DataFrame(
+            list(self.records.values()), columns=REPORT_COLUMNS
+        )
+        counts = ["rows_in", "rows_out", "vertices_in", "vertices_out"]
+        frame[counts] = frame[counts].astype("Int64")
+        return frame.round(3)
+
+    def report(self, output: Optional[str] = None) -> None:
+        """Print the stage records as a table or write them as JSON.
+
+        Nothing is reported by a disabled profiler.
+
+        Args:
+            output: Path of a JSON file; prints a table to standard error
+                    when None or '-'
+        """
+        if not self.enabled:
+            return
+        if output and output != "-":
+            with open(output, "w") as f:
+                json.dump({"stages": list(self.records.values())}, f, indent=2)
+            return
+        frame = self.to_frame().astype(object).fillna("-")
+        print(frame.to_string(index=False), file=sys.stderr)
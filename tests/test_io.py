@@ -7,17 +7,27 @@ various formats.
 import tempfile
 from pathlib import Path
 from typing import Generator
+from unittest.mock import patch
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.orc as orc
 import pytest
-from shapely.geometry import Point, Polygon
+from shapely.geometry import Point, Polygon, box
 
 from geoterminal.io.file import (
     FileHandlerError,
+    export_chunks,
     export_data,
+    iter_geometry_file,
     read_geometry_file,
     read_wkt,
+    supports_pushdown,
 )
+from geoterminal.io.spatial_index import SpatialIndex, sidecar_path
+from geoterminal.operators.data_operations import DataProcessor, Sampler
 
 
 # Test fixtures
@@ -214,3 +224,212 @@ def test_export_invalid_format(
     """Test that exporting to an invalid format raises an error."""
     with pytest.raises(FileHandlerError):
         export_data(sample_gdf, temp_dir / "output.invalid")
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".geojson", ".shp", ".orc"])
+def test_iter_geometry_file_and_export_chunks(
+    temp_dir: Path, suffix: str
+) -> None:
+    """Test reading a file in chunks and writing the chunks back."""
+    points = [Point(i, i) for i in range(10)]
+    gdf = gpd.GeoDataFrame({"id": range(10)}, geometry=points, crs=4326)
+    input_file = temp_dir / f"input{suffix}"
+    export_data(gdf, input_file)
+
+    chunks = list(iter_geometry_file(input_file, 4326, chunksize=4))
+    if suffix != ".orc":
+        # ORC files are read stripe by stripe
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(chunk.crs == gdf.crs for chunk in chunks)
+
+    output_file = temp_dir / f"output{suffix}"
+    export_chunks(chunks, output_file)
+    result = read_geometry_file(output_file, 4326)
+    assert list(result["id"]) == list(range(10))
+    assert result.geometry.equals(gdf.geometry)
+
+    # Exporting no chunks fails instead of leaving no output behind
+    with pytest.raises(FileHandlerError):
+        export_chunks(iter([]), temp_dir / f"empty{suffix}")
+
+
+def test_export_chunks_orc_dtype_drift(temp_dir: Path) -> None:
+    """Test exporting ORC chunks whose column dtypes differ."""
+    ints = gpd.GeoDataFrame(
+        {"value": [1, 2], "name": [None, None]},
+        geometry=[Point(0, 0), Point(1, 1)],
+        crs=4326,
+    )
+    floats = gpd.GeoDataFrame(
+        {"value": [np.nan, 3.5], "name": ["a", "b"]},
+        geometry=[Point(2, 2), Point(3, 3)],
+        crs=4326,
+    )
+    output_file = temp_dir / "drift.orc"
+    export_chunks(iter([ints, floats]), output_file)
+
+    result = read_geometry_file(output_file, 4326)
+    assert result["value"].tolist()[:2] == [1.0, 2.0]
+    assert np.isnan(result["value"].iloc[2])
+    assert result["name"].isna().tolist() == [True, True, False, False]
+    assert result["name"].tolist()[2:] == ["a", "b"]
+    assert len(result) == 4
+
+
+def test_spatial_index_query(
+    temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the packed index finds the features intersecting bounds."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(temp_dir / "cache"))
+    cells = [
+        Polygon([(x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1)])
+        for x in range(30)
+        for y in range(30)
+    ]
+    gdf = gpd.GeoDataFrame({"id": range(900)}, geometry=cells, crs=4326)
+    file_path = temp_dir / "cells.geojson"
+    export_data(gdf, file_path)
+
+    index = SpatialIndex.open(file_path)
+    # The sidecar is kept in the cache, not next to the data
+    assert (
+        sidecar_path(file_path).parent == temp_dir / "cache/geoterminal/index"
+    )
+    assert sidecar_path(file_path).exists()
+    for bounds in [(2.5, 3.5, 7.2, 4.1), (-5, -5, 0.5, 0.5), (40, 40, 50, 50)]:
+        result = index.read(bounds)
+        expected = gdf[gdf.intersects(box(*bounds))]
+        assert sorted(result["id"]) == sorted(expected["id"])
+    assert len(index.read()) == 900
+    assert index.read().crs == gdf.crs
+
+    # Bounds in another CRS are transformed to the index CRS
+    projected = index.read((0, 0, 150_000, 150_000), crs=3857)
+    assert sorted(projected["id"]) == [0, 1, 30, 31]
+
+
+def test_spatial_index_validation(
+    temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the sidecar is reused until the file content changes."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(temp_dir / "cache"))
+    points = [Point(i, i) for i in range(5)]
+    gdf = gpd.GeoDataFrame({"id": range(5)}, geometry=points, crs=4326)
+    file_path = temp_dir / "points.csv"
+    export_data(gdf, file_path)
+    sidecar = sidecar_path(file_path)
+
+    SpatialIndex.open(file_path)
+
+    # Same content with a new modification time is matched by hash, and
+    # the new time is recorded so the next run does not hash again
+    file_path.write_bytes(file_path.read_bytes())
+    assert len(SpatialIndex.open(file_path).read()) == 5
+    refreshed = sidecar.stat().st_mtime_ns
+    with patch("geoterminal.io.spatial_index._file_hash") as file_hash:
+        assert len(SpatialIndex.open(file_path).read()) == 5
+        file_hash.assert_not_called()
+    assert sidecar.stat().st_mtime_ns == refreshed
+
+    export_data(gdf.iloc[:3], file_path)
+    assert len(SpatialIndex.open(file_path).read()) == 3
+
+    # Editing the attributes of a Shapefile makes its index stale
+    shp_path = temp_dir / "points.shp"
+    export_data(gdf, shp_path)
+    SpatialIndex.open(shp_path)
+    gdf["id"] = gdf["id"] + 10
+    dbf_path = temp_dir / "edited.shp"
+    export_data(gdf, dbf_path)
+    shp_path.with_suffix(".dbf").write_bytes(
+        dbf_path.with_suffix(".dbf").read_bytes()
+    )
+    assert sorted(SpatialIndex.open(shp_path).read()["id"]) == list(
+        range(10, 15)
+    )
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".orc"])
+def test_read_with_pushdown(temp_dir: Path, suffix: str) -> None:
+    """Test that filtered out rows never have their geometry parsed."""
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "value": [1.0, 5.0, None],
+            "wkt": ["POINT (0 0)", "not a geometry", "POINT (2 2)"],
+        }
+    )
+    file_path = temp_dir / f"input{suffix}"
+    if suffix == ".csv":
+        df.to_csv(file_path, index=False)
+    else:
+        orc.write_table(pa.Table.from_pandas(df), str(file_path))
+
+    query = "value != 5"
+    assert supports_pushdown(file_path, query)
+    assert not supports_pushdown(file_path, "wkt == 'POINT (0 0)'")
+    assert not supports_pushdown(file_path, "missing > 1")
+    assert not supports_pushdown(file_path, "value > value.mean()")
+
+    gdf = read_geometry_file(file_path, 4326, where=query)
+    assert list(gdf["id"]) == [1, 3]
+    chunks = list(
+        iter_geometry_file(file_path, 4326, chunksize=2, where=query)
+    )
+    assert [i for chunk in chunks for i in chunk["id"]] == [1, 3]
+
+    # Comparisons Arrow cannot bind are evaluated by pandas instead
+    query = "id == 1 or id == '3'"
+    assert list(read_geometry_file(file_path, 4326, where=query)["id"]) == [1]
+    chunks = list(
+        iter_geometry_file(file_path, 4326, chunksize=2, where=query)
+    )
+    assert [i for chunk in chunks for i in chunk["id"]] == [1]
+
+    with pytest.raises(FileHandlerError):
+        read_geometry_file(file_path, 4326)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".orc"])
+def test_read_with_sampler(temp_dir: Path, suffix: str) -> None:
+    """Test that unsampled rows never have their geometry parsed."""
+    n = 200
+    kept = np.random.default_rng(7).random(n) < 0.1
+    df = pd.DataFrame(
+        {
+            "id": np.arange(n),
+            "wkt": np.where(kept, "POINT (1 2)", "not a geometry"),
+        }
+    )
+    file_path = temp_dir / f"input{suffix}"
+    if suffix == ".csv":
+        df.to_csv(file_path, index=False)
+    else:
+        orc.write_table(pa.Table.from_pandas(df), str(file_path))
+
+    gdf = read_geometry_file(file_path, 4326, sampler=Sampler(0.1, seed=7))
+    assert list(gdf["id"]) == list(np.flatnonzero(kept))
+    chunks = iter_geometry_file(
+        file_path, 4326, chunksize=30, sampler=Sampler(0.1, seed=7)
+    )
+    assert list(pd.concat(chunks)["id"]) == list(np.flatnonzero(kept))
+
+    # A reservoir sample does not depend on the chunking
+    df["wkt"] = [f"POINT ({i} {i % 7})" for i in range(n)]
+    file_path.unlink()
+    if suffix == ".csv":
+        df.to_csv(file_path, index=False)
+    else:
+        orc.write_table(pa.Table.from_pandas(df), str(file_path))
+    expected = DataProcessor(read_geometry_file(file_path, 4326)).sample(
+        12, seed=3, grid=50
+    )
+    assert len(expected) == 48
+    for chunksize in [25, 1000]:
+        chunks = iter_geometry_file(
+            file_path,
+            4326,
+            chunksize=chunksize,
+            sampler=Sampler(12, seed=3, grid=50),
+        )
+        assert list(pd.concat(chunks)["id"]) == list(expected["id"])
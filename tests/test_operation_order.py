@@ -7,9 +7,10 @@ from typing import Any, Generator, Tuple
 
 import geopandas as gpd
 import pytest
-from shapely.geometry import Polygon
+from shapely.geometry import MultiPolygon, Point, Polygon
 
-from geoterminal.cli.processor import process_geometries
+from geoterminal.cli.parser import setup_parser
+from geoterminal.cli.processor import process_geometries, read_reference_file
 from geoterminal.operators.geometry_operations import GeometryProcessor
 
 
@@ -127,3 +128,56 @@ def test_operation_order_split(
     assert len(final1) == len(final2)
     for geom1, geom2 in zip(final1.geometry, final2.geometry):
         assert geom1.equals(geom2), "Geometries are different"
+
+
+def test_read_reference_file_copies(
+    sample_gdf: gpd.GeoDataFrame, temp_files: Tuple[str, str, str, str]
+) -> None:
+    """Test that changes to a cached reference file do not leak."""
+    input_file = temp_files[0]
+    sample_gdf.to_file(input_file, driver="GeoJSON")
+
+    first = read_reference_file(input_file)
+    first["extra"] = 1
+    first.to_crs(3857, inplace=True)
+    second = read_reference_file(input_file)
+    assert "extra" not in second.columns
+    assert second.crs == sample_gdf.crs
+
+
+def test_mask_csv_without_crs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test an indexed mask whose file has no CRS but --mask-crs."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    mask_file = tmp_path / "mask.csv"
+    mask_file.write_text('geometry\n"POLYGON ((0 0, 3 0, 3 3, 0 3, 0 0))"\n')
+    points = gpd.GeoDataFrame(
+        geometry=[Point(1, 1), Point(2, 2), Point(5, 5)], crs="EPSG:4326"
+    ).to_crs(3857)
+
+    for no_index in [False, True]:
+        args = Namespace(mask_crs=4326, no_index=no_index)
+        processor = GeometryProcessor(points.copy())
+        process_geometries(processor, args, [("mask", str(mask_file))])
+        assert processor.gdf is not None
+        assert len(processor.gdf) == 2
+
+    # Without any CRS, the bounds are not compared to the coordinates
+    assert len(read_reference_file(str(mask_file), None, True, points)) == 1
+
+
+def test_profile_by(capsys: pytest.CaptureFixture) -> None:
+    """Test ranking the profiled geometries by another measure."""
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    gdf = gpd.GeoDataFrame(
+        geometry=[square.buffer(1), MultiPolygon([square, square])],
+        crs="EPSG:4326",
+    )
+    args = setup_parser().parse_args(
+        ["input.geojson", "--profile-geometries", "1", "--profile-by", "parts"]
+    )
+    process_geometries(
+        GeometryProcessor(gdf), args, [("profile_geometries", 1)]
+    )
+    assert "MultiPolygon" in capsys.readouterr().out
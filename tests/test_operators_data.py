@@ -1,13 +1,21 @@
 """Tests for the data operations module."""
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
-from shapely.geometry import Point
+from shapely.geometry import Point, Polygon
 
 from geoterminal.operators.data_operations import (
     DataOperationError,
     DataProcessor,
+    Sampler,
+    aggregate_chunks,
+    is_row_query,
+    parse_aggregations,
+    query_columns,
+    query_to_arrow_filter,
 )
 
 
@@ -84,3 +92,134 @@ def test_query_operation(sample_data_gdf: gpd.GeoDataFrame) -> None:
     processor = DataProcessor()
     with pytest.raises(DataOperationError):
         processor.query("value > 10")
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "value > 15",
+        "value != 20 and category == 'X'",
+        "not (value >= 20) or name in ['A', 'B']",
+        "(id < 3) | (category != 'Y')",
+        "10 < value <= 25",
+        "name not in ('A',) and value > -1",
+    ],
+)
+def test_query_to_arrow_filter(query: str) -> None:
+    """Test that Arrow filters select the same rows as pandas queries."""
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "name": ["A", "B", None, "D", "E"],
+            "value": [10.5, 20.0, np.nan, 25.2, 30.0],
+            "category": ["X", "Y", "X", None, "Y"],
+        }
+    )
+    arrow_filter = query_to_arrow_filter(query)
+    assert arrow_filter is not None
+
+    table = pa.Table.from_pandas(df).filter(arrow_filter)
+    assert table.column("id").to_pylist() == list(df.query(query)["id"])
+
+
+def test_query_pushdown_helpers() -> None:
+    """Test detection of queries that cannot be pushed down."""
+    assert query_columns("value > 1 and name == 'A'") == {"value", "name"}
+    assert query_columns("`my col` > 1") is None
+    assert query_columns("area() > 1") is None
+    assert query_columns("value > value.mean()") is None
+    assert query_columns("value == value[0]") is None
+    assert is_row_query("area() > 1 and `my col` > @limit")
+    assert not is_row_query("value > value.mean()")
+    # '&' binds tighter than comparisons in Python but not in pandas
+    assert query_to_arrow_filter("value > 1 & id < 3") is None
+    assert query_to_arrow_filter("name.str.startswith('A')") is None
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("geom_type == 'Polygon'", [2, 4]),
+        ("area() > 1 and value < 25", [2]),
+        ("bbox(-1, -1, 0.5, 0.5)", [1, 2]),
+        ("num_points() < 5 and category != 'Y'", [1, 3, 4]),
+        ("bbox(4, 4, 12, 12) & (geom_type != 'Point')", [4]),
+    ],
+)
+def test_query_spatial_terms(query: str, expected: list) -> None:
+    """Test spatial functions and names in queries."""
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2, 3, 4], "value": [10, 20, 30, 40]},
+        geometry=[
+            Point(0, 0),
+            Point(1, 1).buffer(1),
+            Point(5, 5),
+            Polygon([(10, 10), (11, 10), (11, 11)]),
+        ],
+        crs="EPSG:3857",
+    )
+    gdf["category"] = ["X", "Y", "X", "X"]
+    result = DataProcessor(gdf).query(query)
+    assert list(result["id"]) == expected
+
+    with pytest.raises(DataOperationError):
+        DataProcessor(gdf).query("bbox(0, 0, 1)")
+
+
+def test_groupby() -> None:
+    """Test grouped aggregation, in memory and over chunks."""
+    rng = np.random.default_rng(0)
+    gdf = gpd.GeoDataFrame(
+        {
+            "key": rng.choice(
+                np.array(["a", "b", "c", None], dtype=object), 200
+            ),
+            "value": rng.normal(size=200),
+        },
+        geometry=[Point(i, i) for i in range(200)],
+        crs="EPSG:4326",
+    )
+    aggs = parse_aggregations("value:sum,value:mean,value:min,value:last")
+    result = DataProcessor(gdf).groupby(["key"], aggs)
+    expected = (
+        gdf.groupby("key", dropna=False, sort=False)["value"]
+        .agg(["sum", "mean", "min", "last"])
+        .add_prefix("value_")
+        .reset_index()
+    )
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(result.drop(columns="geometry")), expected
+    )
+    assert result.geometry.isna().all() and result.crs == gdf.crs
+
+    chunks = [gdf.iloc[rows] for rows in np.array_split(np.arange(200), 7)]
+    streamed = aggregate_chunks(chunks, ["key"], aggs)
+    pd.testing.assert_frame_equal(
+        streamed.sort_values("key").reset_index(drop=True),
+        result.sort_values("key").reset_index(drop=True),
+    )
+
+    counts = DataProcessor(gdf).groupby(["key"])
+    assert counts["count"].sum() == 200
+
+    with pytest.raises(DataOperationError):
+        parse_aggregations("value:median")
+    with pytest.raises(DataOperationError):
+        DataProcessor(gdf).groupby(["missing"])
+
+
+def test_sample(sample_data_gdf: gpd.GeoDataFrame) -> None:
+    """Test random sampling of rows."""
+    gdf = pd.concat([sample_data_gdf] * 50, ignore_index=True)
+    sampled = DataProcessor(gdf).sample(20, seed=1)
+    assert len(sampled) == 20
+    assert sampled.index.is_monotonic_increasing
+    assert sampled.equals(DataProcessor(gdf).sample(20, seed=1))
+    assert len(DataProcessor(gdf).sample(1000)) == len(gdf)
+
+    fraction = DataProcessor(gdf).sample(0.5, seed=1)
+    assert 0 < len(fraction) < len(gdf)
+
+    for size, grid in [(0, None), (2.5, None), (0.5, 1.0), (2, -1.0)]:
+        with pytest.raises(DataOperationError):
+            Sampler(size, grid=grid)
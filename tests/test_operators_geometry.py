@@ -5,11 +5,18 @@ reprojection.
 """
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
-from shapely.geometry import Point, Polygon
+from shapely.geometry import GeometryCollection, LineString, Point, Polygon
 
-from geoterminal.operators.geometry_operations import GeometryProcessor
+from geoterminal.operators import geometry_operations
+from geoterminal.operators.geometry_operations import (
+    GeometryOperationError,
+    GeometryProcessor,
+    dedupe_chunks,
+    spatial_sort_chunks,
+)
 
 
 @pytest.fixture
@@ -252,3 +259,419 @@ def test_simplify_error_handling() -> None:
     )
     with pytest.raises(Exception):
         processor.simplify(-0.1)  # Should raise error
+
+
+def test_convex_hull_chunked(sample_polygon_gdf: gpd.GeoDataFrame) -> None:
+    """Test that chunked convex hull matches the union-based hull."""
+    expected = sample_polygon_gdf.geometry.union_all().convex_hull
+    processor = GeometryProcessor(sample_polygon_gdf.copy())
+    result = processor.convex_hull(chunk_size=1)
+
+    assert len(result) == 1
+    assert result.geometry.iloc[0].equals(expected)
+
+
+def test_unary_union_parallel() -> None:
+    """Test that the parallel tree union matches the serial union."""
+    polygons = [
+        Polygon([(x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1)])
+        for x in range(4)
+        for y in range(4)
+    ]
+    gdf = gpd.GeoDataFrame(geometry=polygons, crs="EPSG:4326")
+    expected = gdf.geometry.union_all()
+
+    result = GeometryProcessor(gdf, workers=2).unary_union(coverage=False)
+    assert len(result) == 1
+    assert result.geometry.iloc[0].equals(expected)
+
+
+def test_unary_union_coverage(sample_polygon_gdf: gpd.GeoDataFrame) -> None:
+    """Test coverage union on non-overlapping polygons."""
+    processor = GeometryProcessor(sample_polygon_gdf.copy())
+    result = processor.unary_union(coverage=True)
+
+    assert len(result) == 1
+    assert abs(result.geometry.iloc[0].area - 2.0) < 1e-10
+
+
+def test_unary_union_polyfill_coverage(
+    sample_polygon_gdf: gpd.GeoDataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that only unchanged polyfill cells use the coverage union."""
+    calls = []
+    coverage_union_all = geometry_operations.shapely.coverage_union_all
+
+    def spy(geoms: np.ndarray) -> Polygon:
+        calls.append(len(geoms))
+        return coverage_union_all(geoms)
+
+    monkeypatch.setattr(geometry_operations.shapely, "coverage_union_all", spy)
+
+    processor = GeometryProcessor(sample_polygon_gdf.copy())
+    processor.polyfill(5)
+    processor.unary_union()
+    assert len(calls) == 1
+
+    # Cells that no longer come straight from polyfill may overlap
+    processor = GeometryProcessor(sample_polygon_gdf.copy())
+    processor.polyfill(5)
+    processor.apply_buffer(1000)
+    result = processor.unary_union()
+    assert len(calls) == 1
+    assert result.geometry.iloc[0].is_valid
+
+    # A hex column alone does not make a coverage
+    cells = GeometryProcessor(sample_polygon_gdf.copy()).polyfill(5)
+    GeometryProcessor(cells).unary_union()
+    assert len(calls) == 1
+
+
+def test_dissolve(sample_polygon_gdf: gpd.GeoDataFrame) -> None:
+    """Test dissolve by a column with attribute aggregation."""
+    gdf = sample_polygon_gdf.copy()
+    gdf["district"] = ["a", "a"]
+    gdf["population"] = [10, 20]
+    processor = GeometryProcessor(gdf, workers=2)
+    result = processor.dissolve("district", aggfunc="sum")
+
+    assert len(result) == 1
+    assert result["district"].iloc[0] == "a"
+    assert result["population"].iloc[0] == 30
+    assert abs(result.geometry.iloc[0].area - 2.0) < 1e-10
+
+
+def test_dissolve_error_handling(
+    sample_polygon_gdf: gpd.GeoDataFrame,
+) -> None:
+    """Test error handling in dissolve operation."""
+    processor = GeometryProcessor(sample_polygon_gdf)
+    with pytest.raises(Exception):
+        processor.dissolve("missing")
+
+
+def test_parallel_elementwise_operations() -> None:
+    """Test that chunked parallel execution matches serial results."""
+    points = [Point(x / 10, x / 20) for x in range(20)]
+    gdf = gpd.GeoDataFrame({"id": range(20)}, geometry=points, crs=4326)
+
+    serial = GeometryProcessor(gdf.copy()).apply_buffer(100)
+    parallel = GeometryProcessor(gdf.copy(), workers=2).apply_buffer(100)
+    assert parallel["id"].tolist() == serial["id"].tolist()
+    assert parallel.geometry.geom_equals_exact(serial.geometry, 1e-9).all()
+
+    processor = GeometryProcessor(parallel, workers=2)
+    simplified = processor.simplify(0.0001)
+    assert len(simplified) == len(gdf)
+
+    reprojected = GeometryProcessor(gdf.copy(), workers=2).reproject(3857)
+    assert reprojected.crs == "EPSG:3857"
+    expected = gdf.to_crs(3857)
+    assert reprojected.geometry.geom_equals_exact(
+        expected.geometry, 1e-6
+    ).all()
+
+
+def test_validity_cached_and_make_valid() -> None:
+    """Test lazy validity tracking and repairing invalid geometries."""
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1)])
+    gdf = gpd.GeoDataFrame(geometry=[bowtie], crs="EPSG:4326")
+    processor = GeometryProcessor(gdf, validate=False)
+
+    assert processor.is_valid is False
+    result = processor.make_valid()
+    assert result.geometry.is_valid.all()
+    assert processor.is_valid is True
+
+    # In-place edits are taken into account once the data is set again
+    processor.gdf.loc[0, "geometry"] = bowtie
+    processor.set_data(processor.gdf)
+    assert processor.is_valid is False
+    processor.gdf = gpd.GeoDataFrame(geometry=[Point(0, 0)], crs=4326)
+    assert processor.is_valid is True
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sjoin(sample_polygon_gdf: gpd.GeoDataFrame, workers: int) -> None:
+    """Test spatial join transferring attributes from polygons to points."""
+    zones = sample_polygon_gdf.copy()
+    zones["zone"] = ["west", "east"]
+    points = gpd.GeoDataFrame(
+        {"id": [1, 2, 3, 4]},
+        geometry=[
+            Point(0.5, 0.5),
+            Point(1.5, 0.5),
+            Point(1.2, 0.8),
+            Point(5, 5),
+        ],
+        crs="EPSG:4326",
+    )
+
+    processor = GeometryProcessor(points, workers=workers)
+    result = processor.sjoin(zones, predicate="within")
+    assert result["id"].tolist() == [1, 2, 3]
+    assert result["zone"].tolist() == ["west", "east", "east"]
+
+    processor = GeometryProcessor(points, workers=workers)
+    result = processor.sjoin(zones, predicate="within", how="left")
+    assert len(result) == 4
+    assert result["zone"].isna().sum() == 1
+    # The index of the workers is never loaded in this process
+    assert not geometry_operations._worker_state
+
+
+def test_sjoin_error_handling(sample_polygon_gdf: gpd.GeoDataFrame) -> None:
+    """Test error handling in spatial join."""
+    processor = GeometryProcessor(sample_polygon_gdf)
+    with pytest.raises(Exception):
+        processor.sjoin(sample_polygon_gdf, predicate="touches")
+
+    tile = (np.array([Point(0, 0).wkb]), np.array([0]), "intersects")
+    with pytest.raises(GeometryOperationError):
+        geometry_operations._query_tile(tile)
+
+
+def test_nearest() -> None:
+    """Test nearest join with attributes, distance and maximum distance."""
+    stations = gpd.GeoDataFrame(
+        {"station": ["a", "b"]},
+        geometry=[Point(0, 0), Point(0.01, 0)],
+        crs="EPSG:4326",
+    )
+    points = gpd.GeoDataFrame(
+        {"id": [1, 2, 3]},
+        geometry=[Point(0.001, 0), Point(0.009, 0), Point(1, 1)],
+        crs="EPSG:4326",
+    )
+
+    processor = GeometryProcessor(points.copy())
+    result = processor.nearest(stations)
+    assert result["station"].tolist() == ["a", "b", "b"]
+    assert abs(result["nearest_distance"].iloc[0] - 111.32) < 1
+
+    processor = GeometryProcessor(points.copy())
+    result = processor.nearest(stations, max_distance=1000)
+    assert len(result) == 3
+    assert result["station"].iloc[:2].tolist() == ["a", "b"]
+    assert pd.isna(result["station"].iloc[2])
+    assert pd.isna(result["nearest_distance"].iloc[2])
+
+    # Existing columns are never overwritten
+    points["distance"] = 1.0
+    points["nearest_distance"] = 2.0
+    result = GeometryProcessor(points.copy()).nearest(stations)
+    assert result["distance"].tolist() == [1.0] * 3
+    assert result["nearest_distance"].tolist() == [2.0] * 3
+    assert abs(result["nearest_distance_right"].iloc[0] - 111.32) < 1
+
+
+def test_within_distance(sample_polygon_gdf: gpd.GeoDataFrame) -> None:
+    """Test filtering geometries within a distance in meters."""
+    processor = GeometryProcessor(sample_polygon_gdf)
+
+    # About 111 meters west of the first polygon
+    result = processor.within_distance("POINT(-0.001 0.5)", 200)
+    assert len(result) == 1
+
+    result = processor.within_distance("POINT(-0.001 0.5)", 50)
+    assert len(result) == 0
+
+    with pytest.raises(Exception):
+        processor.within_distance("POINT(0 0)", -1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_subdivide(workers: int) -> None:
+    """Test subdividing large geometries while keeping attributes."""
+    circle = Point(0, 0).buffer(10, quad_segs=64)
+    square = Polygon([(20, 0), (21, 0), (21, 1), (20, 1)])
+    gdf = gpd.GeoDataFrame(
+        {"name": ["circle", "square"]},
+        geometry=[circle, square],
+        crs="EPSG:3857",
+    )
+
+    processor = GeometryProcessor(gdf, workers=workers)
+    result = processor.subdivide(32)
+
+    assert len(result) > 2
+    assert (result.geometry.count_coordinates() <= 32).all()
+    assert result["name"].value_counts()["square"] == 1
+    pieces = result[result["name"] == "circle"].geometry
+    assert abs(pieces.area.sum() - circle.area) < 1e-6
+
+    # Lines of a collection are kept, once, when the polygons are split
+    line = LineString([(0, -20), (0, 20)])
+    mixed = gpd.GeoDataFrame(
+        geometry=[GeometryCollection([circle, line])], crs="EPSG:3857"
+    )
+    result = GeometryProcessor(mixed, workers=workers).subdivide(32)
+    assert (result.geometry.count_coordinates() <= 32).all()
+    assert abs(result.geometry.area.sum() - circle.area) < 1e-6
+    lines = result.geometry[result.geom_type == "LineString"]
+    assert abs(lines.length.sum() - line.length) < 1e-6
+
+
+def test_simplify_coverage_preserves_shared_edges() -> None:
+    """Test that coverage simplification keeps neighbours edge-matched."""
+    left = Point(0, 0).buffer(1, quad_segs=32)
+    right = Polygon([(0, -2), (2, -2), (2, 2), (0, 2)]).difference(left)
+    left = left.intersection(Polygon([(0, -2), (2, -2), (2, 2), (0, 2)]))
+    gdf = gpd.GeoDataFrame(geometry=[left, right], crs="EPSG:3857")
+    original_vertices = gdf.geometry.count_coordinates().sum()
+
+    result = GeometryProcessor(gdf).simplify(0.1, coverage=True)
+    simplified = result.geometry
+    assert simplified.count_coordinates().sum() < original_vertices
+    assert simplified.iloc[0].intersection(simplified.iloc[1]).area < 1e-9
+
+
+def test_simplify_levels() -> None:
+    """Test producing several simplification levels in one call."""
+    circle = Point(0, 0).buffer(10, quad_segs=64)
+    gdf = gpd.GeoDataFrame(geometry=[circle], crs="EPSG:3857")
+    processor = GeometryProcessor(gdf)
+    levels = processor.simplify_levels([1.0, 0.1])
+
+    assert list(levels) == [0.1, 1.0]
+    fine = levels[0.1].geometry.count_coordinates().iloc[0]
+    coarse = levels[1.0].geometry.count_coordinates().iloc[0]
+    assert coarse < fine < len(circle.exterior.coords)
+    assert processor.gdf is levels[0.1]
+
+    # Levels are cascaded, each within its tolerance of the original
+    for tolerance, level in levels.items():
+        assert level.geometry.iloc[0].hausdorff_distance(circle) <= tolerance
+
+    with pytest.raises(GeometryOperationError):
+        GeometryProcessor(gdf.copy()).simplify_levels([-1.0, 1.0])
+
+
+def test_set_precision() -> None:
+    """Test snapping coordinates to a grid."""
+    polygon = Polygon([(0.123456, 0), (1.987654, 0), (1.987654, 1), (0, 1)])
+    gdf = gpd.GeoDataFrame(geometry=[polygon], crs="EPSG:4326")
+    result = GeometryProcessor(gdf).set_precision(0.01)
+
+    coords = result.geometry.get_coordinates()
+    assert ((coords * 100).round(9) % 1 == 0).all().all()
+    assert result.geometry.is_valid.all()
+
+    with pytest.raises(Exception):
+        GeometryProcessor(gdf).set_precision(0)
+
+
+@pytest.mark.parametrize("method", ["hilbert", "morton"])
+def test_spatial_sort(method: str) -> None:
+    """Test ordering features along a space-filling curve."""
+    coords = [(x, y) for x in range(8) for y in range(8)]
+    points = [Point(coords[(i * 37) % 64]) for i in range(64)]
+    gdf = gpd.GeoDataFrame({"id": range(64)}, geometry=points, crs=3857)
+
+    result = GeometryProcessor(gdf).spatial_sort(method)
+    assert sorted(result["id"]) == list(range(64))
+    # Consecutive features along the curve are close to each other
+    steps = result.geometry.distance(result.geometry.shift()).iloc[1:]
+    shuffled = gdf.geometry.distance(gdf.geometry.shift()).iloc[1:]
+    assert steps.mean() < shuffled.mean() / 2
+
+    with pytest.raises(Exception):
+        GeometryProcessor(gdf).spatial_sort("zorder")
+
+
+def test_spatial_sort_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the external merge sort matches the in-memory sort."""
+    monkeypatch.setattr(geometry_operations, "SORT_RUN_BATCH_SIZE", 7)
+    points = [
+        Point((i * 7919) % 353 - 176, (i * 31) % 170 - 85) for i in range(200)
+    ]
+    gdf = gpd.GeoDataFrame({"id": range(200)}, geometry=points, crs=4326)
+    chunks = [gdf.iloc[idx] for idx in np.array_split(np.arange(200), 7)]
+
+    result = pd.concat(spatial_sort_chunks(chunks), ignore_index=True)
+    expected = GeometryProcessor(gdf).spatial_sort()
+    assert list(result["id"]) == list(expected["id"])
+    assert result.crs == gdf.crs
+    assert result.geometry.equals(expected.geometry.reset_index(drop=True))
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [("geometry", [0, 1, 3, 5]), ("geometry+cols", [0, 1, 2, 3, 5])],
+)
+def test_dedupe(key: str, expected: list) -> None:
+    """Test dropping duplicates in memory and over chunks."""
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    # Same square starting from another vertex, in reverse order
+    rotated = Polygon([(1, 1), (1, 0), (0, 0), (0, 1)])
+    gdf = gpd.GeoDataFrame(
+        {"name": ["a", "b", "c", "c", "a", "b"]},
+        geometry=[square, Point(0, 0), rotated, Point(1, 1), square, None],
+        crs="EPSG:4326",
+    )
+    result = GeometryProcessor(gdf.copy()).dedupe(key)
+    assert list(result.index) == expected
+
+    chunks = [gdf.iloc[idx] for idx in np.array_split(np.arange(6), 4)]
+    streamed = pd.concat(dedupe_chunks(chunks, key))
+    assert list(streamed.index) == expected
+
+    with pytest.raises(GeometryOperationError):
+        GeometryProcessor(gdf).dedupe("cols")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize(
+    "how", ["intersection", "difference", "symmetric_difference", "union"]
+)
+def test_overlay(how: str, workers: int) -> None:
+    """Test overlay pieces and attributes against geopandas."""
+    left = gpd.GeoDataFrame(
+        {"id": [1, 2], "name": ["a", "b"]},
+        geometry=[
+            Polygon([(0, 0), (2, 0), (2, 2), (0, 2)]),
+            Point(5, 5).buffer(1),
+        ],
+        crs="EPSG:3857",
+    )
+    right = gpd.GeoDataFrame(
+        {"code": [10, 20, 30], "name": ["p", "q", "r"]},
+        geometry=[
+            Polygon([(1, 1), (3, 1), (3, 3), (1, 3)]),
+            Polygon([(2, 0), (4, 0), (4, 2), (2, 2)]),
+            Polygon([(10, 10), (11, 10), (11, 11), (10, 11)]),
+        ],
+        crs="EPSG:3857",
+    )
+
+    result = GeometryProcessor(left, workers=workers).overlay(right, how)
+    expected = gpd.overlay(left, right, how=how, keep_geom_type=True)
+    assert len(result) == len(expected)
+    assert result.area.sum() == pytest.approx(expected.area.sum())
+    assert (result.geom_type == "Polygon").all()
+    if how == "difference":
+        assert list(result.columns) == ["id", "name", "geometry"]
+    else:
+        assert list(result.columns) == [
+            "id",
+            "name",
+            "geometry",
+            "code",
+            "name_right",
+        ]
+    if how == "intersection":
+        # The shared edge of touching polygons is not a piece
+        assert list(result["code"]) == [10]
+
+
+def test_overlay_error_handling(
+    sample_polygon_gdf: gpd.GeoDataFrame,
+) -> None:
+    """Test overlay error handling."""
+    processor = GeometryProcessor(sample_polygon_gdf)
+    with pytest.raises(Exception):
+        processor.overlay(sample_polygon_gdf, how="xor")
+    with pytest.raises(Exception):
+        processor.overlay(
+            sample_polygon_gdf.set_crs(None, allow_override=True)
+        )
@@ -1,14 +1,20 @@
 """Test suite for inspection operations."""
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
-from shapely.geometry import Point, Polygon
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon
 
 from geoterminal.operators.inspect_operations import (
+    HyperLogLog,
     InspectOperationError,
     InspectProcessor,
+    _compact_count,
+    describe_chunks,
+    format_description,
     simplify_geom_repr,
+    summarize_geometries,
 )
 
 
@@ -49,6 +55,47 @@ def test_simplify_geom_repr() -> None:
     assert simplify_geom_repr(polygon_wkt) == expected
 
 
+def test_summarize_geometries() -> None:
+    """Test geometry summaries built from types and counts."""
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    holed = Polygon(
+        [(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (2, 1), (2, 2)]]
+    )
+    line = LineString([(i, i % 2) for i in range(12_345)])
+    geoms = np.array(
+        [
+            Point(1.5, 2),
+            square,
+            holed,
+            MultiPolygon([square, holed]),
+            line,
+            Polygon(),
+            None,
+        ],
+        dtype=object,
+    )
+    assert summarize_geometries(geoms) == [
+        "POINT(1.5 2)",
+        "POLYGON(5 pts)",
+        "POLYGON(2 rings, 9 pts)",
+        "MULTIPOLYGON(2 parts, 14 pts)",
+        "LINESTRING(12.3k pts)",
+        "POLYGON EMPTY",
+        "None",
+    ]
+
+    # Counts rounding up to 1000 of a unit move to the next unit
+    counts = [999, 999_499, 999_500, 999_999, 999_499_999, 999_500_000]
+    assert [_compact_count(n) for n in counts] == [
+        "999",
+        "999k",
+        "1M",
+        "1M",
+        "999M",
+        "1G",
+    ]
+
+
 def test_inspect_processor_initialization(
     sample_gdf: gpd.GeoDataFrame,
 ) -> None:
@@ -171,3 +218,91 @@ def test_set_data(sample_gdf: gpd.GeoDataFrame) -> None:
     # Test with invalid input
     with pytest.raises(InspectOperationError):
         processor.set_data(pd.DataFrame())
+
+
+def test_describe(inspect_processor: InspectProcessor) -> None:
+    """Test summary statistics of geometries and columns."""
+    description = inspect_processor.describe()
+    assert description["rows"] == 4
+    assert description["bounds"] == [0.0, 0.0, 2.0, 2.0]
+    assert description["geometry_types"] == {"Point": 3, "Polygon": 1}
+    assert description["vertices"]["min"] == 1
+    assert description["vertices"]["max"] == 5
+    assert description["vertices"]["p50"] == 1
+    assert description["columns"]["value"]["max"] == 25.2
+    assert description["columns"]["name"]["distinct"] == 4
+    assert "mean" not in description["columns"]["name"]
+    assert "Polygon: 1" in format_description(description)
+
+
+def test_describe_chunks() -> None:
+    """Test that streaming statistics match the whole input."""
+    n = 1000
+    geoms = [LineString([(0, 0), (i, 1)] * (i % 7 + 1)) for i in range(n)]
+    geoms[3] = None
+    geoms[4] = Polygon()
+    geoms[5] = Polygon([(0, 0), (1, 1), (1, 0), (0, 1)])
+    gdf = gpd.GeoDataFrame(
+        {"id": range(n), "group": [i % 10 for i in range(n)]},
+        geometry=geoms,
+        crs="EPSG:4326",
+    )
+    chunks = [gdf.iloc[idx] for idx in np.array_split(np.arange(n), 9)]
+    description = describe_chunks(chunks)
+    assert description == describe_chunks([gdf])
+    assert description["null"] == 1
+    assert description["empty"] == 1
+    assert description["invalid"] == 1
+    assert description["bounds"] == [0.0, 0.0, 999.0, 1.0]
+    assert description["vertices"]["max"] == 14
+    assert description["columns"]["group"]["distinct"] == 10
+    assert abs(description["columns"]["id"]["distinct"] - n) < 0.05 * n
+
+
+def test_hyperloglog() -> None:
+    """Test approximate distinct counts."""
+    sketch = HyperLogLog()
+    other = HyperLogLog()
+    values = pd.Series(np.arange(200_000))
+    sketch.update(values.iloc[:120_000])
+    other.update(values.iloc[80_000:])
+    sketch.merge(other)
+    assert abs(sketch.count() - 200_000) < 0.05 * 200_000
+    empty = HyperLogLog()
+    empty.update(pd.Series([None, None]))
+    assert empty.count() == 0
+
+
+def test_profile_geometries() -> None:
+    """Test ranking features by complexity."""
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    holed = Polygon(
+        [(0, 0), (4, 0), (4, 4), (0, 4)],
+        [[(1, 1), (2, 1), (2, 2)], [(3, 3), (3.5, 3), (3.5, 3.5)]],
+    )
+    geoms = [
+        Point(0, 0),
+        MultiPolygon([square, holed]),
+        square,
+        LineString([(0, 0), (1, 1), (2, 0)]),
+        None,
+    ]
+    gdf = gpd.GeoDataFrame({"id": range(5)}, geometry=geoms, crs=4326)
+    processor = InspectProcessor(gdf)
+
+    profile = processor.profile_geometries(3)
+    assert list(profile.index) == [1, 2, 3]
+    assert list(profile["vertices"]) == [18, 5, 3]
+    assert list(profile["parts"]) == [2, 1, 1]
+    assert list(profile["rings"]) == [4, 1, 0]
+    assert profile["type"].iloc[0] == "MultiPolygon"
+
+    profile = processor.profile_geometries(2, h3_res=5, by="h3_cells")
+    # 16.375 square degrees near the equator, about 12,360 km2 each,
+    # against about 253 km2 per cell
+    assert list(profile.index) == [1, 2]
+    expected = 16.375 * 12_360 / 252.9
+    assert abs(profile["h3_cells"].iloc[0] - expected) < 0.05 * expected
+
+    with pytest.raises(InspectOperationError):
+        processor.profile_geometries(by="h3_cells")
@@ -0,0 +1,97 @@
+"""Tests for the operation planner."""
+
+from argparse import Namespace
+from pathlib import Path
+from typing import Any
+
+import geopandas as gpd
+from shapely.geometry import Point
+
+from geoterminal.cli.planner import is_attribute_query, plan_operations
+from geoterminal.cli.processor import process_geometries
+from geoterminal.operators.geometry_operations import GeometryProcessor
+
+
+def make_args(**kwargs: Any) -> Namespace:
+    """Create command line arguments with planner defaults."""
+    defaults = dict(
+        input="input.geojson",
+        output="output.geojson",
+        geometry_column=None,
+        input_crs=4326,
+        coverage_simplify=False,
+        chunksize=None,
+        workers=1,
+        no_validate=False,
+    )
+    defaults.update(kwargs)
+    return Namespace(**defaults)
+
+
+def test_is_attribute_query() -> None:
+    """Test the detection of attribute-only queries."""
+    assert is_attribute_query("value > 1 and name == 'a'")
+    assert not is_attribute_query("area() > 1")
+    assert not is_attribute_query("geom_type == 'Point'")
+    assert not is_attribute_query("wkt != ''", geometry_column="wkt")
+
+
+def test_plan_operations(tmp_path: Path) -> None:
+    """Test the rewrites of the planner and their equivalence."""
+    args = make_args()
+    operations = [
+        ("buffer", 10.0),
+        ("reproject", 3857),
+        ("reproject", 4326),
+        ("query", "value > 1"),
+        ("intersects", "POLYGON((0 0, 2 0, 2 2, 0 2, 0 0))"),
+        ("make_valid", True),
+        ("make_valid", True),
+        ("query", "value < 3"),
+    ]
+    plan = plan_operations(operations, args)
+    # The first query moves before the buffer, but not the intersects
+    # filter nor the query after it
+    assert plan.operations == [
+        ("query", "value > 1"),
+        ("buffer", 10.0),
+        ("intersects", "POLYGON((0 0, 2 0, 2 2, 0 2, 0 0))"),
+        ("query", "value < 3"),
+        ("make_valid", True),
+    ]
+    assert plan.where is None
+    assert "1. read input.geojson" in plan.explain(args)
+
+    gdf = gpd.GeoDataFrame(
+        {"value": [0, 1, 2, 3]},
+        geometry=[Point(x, x) for x in [0.5, 2.5, 1.5, 1.0]],
+        crs="EPSG:4326",
+    )
+    original = GeometryProcessor(gdf.copy())
+    process_geometries(original, args, operations)
+    planned = GeometryProcessor(gdf.copy())
+    process_geometries(planned, args, plan.operations)
+    assert original.gdf is not None
+    assert planned.gdf is not None
+    assert list(planned.gdf.index) == list(original.gdf.index) == [2]
+
+    # Spatial queries stay after geometry transforms
+    plan = plan_operations([("buffer", 1.0), ("query", "area() > 1")], args)
+    assert [op for op, _ in plan.operations] == ["buffer", "query"]
+
+    # Attribute queries are combined and pushed into the reader
+    path = tmp_path / "input.csv"
+    path.write_text("value,geometry\n1,POINT (0 0)\n")
+    args = make_args(input=str(path))
+    plan = plan_operations(
+        [
+            ("centroid", True),
+            ("query", "value > 0"),
+            ("query", "value < 5"),
+            ("sample", 0.5),
+        ],
+        args,
+    )
+    assert plan.where == "(value > 0) and (value < 5)"
+    assert plan.operations == [("centroid", True), ("sample", 0.5)]
+    assert plan.sample is None
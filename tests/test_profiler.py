@@ -0,0 +1,56 @@
+"""Tests for the profiler module."""
+
+import json
+import time
+from pathlib import Path
+from typing import Iterator
+
+import geopandas as gpd
+from shapely.geometry import LineString, Point
+
+from geoterminal.profiler import REPORT_COLUMNS, Profiler
+
+
+def test_profiler_stages(tmp_path: Path) -> None:
+    """Test nested and streamed stages."""
+    gdf = gpd.GeoDataFrame(
+        geometry=[Point(0, 0), LineString([(0, 0), (1, 1), (2, 0)])]
+    )
+    profiler = Profiler()
+
+    def chunks() -> Iterator[gpd.GeoDataFrame]:
+        for _ in range(3):
+            time.sleep(0.02)
+            yield gdf
+
+    with profiler.stage("export") as outer:
+        for chunk in profiler.iterate("read", chunks()):
+            with profiler.stage("buffer", chunk) as stage:
+                stage.output(chunk.iloc[:1])
+        outer.output(None)
+
+    frame = profiler.to_frame()
+    assert list(frame.columns) == REPORT_COLUMNS
+    assert list(frame["stage"]) == ["read", "buffer", "export"]
+    read, buffer, export = profiler.records.values()
+    assert read["calls"] == 4 and buffer["calls"] == 3
+    assert read["rows_out"] == 6 and read["vertices_out"] == 12
+    assert buffer["rows_in"] == 6 and buffer["vertices_out"] == 3
+    # The time spent reading is not counted in the enclosing stage
+    assert read["wall_s"] >= 0.06
+    assert export["wall_s"] < read["wall_s"]
+
+    output = tmp_path / "profile.json"
+    profiler.report(str(output))
+    report = json.loads(output.read_text())
+    assert [s["stage"] for s in report["stages"]] == [
+        "read",
+        "buffer",
+        "export",
+    ]
+
+    disabled = Profiler(enabled=False)
+    with disabled.stage("read", gdf) as stage:
+        stage.output(gdf)
+    assert list(disabled.iterate("read", [gdf])) == [gdf]
+    assert not disabled.records